@@ -230,6 +230,66 @@ if not exist "modules\core.py" (
     set MISSING_LIST=!MISSING_LIST! modules\core.py
 )
 
+if not exist "modules\backend.py" (
+    echo [FAIL] modules\backend.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\backend.py
+)
+
+if not exist "modules\timing.py" (
+    echo [FAIL] modules\timing.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\timing.py
+)
+
+if not exist "modules\scheduler.py" (
+    echo [FAIL] modules\scheduler.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\scheduler.py
+)
+
+if not exist "modules\pool.py" (
+    echo [FAIL] modules\pool.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\pool.py
+)
+
+if not exist "modules\telemetry.py" (
+    echo [FAIL] modules\telemetry.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\telemetry.py
+)
+
+if not exist "modules\watcher.py" (
+    echo [FAIL] modules\watcher.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\watcher.py
+)
+
+if not exist "modules\cache.py" (
+    echo [FAIL] modules\cache.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\cache.py
+)
+
+if not exist "modules\startup.py" (
+    echo [FAIL] modules\startup.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\startup.py
+)
+
+if not exist "modules\icon.py" (
+    echo [FAIL] modules\icon.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\icon.py
+)
+
+if not exist "modules\mouse.py" (
+    echo [FAIL] modules\mouse.py not found
+    set MISSING_FILES=1
+    set MISSING_LIST=!MISSING_LIST! modules\mouse.py
+)
+
 if not exist "modules\handler.py" (
     echo [FAIL] modules\handler.py not found
     set MISSING_FILES=1
@@ -266,6 +326,16 @@ if !MISSING_FILES! equ 1 (
     echo        modules\
     echo            app.py
     echo            core.py
+    echo            backend.py
+    echo            timing.py
+    echo            scheduler.py
+    echo            pool.py
+    echo            telemetry.py
+    echo            watcher.py
+    echo            cache.py
+    echo            startup.py
+    echo            icon.py
+    echo            mouse.py
     echo            handler.py
     echo            tray.py
     echo.
@@ -334,8 +404,18 @@ echo.
 echo 1 minutes, please wait...
 echo.
 
-REM Execute build
+REM Pre-render 64x64 tray icon (tray loads it without PIL)
 if exist icon.ico (
+    %PYTHON% -c "from PIL import Image; Image.open('icon.ico').resize((64, 64), Image.Resampling.LANCZOS).save('icon64.ico', sizes=[(64, 64)])" >nul 2>&1
+    if errorlevel 1 (
+        echo [WARN] Could not render icon64.ico, tray will resize icon.ico at startup
+    )
+)
+
+REM Execute build
+if exist icon64.ico (
+    %PYTHON% -m PyInstaller --onefile --noconsole --name=KeyM --manifest=KeyM.manifest --uac-admin --clean --noconfirm --hidden-import=keyboard --hidden-import=pystray --hidden-import=PIL --hidden-import=PIL.Image --hidden-import=PIL.ImageDraw --add-data "config.py;." --add-data "modules;modules" --add-data "icon.ico;." --add-data "icon64.ico;." --icon=icon.ico main.py >build_log.txt 2>&1
+) else if exist icon.ico (
     %PYTHON% -m PyInstaller --onefile --noconsole --name=KeyM --manifest=KeyM.manifest --uac-admin --clean --noconfirm --hidden-import=keyboard --hidden-import=pystray --hidden-import=PIL --hidden-import=PIL.Image --hidden-import=PIL.ImageDraw --add-data "config.py;." --add-data "modules;modules" --add-data "icon.ico;." --icon=icon.ico main.py >build_log.txt 2>&1
 ) else (
     %PYTHON% -m PyInstaller --onefile --noconsole --name=KeyM --manifest=KeyM.manifest --uac-admin --clean --noconfirm --hidden-import=keyboard --hidden-import=pystray --hidden-import=PIL --hidden-import=PIL.Image --hidden-import=PIL.ImageDraw --add-data "config.py;." --add-data "modules;modules" main.py >build_log.txt 2>&1
@@ -417,9 +497,13 @@ if exist dist\KeyM.exe (
     echo [OK] KeyM.exe created successfully
     echo.
     
+    REM Place editable config.py next to the exe (KeyM.exe reads and watches it)
+    copy /Y config.py dist\config.py >nul 2>&1
+    
     REM Copy to desktop
     set DESKTOP=%USERPROFILE%\Desktop
     copy /Y dist\KeyM.exe "!DESKTOP!\KeyM.exe" >nul 2>&1
+    copy /Y config.py "!DESKTOP!\config.py" >nul 2>&1
     
     if exist "!DESKTOP!\KeyM.exe" (
         echo [OK] Copied to desktop
@@ -445,8 +529,9 @@ if exist dist\KeyM.exe (
     echo    - Click "Yes" when prompted
     echo.
     echo After Config Changes:
-    echo    - If you edit config.py
-    echo    - You must rebuild KeyM.exe
+    echo    - Edit config.py next to KeyM.exe
+    echo    - Saved changes apply while KeyM.exe runs
+    echo    - No rebuild needed (rebuilding overwrites it)
     echo ========================================
     
 ) else (
@@ -38,21 +38,56 @@
 #          [출력 값: hello]
 #
 #
+# 반복 / 블록 / 서브루틴:
+#
+#    ('down', 'x4'),                     <-  같은 액션 4번 (마지막 값 'x횟수', 다른 형식에도 사용 가능)
+#    ('enter', 0.07, 'x2'),              <-  (key, delay)를 2번
+#    ('repeat', 3, [('a',), ('b',)]),    <-  블록 3번 반복 (블록 안에 반복/블록 중첩 가능)
+#    ('call', '이름'),                   <-  SUBROUTINES의 '이름' 실행 (여러 매크로가 공유)
+#
+#          반복은 펼치지 않고 한 번만 컴파일되며, 펼쳐 쓴 것과 타이밍이 같음
+#
+#
+# 문자 입력:
+#
+#    ('text', '안녕하세요 gg'),           <-  문자열 입력 (한글/기호 포함, 키 이름 표와 무관)
+#    ('text', '/ready', 0.1),            <-  입력 후 딜레이
+#
+#          TEXT_CHUNK_SIZE 글자씩 한 번에 전송, TEXT_RATE를 정하면 한 글자씩 그 속도로 전송
+#          (uinput 출력은 문자 입력을 지원하지 않음)
+#
+#
+# 마우스:
+#
+#    ('click', 'left'),                  <-  클릭 ('left', 'right', 'middle'), ('click', 'left', 딜레이)
+#    ('click', 'right', 0.5, 0.1),       <-  (버튼, 홀드, 딜레이)
+#    ('move', 960, 540),                 <-  화면 좌표로 즉시 이동 (주 모니터 기준 px)
+#    ('rmove', 300, -120),               <-  현재 위치에서 상대 이동
+#    ('rmove', 300, -120, 0.25, 'bezier'),   <-  0.25초 동안 부드럽게 이동 ('linear' 또는 'bezier')
+#    ('scroll', -3),                     <-  휠 3칸 아래로 (양수는 위로)
+#
+#          부드러운 이동 경로는 설정을 불러올 때 미리 계산됨 (MOUSE_MOVE_RATE, MOUSE_JITTER)
+#          (uinput 출력은 마우스 입력을 지원하지 않음)
+#
 # ========================================
 
 
+# 여러 매크로가 함께 쓰는 액션 묶음 ('call'로 실행, 서로 호출 가능 / 순환 호출 불가)
+SUBROUTINES = {
+    # 상점 → 방어 탭
+    '방어 탭': [
+        ('m',),
+        ('enter',),
+        ('down', 'x4'),
+        ('enter',),
+    ],
+}
 
 MACROS = {    
     # 불샥 매크로
     '5': {
         'actions': [
-            ('m',),
-            ('enter',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('enter',),
+            ('call', '방어 탭'),
             ('down',),
             ('enter',),
             ('m',),
@@ -63,16 +98,8 @@ MACROS = {
     # 방탄복 매크로
     '6': {
         'actions': [
-            ('m',),
-            ('enter',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('enter',),
-            ('down',),
-            ('down',),
-            ('down',),
+            ('call', '방어 탭'),
+            ('down', 'x3'),
             ('enter',),
             ('m',),
         ],
@@ -84,18 +111,13 @@ MACROS = {
         'actions': [
             ('0',),
             ('m',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('down',),
-            ('enter', 0.07),
-            ('enter', 0.07),
+            ('down', 'x4'),
+            ('enter', 0.07, 'x2'),
             ('left',),
             ('down',),
             ('enter',),
             ('m',),
-            ('tab',),
-            ('tab',),
+            ('tab', 'x2'),
         ],
         'mode': 2
     },
@@ -116,4 +138,33 @@ FORCE_QUIT_KEYS = ['alt', 'shift', 'delete']
 # 기본 타이밍 (초)
 KEY_PRESS_DURATION = 0.02    # 키 홀드 시간
 KEY_RELEASE_DURATION = 0.02  # 키 간 딜레이
-SEQUENCE_DELAY = 0.02        # mode 1 루프 간격
\ No newline at end of file
+SEQUENCE_DELAY = 0.02        # mode 1 루프 간격
+
+# 문자 입력 ('text'): SendInput 1회에 보내는 글자 수 / 초당 최대 글자 수 (0이면 제한 없음, 정하면 한 글자씩 전송)
+TEXT_CHUNK_SIZE = 32
+TEXT_RATE = 0
+
+# 마우스 부드러운 이동 ('rmove'): 초당 이동 좌표 수 / 중간 좌표 흔들림 (px, 0이면 없음)
+MOUSE_MOVE_RATE = 125
+MOUSE_JITTER = 0
+
+# 대기 방식: 'sleep'(CPU 최소), 'hybrid'(기본, 마지막 구간만 스핀), 'busy'(가장 정확)
+TIMER_STRATEGY = 'hybrid'
+SPIN_BUDGET = 0.25           # hybrid에서 대기 시간 중 스핀 최대 비율 (Windows는 타이머 해상도를 1ms로 올려 사용)
+# 매크로 실행 스레드 (미리 띄워 둠, mode 1 반복 중인 트리거는 세지 않음) / 대기 가능한 실행 요청 수
+# 매크로 실행 스레드 (미리 띄워 둠) / 대기 가능한 실행 요청 수
+WORKER_POOL_SIZE = 4
+RUN_QUEUE_DEPTH = 8
+
+# 키보드 훅 방식: 'keys'(키마다 훅 등록), 'global'(전역 훅 1개로 받아 내부 테이블로 분배)
+HOOK_MODE = 'keys'
+
+# config.py 변경 확인 간격 (초, 0이면 끔) - 저장하면 바뀐 매크로만 다시 적용
+RELOAD_INTERVAL = 0.5
+
+# 타이밍 기록 크기 (최근 입력 N회, 0이면 기록 안 함) - 트레이 메뉴에서 확인/저장
+TELEMETRY_SIZE = 8192
+
+# 입력 출력 방식 (생략 시 Windows는 'sendinput')
+# 'sendinput', 'uinput'(Linux), 'null'(출력 안 함)
+# OUTPUT_BACKEND = 'sendinput'
\ No newline at end of file
@@ -1,5 +1,8 @@
 import sys
 import os
+import time
+
+started = time.perf_counter_ns()  # 시작 시간 분석 기준
 
 # PyInstaller 환경 처리
 if getattr(sys, 'frozen', False):
@@ -10,41 +13,93 @@ else:
 sys.path.insert(0, application_path)
 sys.path.insert(0, os.path.join(application_path, 'modules'))
 
+# 설정 캐시 위치 (PyInstaller는 임시 폴더에 풀리므로 실행 파일 옆)
+# 설정 파일도 실행 파일 옆 config.py를 우선 사용 (없으면 빌드 때 함께 묶인 config.py)
+if getattr(sys, 'frozen', False):
+    cache_dir = os.path.dirname(sys.executable)
+    config_dir = cache_dir if os.path.isfile(os.path.join(cache_dir, 'config.py')) else application_path
+else:
+    cache_dir = application_path
+    config_dir = application_path
+
 def main():
     """메인 진입점"""
+    # 벤치마크 모드 (훅/트레이 없이 실행)
+    if len(sys.argv) > 1 and sys.argv[1] == '--bench':
+        from bench import run_bench
+        sys.exit(run_bench(sys.argv[2:]))
+    
+    # 시뮬레이션 모드 (가상 시계로 매크로 1개 실행, 이벤트 타임라인 출력)
+    if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
+        from simulator import run_simulator
+        sys.exit(run_simulator(sys.argv[2:]))
+    
+    # 설정 분석 모드 (훅 등록/입력 전송 없이 실행 시간 추정과 위험 요소 검사)
+    if len(sys.argv) > 1 and sys.argv[1] == '--analyze':
+        from analyzer import run_analyzer
+        sys.exit(run_analyzer(sys.argv[2:]))
+    
+    use_cache = '--no-cache' not in sys.argv[1:]
+    
+    # 시작 시간 분석 (--startup-profile: 단계별 시간 출력)
+    from startup import StartupProfile
+    profile = StartupProfile('--startup-profile' in sys.argv[1:], started)
+    
     try:
-        # config 임포트
-        try:
-            import config
-        except ImportError as e:
-            print("\n[오류] config.py를 찾을 수 없습니다")
-            print("config.py 파일이 프로그램과 같은 폴더에 있는지 확인하세요.")
-            input("Press Enter to exit...")
-            sys.exit(1)
-        
         # 앱 임포트
         try:
-            from app import MacroApp
+            import keyboard
+            profile.mark('import keyboard')
+            import cache
+            from app import MacroApp, read_config, __version__
+            profile.mark('import app')
         except ImportError as e:
             print("\n[오류] 필수 모듈을 가져올 수 없습니다")
             print("requirements.txt의 패키지들이 설치되어 있는지 확인하세요.")
             input("Press Enter to exit...")
             sys.exit(1)
         
-        # 앱 초기화
-        app = MacroApp()
+        # 설정 캐시 (config.py 내용과 버전이 같으면 실행/검증/변환 생략)
+        config_path = os.path.join(config_dir, 'config.py')
+        cache_path = os.path.join(cache_dir, cache.CACHE_NAME)
+        key = data = None
+        if use_cache and os.path.isfile(config_path):
+            key = cache.source_key(config_path, __version__)
+            data = cache.load(cache_path, key)
         
-        # 설정 검증
-        if not app.validate_config(config):
-            print("\nconfig.py를 확인하고 다시 시도하세요.")
-            input("Press Enter to exit...")
-            sys.exit(1)
+        if data is not None:
+            app = MacroApp(data['settings']['OUTPUT_BACKEND'])
+            app.apply_config(data, config_path)
+            profile.mark('config (cache)')
+            print("설정 캐시 사용 (검증/변환 생략)")
         
-        # 설정 로드
-        app.load_config(config)
+        else:
+            # config 실행 (실행 파일 옆 config.py를 고쳐도 다시 빌드할 필요 없음)
+            try:
+                config = read_config(config_path)
+            except OSError as e:
+                print("\n[오류] config.py를 찾을 수 없습니다")
+                print("config.py 파일이 프로그램과 같은 폴더에 있는지 확인하세요.")
+                input("Press Enter to exit...")
+                sys.exit(1)
+            
+            # 앱 초기화
+            app = MacroApp(getattr(config, 'OUTPUT_BACKEND', None))
+            
+            # 설정 검증 (한 번만)
+            if not app.validate_config(config):
+                print("\nconfig.py를 확인하고 다시 시도하세요.")
+                input("Press Enter to exit...")
+                sys.exit(1)
+            
+            # 설정 로드 후 캐시 저장
+            data = app.load_config(config, validate=False)
+            if key:
+                cache.save(cache_path, key, data)
+            profile.mark('config (load)')
         
         # 실행
-        app.run()
+        app.run(profile)
     
     except KeyboardInterrupt:
         print("\n\n프로그램 종료 중...")
@@ -0,0 +1,267 @@
+import sys
+import time
+import argparse
+
+from core import SCANCODE_MAP, MAX_ITERATIONS, MOUSE_ACTIONS, routine_actions, text_chunks, text_units
+from mouse import build_path
+
+# 경고 기준
+BURST_LIMIT_NS = 1_000_000          # mode 1 반복 1회가 이보다 짧으면 MAX_ITERATIONS를 순식간에 소진
+RUNAWAY_LIMIT_NS = 3600 * 10 ** 9   # 뗌을 놓쳤을 때 MAX_ITERATIONS까지 이보다 오래 실행되면 경고
+
+class MacroEstimate:
+    """매크로 1개의 정적 분석 결과 (ns)
+
+    실제 컴파일과 같은 규칙으로 계산 (미등록 키는 hold/delay까지 통째로 건너뜀,
+    대기는 int(초 * 1e9)로 변환). duration은 1회 실행 시간, mode 1의 iteration은
+    시퀀스 딜레이를 더한 반복 1회 시간
+    """
+    __slots__ = ('trigger', 'mode', 'actions', 'events', 'duration', 'iteration',
+                 'longest_hold', 'longest_key', 'skipped', 'watched')
+
+    def __init__(self, trigger, mode):
+        self.trigger = trigger
+        self.mode = mode
+        self.actions = 0
+        self.events = 0
+        self.duration = 0
+        self.iteration = 0
+        self.longest_hold = 0
+        self.longest_key = None
+        self.skipped = []   # SCANCODE_MAP에 없어 건너뛰는 키
+        self.watched = []   # 훅이 감시하는 키 (트리거/토글/강제 종료)
+
+    @property
+    def events_per_sec(self):
+        """초당 키 이벤트 수 (mode 1은 시퀀스 딜레이 포함, 대기가 전혀 없으면 0)"""
+        span = self.iteration if self.mode == 1 else self.duration
+        return self.events / (span / 1e9) if span else 0.0
+
+    @property
+    def runaway(self):
+        """뗌을 놓쳤을 때 MAX_ITERATIONS까지 걸리는 시간 (mode 1만)"""
+        return self.iteration * MAX_ITERATIONS if self.mode == 1 else 0
+
+def estimate(trigger, info, timings, watch_keys=(), memo=None, subroutines=None):
+    """변환된 매크로 정의 → MacroEstimate (실행/컴파일 없이 계산)
+
+    memo: 액션별 (등록 여부, 감시 여부, hold ns, delay ns)와 서브루틴 결과 캐시.
+    같은 액션/서브루틴이 여러 매크로에 반복되므로 설정 전체 분석에서 공유.
+    반복 블록은 펼치지 않고 본문 결과에 횟수를 곱함
+    """
+    if memo is None:
+        memo = {}
+    result = MacroEstimate(trigger, info.get('mode', 0))
+    (result.actions, result.events, result.duration, result.longest_hold, result.longest_key,
+     result.skipped, result.watched) = _measure(info['actions'], memo, subroutines or {}, watch_keys)
+    result.iteration = result.duration + int(timings['sequence'] * 1e9)
+    return result
+
+def _measure(items, memo, subroutines, watch_keys):
+    """액션 목록 → (액션 수, 이벤트 수, 시간, 가장 긴 홀드, 그 키, 건너뛴 키, 감시 키)"""
+    actions = events = duration = longest = 0
+    longest_key = None
+    skipped = []
+    watched = []
+
+    for item in items:
+        kind = item[0]
+        if kind == 'repeat' or kind == 'call':
+            if kind == 'repeat':
+                count = item[1]
+                part = _measure(item[2], memo, subroutines, watch_keys)
+            else:
+                count = 1
+                part = memo.get(item)
+                if part is None:
+                    part = memo[item] = _measure(routine_actions(subroutines[item[1]], item[2]),
+                                                 memo, subroutines, watch_keys)
+
+            actions += part[0] * count
+            events += part[1] * count
+            duration += part[2] * count
+            if part[4] is not None and (longest_key is None or part[3] > longest):
+                longest, longest_key = part[3], part[4]
+            skipped.extend(key for key in part[5] if key not in skipped)
+            watched.extend(key for key in part[6] if key not in watched)
+            continue
+
+        if kind == 'text':
+            entry = memo.get(item)
+            if entry is None:
+                entry = memo[item] = _measure_text(item)
+            actions += 1
+            events += entry[0]
+            duration += entry[1]
+            continue
+
+        if kind in MOUSE_ACTIONS:
+            entry = memo.get(item)
+            if entry is None:
+                entry = memo[item] = _measure_mouse(item)
+            actions += 1
+            events += entry[0]
+            duration += entry[1]
+            if kind == 'click' and (longest_key is None or entry[2] > longest):
+                longest = entry[2]
+                longest_key = f'click {item[1]}'
+            continue
+
+        entry = memo.get(item)
+        if entry is None:
+            hold, key, delay = item
+            entry = memo[item] = (key in SCANCODE_MAP, key in watch_keys,
+                                  int(hold * 1e9) if hold > 0 else 0,
+                                  int(delay * 1e9) if delay > 0 else 0)
+
+        actions += 1
+        mapped, hooked, hold_ns, delay_ns = entry
+        if not mapped:
+            if item[1] not in skipped:
+                skipped.append(item[1])
+            continue
+
+        if hooked and item[1] not in watched:
+            watched.append(item[1])
+
+        events += 2
+        duration += hold_ns + delay_ns
+        if longest_key is None or hold_ns > longest:
+            longest = hold_ns
+            longest_key = item[1]
+
+    return actions, events, duration, longest, longest_key, skipped, watched
+
+def _measure_text(item):
+    """문자 입력 → (이벤트 수, 시간) (컴파일과 같은 묶음/대기 계산)
+
+    유니코드 입력은 훅에 들어오지 않으므로 감시 키 검사 대상이 아님
+    """
+    _, text, size, interval, delay = item
+    chunks = text_chunks(text, size)
+    duration = sum(int(len(chunk) * interval * 1e9) for chunk in chunks[:-1])
+    if delay > 0:
+        duration += int(delay * 1e9)
+
+    return 2 * sum(len(text_units(char)) for char in text), duration
+
+def _measure_mouse(item):
+    """마우스 액션 → (이벤트 수, 시간, 홀드) (상대 이동은 컴파일과 같은 경로로 계산)"""
+    kind = item[0]
+    delay_ns = int(item[-1] * 1e9) if item[-1] > 0 else 0
+    if kind == 'click':
+        hold_ns = int(item[2] * 1e9) if item[2] > 0 else 0
+        return 2, hold_ns + delay_ns, hold_ns
+    if kind != 'rmove':
+        return 1, delay_ns, 0
+
+    _, dx, dy, duration, path, jitter, rate, _ = item
+    steps = build_path(dx, dy, duration, path, jitter, rate)
+    wait_ns = int(duration / len(steps) * 1e9) if duration > 0 else 0
+    return sum(1 for step in steps if step != (0, 0)), wait_ns * len(steps) + delay_ns, 0
+
+def analyze(macros, timings, toggle_key=None, force_quit_keys=(), subroutines=None):
+    """설정 전체 분석 → (MacroEstimate 목록, 경고 목록 [(트리거, 메시지)])"""
+    special = {toggle_key: '토글'} if toggle_key else {}
+    special.update((key, '강제 종료') for key in force_quit_keys)
+    watch_keys = set(macros) | set(special)
+
+    results = []
+    warnings = []
+    memo = {}
+    for trigger, info in macros.items():
+        result = estimate(trigger, info, timings, watch_keys, memo, subroutines)
+        results.append(result)
+
+        if result.skipped:
+            names = ', '.join(repr(key) for key in result.skipped)
+            if result.events:
+                warnings.append((trigger, f"SCANCODE_MAP에 없는 키는 건너뜀 (대기 포함): {names}"))
+            else:
+                warnings.append((trigger, f"출력할 키가 없어 실행되지 않음: {names}"))
+
+        if result.watched:
+            names = ', '.join(
+                f"{special[key]} {key!r}" if key in special and key not in macros else
+                f"{'자기' if key == trigger else '다른'} 트리거 {key!r}"
+                for key in result.watched)
+            warnings.append((trigger, f"훅이 감시하는 키 입력 → 입력마다 훅 콜백/에코 처리: {names}"))
+
+        if result.mode == 1 and result.events:
+            if result.iteration < BURST_LIMIT_NS:
+                warnings.append((trigger, f"mode 1 반복 1회 {result.iteration / 1e6:.3f}ms → "
+                                          f"MAX_ITERATIONS({MAX_ITERATIONS})회를 "
+                                          f"{result.runaway / 1e6:.0f}ms 안에 소진 "
+                                          f"(키 이벤트 {result.events * MAX_ITERATIONS}개)"))
+            elif result.runaway > RUNAWAY_LIMIT_NS:
+                warnings.append((trigger, f"mode 1 반복 1회 {result.iteration / 1e6:.0f}ms → 뗌을 놓치면 "
+                                          f"MAX_ITERATIONS({MAX_ITERATIONS})회까지 "
+                                          f"{result.runaway / 3.6e12:.1f}시간 실행"))
+
+    return results, warnings
+
+def format_report(results, warnings):
+    """분석 결과 텍스트"""
+    lines = [f"{'trigger':<12}{'mode':>5}{'actions':>9}{'events':>8}{'duration ms':>13}"
+             f"{'events/s':>10}{'longest hold':>20}{'max run':>12}"]
+
+    for r in results:
+        hold = f"{r.longest_hold / 1e6:.1f}ms ({r.longest_key})" if r.longest_key else '-'
+        runaway = _format_span(r.runaway) if r.mode == 1 else '-'
+        duration = r.iteration if r.mode == 1 else r.duration
+        lines.append(f"{r.trigger:<12}{r.mode:>5}{r.actions:>9}{r.events:>8}{duration / 1e6:>13.3f}"
+                     f"{r.events_per_sec:>10.1f}{hold:>20}{runaway:>12}")
+
+    lines.append("duration: mode 2는 1회 실행, mode 1은 반복 1회(시퀀스 딜레이 포함), "
+                 "max run: 뗌을 놓쳤을 때 MAX_ITERATIONS까지 걸리는 시간")
+
+    if warnings:
+        lines.append(f"\n경고 {len(warnings)}개")
+        lines.extend(f"  [{trigger}] {message}" for trigger, message in warnings)
+    else:
+        lines.append("\n경고 없음")
+
+    return '\n'.join(lines)
+
+def _format_span(ns):
+    """긴 시간 표시"""
+    seconds = ns / 1e9
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}min"
+    return f"{seconds:.2f}s"
+
+def run_analyzer(argv=None):
+    """설정 분석 진입점 (main.py --analyze, 훅 등록/입력 전송 없음)"""
+    from bench import load_config
+    from app import MacroApp
+
+    parser = argparse.ArgumentParser(prog='main.py --analyze', description='KeyM 설정 분석')
+    parser.add_argument('--config', help='config.py 경로 (기본: 프로그램 폴더)')
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    app = MacroApp('null')
+
+    start = time.perf_counter_ns()
+    if not app.validate_config(config):
+        return 1
+
+    try:
+        data = app.compile_config(config)
+    except ValueError as e:
+        print(f"[오류] {e}")
+        return 1
+
+    settings = data['settings']
+    results, warnings = analyze(data['macros'], data['defaults'],
+                                settings['TOGGLE_KEY'], settings['FORCE_QUIT_KEYS'], data['subroutines'])
+    elapsed = time.perf_counter_ns() - start
+
+    print(f"설정 분석: 매크로 {len(results)}개, {elapsed / 1e6:.2f}ms (검증/변환 포함)")
+    print(format_report(results, warnings))
+    return 1 if warnings else 0
+
+if __name__ == "__main__":
+    sys.exit(run_analyzer())
@@ -1,29 +1,105 @@
-import keyboard
+import re
 import sys
 import os
+import time
+import types
+import threading
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
-from core import MacroCore
+from core import MacroCore, called_subroutines, TEXT_CHUNK_SIZE, MOUSE_ACTIONS
+from mouse import BUTTONS, PATHS, MOVE_RATE
+from timing import PrecisionTimer, STRATEGIES
+from pool import WorkerPool, DEFAULT_POOL_SIZE, DEFAULT_QUEUE_DEPTH
+from telemetry import Telemetry, DEFAULT_CAPACITY, default_dump_path
 from handler import EventHandler
+from watcher import ConfigWatcher, DEFAULT_INTERVAL
+from startup import StartupProfile
 from tray import TrayIcon
 
+__version__ = '2.2.1'
+
+# 훅 등록 방식
+HOOK_MODES = ('keys', 'global')
+
+# 반복 표기 ('down', 'x4')
+REPEAT_SUFFIX = re.compile(r'x([1-9][0-9]*)$')
+
+# 선택 설정과 기본값 (설정 데이터/캐시에는 기본값을 채운 값이 들어감)
+SETTINGS = {
+    'FORCE_QUIT_KEYS': ['alt', 'shift', 'delete'],
+    'HOOK_MODE': 'keys',
+    'RELOAD_INTERVAL': DEFAULT_INTERVAL,
+    'WORKER_POOL_SIZE': DEFAULT_POOL_SIZE,
+    'RUN_QUEUE_DEPTH': DEFAULT_QUEUE_DEPTH,
+    'TELEMETRY_SIZE': DEFAULT_CAPACITY,
+    'TIMER_STRATEGY': 'hybrid',
+    'SPIN_BUDGET': 0.25,
+    'OUTPUT_BACKEND': None,
+}
+
+def read_config(path):
+    """설정 파일을 새 모듈로 실행 (import 캐시/.pyc, 실행 파일에 묶인 모듈을 거치지 않음)"""
+    module = types.ModuleType('config')
+    module.__file__ = path
+    with open(path, 'rb') as f:
+        code = compile(f.read(), path, 'exec')
+    exec(code, module.__dict__)
+    return module
+
 class MacroApp:
     """매크로 애플리케이션"""
-    __slots__ = ('core', 'handler', 'tray', 'toggle_key', 'force_quit_keys')
+    __slots__ = ('core', 'handler', 'tray', 'toggle_key', 'force_quit_keys', 'hook_mode',
+                 'config_path', 'reload_interval', 'watcher', '_sources', '_subroutine_sources',
+                 '_defaults')
 
-    def __init__(self):
-        self.core = MacroCore()
+    def __init__(self, backend=None):
+        self.core = MacroCore(backend)
         self.handler = None
-        self.tray = TrayIcon(self.on_exit)
+        self.tray = TrayIcon(self.on_exit, self.show_telemetry, self.dump_telemetry)
         self.toggle_key = '`'
         self.force_quit_keys = ['alt', 'shift', 'delete']
+        self.hook_mode = 'keys'
+        self.config_path = None
+        self.reload_interval = DEFAULT_INTERVAL
+        self.watcher = None
+        self._sources = {}   # 트리거별 원본 정의 (리로드 시 변경 비교)
+        self._subroutine_sources = {}
+        self._defaults = {}
 
     def on_exit(self):
         """종료 콜백"""
+        if self.watcher:
+            self.watcher.stop()
         if self.handler:
             self.handler.shutdown()
     
+    def show_telemetry(self):
+        """타이밍 통계 출력 (트레이 알림용 요약 반환)"""
+        telemetry = self.core.telemetry
+        print(telemetry.format_report())
+        
+        lines = [f"[{trigger}] p50 {s['all']['p50']:.0f}us / p99 {s['all']['p99']:.0f}us"
+                 for trigger, s in telemetry.report().items()]
+        
+        if self.handler:
+            print(self.handler.metrics.format_summary())
+            hook = self.handler.metrics.summary()
+            lines.append(f"훅 p99 {hook['hook_p99_us']:.0f}us, 큐 최대 {hook['max_depth']}")
+        
+        return '\n'.join(lines) or "기록된 입력 없음"
+    
+    def dump_telemetry(self):
+        """타이밍 기록 파일 저장 (저장 경로 반환)"""
+        if getattr(sys, 'frozen', False):
+            base = os.path.dirname(sys.executable)
+        else:
+            base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        
+        path = self.core.telemetry.dump(default_dump_path(base))
+        print(f"타이밍 기록 저장: {path}")
+        return path
+    
     def _normalize_macros(self, raw_macros):
         """복수 트리거를 개별로 변환"""
         if not isinstance(raw_macros, dict):
@@ -43,13 +119,47 @@ class MacroApp:
         
         return normalized
     
-    def _parse_action(self, action, is_last, defaults):
-        """action을 (hold, key, delay) 형식으로 변환"""
+    def _parse_action(self, action, is_last, defaults, subroutines=()):
+        """action을 (hold, key, delay) 형식으로 변환
+        
+        반복/호출은 펼치지 않고 블록으로 변환 (코어가 블록 단위로 컴파일):
+        ('key', 'x4') 등 마지막 값이 'x숫자' → ('repeat', 4, [변환된 액션])
+        ('repeat', 횟수, [액션...])         → ('repeat', 횟수, [변환된 액션...])
+        ('call', '이름')                    → ('call', '이름', 마지막 액션 여부)
+        ('text', '문자열')                  → ('text', '문자열', 묶음 글자 수, 글자 간격, delay)
+        마우스 ('click', 'move', 'rmove', 'scroll')는 _parse_mouse 참고
+        """
         if not isinstance(action, tuple):
             raise ValueError(f"Action must be tuple: {action}")
         
         action_len = len(action)
         
+        if action_len and action[0] == 'repeat':
+            # ('repeat', count, [actions])
+            if (action_len != 3 or not isinstance(action[1], int) or isinstance(action[1], bool) or
+                    action[1] < 1 or not isinstance(action[2], list) or not action[2]):
+                raise ValueError(f"Repeat must be ('repeat', count >= 1, [actions]): {action}")
+            return self._parse_repeat(action[1], action[2], is_last, defaults, subroutines)
+        
+        if action_len and action[0] == 'call':
+            # ('call', 'name')
+            if action_len != 2 or action[1] not in subroutines:
+                raise ValueError(f"Unknown subroutine: {action}")
+            return ('call', action[1], is_last)
+        
+        if action_len and action[0] == 'text':
+            return self._parse_text(action, is_last, defaults, subroutines)
+        
+        if action_len >= 2 and isinstance(action[-1], str):
+            # ('key', 'x4'), (hold, 'key', delay, 'x4') ...
+            match = REPEAT_SUFFIX.match(action[-1])
+            if match:
+                return self._parse_repeat(int(match.group(1)), [action[:-1]], is_last, defaults,
+                                          subroutines)
+        
+        if action_len and action[0] in MOUSE_ACTIONS:
+            return self._parse_mouse(action, is_last, defaults)
+        
         if action_len == 1:
             # ('key',)
             return (defaults['press'], action[0], 0 if is_last else defaults['release'])
@@ -71,8 +181,146 @@ class MacroApp:
         else:
             raise ValueError(f"Action must have 1-3 elements: {action}")
     
-    def _convert_actions(self, macros, defaults):
-        """actions를 (hold, key, delay) 튜플로 변환"""
+    def _parse_text(self, action, is_last, defaults, subroutines):
+        """문자 입력 변환 ('text', '문자열'[, delay][, 'x반복'])
+        
+        TEXT_RATE가 있으면 글자 단위로 간격을 두고 (묶음 크기 1), 없으면 TEXT_CHUNK_SIZE씩 묶음.
+        묶음 크기와 간격은 변환 결과에 넣어
+        값이 바뀌면 리로드 시 다시 컴파일되게 함
+        """
+        if len(action) >= 3 and isinstance(action[-1], str):
+            match = REPEAT_SUFFIX.match(action[-1])
+            if match:
+                return self._parse_repeat(int(match.group(1)), [action[:-1]], is_last, defaults,
+                                          subroutines)
+        
+        if (len(action) not in (2, 3) or not isinstance(action[1], str) or not action[1] or
+                (len(action) == 3 and action[2] is not None and not isinstance(action[2], (int, float)))):
+            raise ValueError(f"Text must be ('text', 'string'[, delay]): {action}")
+        
+        delay = action[2] if len(action) == 3 and action[2] is not None else (
+            0 if is_last else defaults['release'])
+        # 속도 제한이 있으면 한 글자씩 보내 글자 사이마다 간격 대기
+        rate = defaults['text_rate']
+        if rate:
+            return ('text', action[1], 1, 1 / rate, delay)
+        return ('text', action[1], defaults['text_chunk'], 0, delay)
+    
+    def _parse_mouse(self, action, is_last, defaults):
+        """마우스 액션 변환 (delay 생략 시 키와 같은 기본값)
+        
+        ('click', '버튼'[, delay]), ('click', '버튼', hold, delay) → ('click', 버튼, hold, delay)
+        ('move', x, y[, delay])                 → ('move', x, y, delay)  화면 좌표로 즉시 이동
+        ('rmove', dx, dy[, 시간[, 'bezier']])    → ('rmove', dx, dy, 시간, 경로, 흔들림, 초당 좌표 수, delay)
+        ('scroll', 칸[, delay])                 → ('scroll', 칸, delay)  양수 = 위로
+        """
+        kind = action[0]
+        values = action[1:]
+        default_delay = 0 if is_last else defaults['release']
+        
+        def number(value, name):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"{kind} {name} must be a number: {action}")
+            return value
+        
+        def pixels(value, name):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"{kind} {name} must be an integer: {action}")
+            return value
+        
+        def optional(index, name, default):
+            if len(values) <= index or values[index] is None:
+                return default
+            return number(values[index], name)
+        
+        if kind == 'click':
+            if not 1 <= len(values) <= 3 or values[0] not in BUTTONS:
+                raise ValueError(f"Click must be ('click', {'|'.join(BUTTONS)}[, hold], delay): {action}")
+            if len(values) == 3:
+                return ('click', values[0], optional(1, 'hold', defaults['press']),
+                        optional(2, 'delay', default_delay))
+            return ('click', values[0], defaults['press'], optional(1, 'delay', default_delay))
+        
+        if kind == 'scroll':
+            if not 1 <= len(values) <= 2 or not pixels(values[0], 'clicks'):
+                raise ValueError(f"Scroll must be ('scroll', clicks != 0[, delay]): {action}")
+            return ('scroll', values[0], optional(1, 'delay', default_delay))
+        
+        if kind == 'move':
+            if not 2 <= len(values) <= 3:
+                raise ValueError(f"Move must be ('move', x, y[, delay]): {action}")
+            return ('move', pixels(values[0], 'x'), pixels(values[1], 'y'),
+                    optional(2, 'delay', default_delay))
+        
+        # rmove
+        if not 2 <= len(values) <= 4 or (len(values) == 4 and values[3] not in PATHS):
+            raise ValueError(f"Relative move must be ('rmove', dx, dy[, duration[, {'|'.join(PATHS)}]]): {action}")
+        duration = optional(2, 'duration', 0)
+        if duration < 0:
+            raise ValueError(f"rmove duration must be >= 0: {action}")
+        return ('rmove', pixels(values[0], 'dx'), pixels(values[1], 'dy'), duration,
+                values[3] if len(values) == 4 else 'linear',
+                defaults['mouse_jitter'], defaults['mouse_rate'], default_delay)
+    
+    def _parse_repeat(self, count, actions, is_last, defaults, subroutines):
+        """반복 블록 변환
+        
+        마지막 액션이면 마지막 반복만 끝 딜레이가 0이어야 하므로
+        (count - 1)회 블록 + 마지막 1회로 나눔 (펼친 목록과 같은 타이밍)
+        """
+        body = self._parse_list(actions, False, defaults, subroutines)
+        if not is_last:
+            return ('repeat', count, body)
+        
+        final = self._parse_list(actions, True, defaults, subroutines)
+        if final == body:
+            return ('repeat', count, body)
+        if count == 1:
+            return ('repeat', 1, final)
+        head = body if count == 2 else [('repeat', count - 1, body)]
+        return ('repeat', 1, head + final)
+    
+    def _parse_list(self, actions, is_last, defaults, subroutines=()):
+        """액션 목록 변환 (is_last: 목록이 매크로의 끝인지)"""
+        last = len(actions) - 1
+        return [self._parse_action(action, is_last and i == last, defaults, subroutines)
+                for i, action in enumerate(actions)]
+    
+    def _convert_subroutines(self, raw_subroutines, defaults):
+        """SUBROUTINES를 변환 {이름: {'actions': 중간 호출용, 'last': 끝 호출용(같으면 None)}}
+        
+        서로 호출할 수 있지만 순환 호출은 오류
+        """
+        if not isinstance(raw_subroutines, dict):
+            raise ValueError("SUBROUTINES must be a dictionary")
+        
+        converted = {}
+        for name, actions in raw_subroutines.items():
+            if not isinstance(name, str) or not isinstance(actions, list) or not actions:
+                raise ValueError(f"Subroutine must be 'name': [actions]: {name}")
+            
+            try:
+                body = self._parse_list(actions, False, defaults, raw_subroutines)
+                last = self._parse_list(actions, True, defaults, raw_subroutines)
+            except Exception as e:
+                raise ValueError(f"Error parsing subroutine '{name}': {e}")
+            
+            converted[name] = {'actions': body, 'last': None if last == body else last}
+        
+        # 순환 호출 검사
+        def visit(name, path):
+            if name in path:
+                raise ValueError(f"Recursive subroutine call: {' -> '.join(path + [name])}")
+            for item in called_subroutines(converted[name]['actions']):
+                visit(item, path + [name])
+        
+        for name in converted:
+            visit(name, [])
+        
+        return converted
+    
+    def _convert_actions(self, macros, defaults, subroutines=()):
+        """actions를 (hold, key, delay) 튜플로 변환 (반복/호출은 블록)"""
         converted = {}
         
         for key, info in macros.items():
@@ -90,10 +338,7 @@ class MacroApp:
                 raise ValueError(f"Actions must be non-empty list for key '{key}'")
             
             try:
-                parsed_actions = [
-                    self._parse_action(action, i == len(raw_actions) - 1, defaults)
-                    for i, action in enumerate(raw_actions)
-                ]
+                parsed_actions = self._parse_list(raw_actions, True, defaults, subroutines)
             except Exception as e:
                 raise ValueError(f"Error parsing actions for key '{key}': {e}")
             
@@ -104,42 +349,168 @@ class MacroApp:
         
         return converted
     
-    def load_config(self, config):
-        """설정 로드"""
+    def _read_defaults(self, config):
+        """기본 타이밍과 문자 입력/마우스 설정 (액션 변환 기본값, 코어 timings)"""
+        return {
+            'press': config.KEY_PRESS_DURATION,
+            'release': config.KEY_RELEASE_DURATION,
+            'sequence': config.SEQUENCE_DELAY,
+            'text_chunk': getattr(config, 'TEXT_CHUNK_SIZE', TEXT_CHUNK_SIZE),
+            'text_rate': getattr(config, 'TEXT_RATE', 0),
+            'mouse_rate': getattr(config, 'MOUSE_MOVE_RATE', MOVE_RATE),
+            'mouse_jitter': getattr(config, 'MOUSE_JITTER', 0),
+        }
+    
+    def compile_config(self, config):
+        """설정 모듈 → 변환된 설정 데이터 (기본 자료형만, 캐시 저장 가능)"""
         if not hasattr(config, 'MACROS'):
             raise ValueError("config.MACROS not found")
         
-        # 설정 검증
-        if not self.validate_config(config):
-            raise ValueError("Invalid configuration")
-        
-        # 매크로 변환
         try:
             normalized = self._normalize_macros(config.MACROS)
             
-            defaults = {
-                'press': config.KEY_PRESS_DURATION,
-                'release': config.KEY_RELEASE_DURATION,
-                'sequence': config.SEQUENCE_DELAY
-            }
+            defaults = self._read_defaults(config)
             
-            converted = self._convert_actions(normalized, defaults)
+            raw_subroutines = getattr(config, 'SUBROUTINES', {})
+            subroutines = self._convert_subroutines(raw_subroutines, defaults)
+            converted = self._convert_actions(normalized, defaults, raw_subroutines)
         except Exception as e:
             raise ValueError(f"Configuration conversion failed: {e}")
         
-        # 코어 설정
-        self.core.configure(converted, defaults)
+        settings = {name: getattr(config, name, default) for name, default in SETTINGS.items()}
+        settings['TOGGLE_KEY'] = config.TOGGLE_KEY
+        
+        return {
+            'macros': converted,
+            'subroutines': subroutines,
+            'sources': normalized,  # 리로드 시 변경 비교용 원본 정의
+            'subroutine_sources': raw_subroutines,
+            'defaults': defaults,
+            'settings': settings,
+        }
+    
+    def load_config(self, config, validate=True):
+        """설정 로드 → 설정 데이터 (validate=False면 이미 검증된 설정)"""
+        if not hasattr(config, 'MACROS'):
+            raise ValueError("config.MACROS not found")
+        
+        # 설정 검증
+        if validate and not self.validate_config(config):
+            raise ValueError("Invalid configuration")
+        
+        data = self.compile_config(config)
+        self.apply_config(data, getattr(config, '__file__', None))
+        return data
+    
+    def apply_config(self, data, config_path=None):
+        """변환된 설정 데이터 적용 (설정 캐시에서 읽은 데이터도 그대로 사용)"""
+        settings = data['settings']
+        self.config_path = config_path
+        self._sources = data['sources']
+        self._subroutine_sources = data['subroutine_sources']
+        self._defaults = data['defaults']
         
         # 전역 설정
-        self.toggle_key = config.TOGGLE_KEY
-        self.force_quit_keys = getattr(config, 'FORCE_QUIT_KEYS', ['alt', 'shift', 'delete'])
+        self.toggle_key = settings['TOGGLE_KEY']
+        self.force_quit_keys = settings['FORCE_QUIT_KEYS']
+        self.hook_mode = settings['HOOK_MODE']
+        self.reload_interval = settings['RELOAD_INTERVAL']
+        
+        # 코어 설정 (토글/강제 종료 키도 주입 입력 구분 대상)
+        self.core.pool = WorkerPool(settings['WORKER_POOL_SIZE'], settings['RUN_QUEUE_DEPTH'])
+        self.core.telemetry = Telemetry(settings['TELEMETRY_SIZE'])
+        self.core.configure(data['macros'], data['defaults'],
+                            [self.toggle_key] + list(self.force_quit_keys), data['subroutines'])
+        self.core.timer = PrecisionTimer(settings['TIMER_STRATEGY'], settings['SPIN_BUDGET'])
         
         # 핸들러 생성
         self.handler = EventHandler(self.core, self.toggle_key, self.force_quit_keys)
     
+    def reload_config(self):
+        """설정 파일 다시 적용 (핫 리로드)
+        
+        바뀐 매크로만 다시 변환/컴파일해 코어에 한 번에 교체하고,
+        트리거/토글/강제 종료 키가 바뀐 경우에만 훅을 다시 등록.
+        실행 스레드/텔레메트리/훅 방식 설정은 재시작해야 적용됨
+        """
+        start = time.perf_counter_ns()
+        try:
+            config = read_config(self.config_path)
+        except Exception as e:
+            print(f"[오류] config.py를 다시 불러오지 못했습니다 (이전 설정 유지): {e}")
+            return False
+        
+        if not self.validate_config(config):
+            print("[오류] 설정 오류로 이전 설정을 유지합니다")
+            return False
+        
+        try:
+            normalized = self._normalize_macros(config.MACROS)
+            defaults = self._read_defaults(config)
+            
+            # 원본 정의, 변환에 쓰는 기본값, 서브루틴이 같으면 이전 변환 결과 재사용
+            raw_subroutines = getattr(config, 'SUBROUTINES', {})
+            same_defaults = all(defaults[name] == self._defaults.get(name)
+                                for name in ('press', 'release', 'text_chunk', 'text_rate',
+                                             'mouse_rate', 'mouse_jitter'))
+            if same_defaults and raw_subroutines == self._subroutine_sources:
+                subroutines = self.core.subroutines
+            else:
+                subroutines = self._convert_subroutines(raw_subroutines, defaults)
+                same_defaults = False
+            
+            converted = {}
+            for key, info in normalized.items():
+                if same_defaults and self._sources.get(key) == info:
+                    converted[key] = self.core.macros[key]
+                else:
+                    converted.update(self._convert_actions({key: info}, defaults, raw_subroutines))
+        except Exception as e:
+            print(f"[오류] 설정 변환 실패 (이전 설정 유지): {e}")
+            return False
+        
+        toggle_key = config.TOGGLE_KEY
+        force_quit_keys = getattr(config, 'FORCE_QUIT_KEYS', ['alt', 'shift', 'delete'])
+        rehook = (set(converted) != set(self.core.macros) or toggle_key != self.toggle_key or
+                  set(force_quit_keys) != set(self.force_quit_keys))
+        
+        # 코어 교체 → 핸들러 테이블 교체 → (필요하면) 훅 재등록
+        changed = self.core.update(converted, defaults, [toggle_key] + list(force_quit_keys),
+                                   subroutines)
+        self._sources = normalized
+        self._subroutine_sources = raw_subroutines
+        self._defaults = defaults
+        self.toggle_key = toggle_key
+        self.force_quit_keys = force_quit_keys
+        self.handler.update(toggle_key, force_quit_keys)
+        
+        if rehook and self.hook_mode != 'global':
+            self.remove_hooks()
+            self.setup_hooks()
+        
+        elapsed = (time.perf_counter_ns() - start) / 1e6
+        print(f"설정 다시 불러옴: 매크로 {len(changed)}개 다시 컴파일, "
+              f"훅 {'재등록' if rehook and self.hook_mode != 'global' else '유지'}, {elapsed:.1f}ms")
+        return True
+    
+    def watch_config(self, interval=DEFAULT_INTERVAL):
+        """설정 파일 변경 감시 시작"""
+        if not self.config_path or not os.path.isfile(self.config_path):
+            return
+        
+        self.watcher = ConfigWatcher(self.config_path, self.reload_config, interval)
+        self.watcher.start()
+    
     def setup_hooks(self):
         """키보드 훅 등록"""
+        import keyboard
+        
         try:
+            # 전역 훅 하나 + 핸들러 테이블로 분배
+            if self.hook_mode == 'global':
+                keyboard.hook(self.handler.handle_event, suppress=True)
+                return
+            
             # 토글 키
             keyboard.on_press_key(self.toggle_key, self.handler.handle_press, suppress=True)
             keyboard.on_release_key(self.toggle_key, self.handler.handle_release, suppress=True)
@@ -157,13 +528,36 @@ class MacroApp:
         except Exception as e:
             raise RuntimeError(f"Failed to setup keyboard hooks: {e}")
     
-    def run(self):
-        """실행"""
-        # 트레이 아이콘 시작
-        self.tray.run()
+    def remove_hooks(self):
+        """키보드 훅 해제"""
+        import keyboard
+        keyboard.unhook_all()
+    
+    def _start_tray(self, profile):
+        """트레이 아이콘 시작 (백그라운드 스레드, pystray/PIL 임포트와 아이콘 로드 포함)"""
+        self.tray.run(profile.mark)
+        profile.mark('tray ready')
+        
+        if profile.enabled:
+            print(profile.format_report())
+    
+    def run(self, profile=None):
+        """실행 (훅을 먼저 등록하고 트레이는 백그라운드에서 준비)"""
+        profile = profile or StartupProfile()
         
         # 키보드 훅 등록
         self.setup_hooks()
+        profile.mark('hooks live')
+        
+        # 트레이 아이콘 시작 (백그라운드)
+        threading.Thread(target=self._start_tray, args=(profile,), name='KeyM-tray', daemon=True).start()
+        
+        # 대기 해상도 보정 (백그라운드)
+        threading.Thread(target=self.core.timer.calibrate, daemon=True).start()
+        
+        # 설정 파일 변경 감시
+        if self.reload_interval:
+            self.watch_config(self.reload_interval)
         
         # 시작 메시지
         print("=" * 60)
@@ -182,6 +576,8 @@ class MacroApp:
         
         print("=" * 60)
         
+        import keyboard
+        
         try:
             keyboard.wait()
         except KeyboardInterrupt:
@@ -228,6 +624,67 @@ class MacroApp:
             print("[오류] 타이밍 값은 0 이상이어야 합니다")
             return False
         
+        # 대기 방식 검증
+        if getattr(cfg, 'TIMER_STRATEGY', 'hybrid') not in STRATEGIES:
+            print(f"[오류] TIMER_STRATEGY는 {', '.join(STRATEGIES)} 중 하나여야 합니다")
+            return False
+        
+        if not 0 <= getattr(cfg, 'SPIN_BUDGET', 0.25) <= 1:
+            print("[오류] SPIN_BUDGET은 0 이상 1 이하여야 합니다")
+            return False
+        
+        # 실행 스레드 설정 검증
+        pool_size = getattr(cfg, 'WORKER_POOL_SIZE', DEFAULT_POOL_SIZE)
+        if not isinstance(pool_size, int) or pool_size < 0:
+            print("[오류] WORKER_POOL_SIZE는 0 이상의 정수여야 합니다")
+            return False
+        
+        queue_depth = getattr(cfg, 'RUN_QUEUE_DEPTH', DEFAULT_QUEUE_DEPTH)
+        if not isinstance(queue_depth, int) or queue_depth < 1:
+            print("[오류] RUN_QUEUE_DEPTH는 1 이상의 정수여야 합니다")
+            return False
+        
+        telemetry_size = getattr(cfg, 'TELEMETRY_SIZE', DEFAULT_CAPACITY)
+        if not isinstance(telemetry_size, int) or not 0 <= telemetry_size <= 1_000_000:
+            print("[오류] TELEMETRY_SIZE는 0 이상 1000000 이하의 정수여야 합니다")
+            return False
+        
+        if getattr(cfg, 'HOOK_MODE', 'keys') not in HOOK_MODES:
+            print(f"[오류] HOOK_MODE는 {', '.join(HOOK_MODES)} 중 하나여야 합니다")
+            return False
+        
+        reload_interval = getattr(cfg, 'RELOAD_INTERVAL', DEFAULT_INTERVAL)
+        if not isinstance(reload_interval, (int, float)) or reload_interval < 0:
+            print("[오류] RELOAD_INTERVAL은 0 이상이어야 합니다")
+            return False
+        
+        text_chunk = getattr(cfg, 'TEXT_CHUNK_SIZE', TEXT_CHUNK_SIZE)
+        if not isinstance(text_chunk, int) or text_chunk < 1:
+            print("[오류] TEXT_CHUNK_SIZE는 1 이상의 정수여야 합니다")
+            return False
+        
+        text_rate = getattr(cfg, 'TEXT_RATE', 0)
+        if not isinstance(text_rate, (int, float)) or text_rate < 0:
+            print("[오류] TEXT_RATE는 0 이상이어야 합니다 (0 = 제한 없음)")
+            return False
+        
+        mouse_rate = getattr(cfg, 'MOUSE_MOVE_RATE', MOVE_RATE)
+        if not isinstance(mouse_rate, (int, float)) or not 1 <= mouse_rate <= 1000:
+            print("[오류] MOUSE_MOVE_RATE는 1 이상 1000 이하여야 합니다")
+            return False
+        
+        mouse_jitter = getattr(cfg, 'MOUSE_JITTER', 0)
+        if not isinstance(mouse_jitter, (int, float)) or mouse_jitter < 0:
+            print("[오류] MOUSE_JITTER는 0 이상이어야 합니다")
+            return False
+        
+        subroutines = getattr(cfg, 'SUBROUTINES', {})
+        if not isinstance(subroutines, dict) or not all(
+                isinstance(name, str) and isinstance(actions, list) and actions
+                for name, actions in subroutines.items()):
+            print("[오류] SUBROUTINES는 {'이름': [액션, ...]} 형식의 딕셔너리여야 합니다")
+            return False
+        
         # 각 매크로 간단 검증 (상세 검증은 load_config에서)
         for trigger, info in cfg.MACROS.items():
             if not isinstance(info, dict):
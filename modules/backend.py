@@ -0,0 +1,203 @@
+import os
+import time
+import threading
+import ctypes
+from ctypes import c_ulong, c_ushort, c_long, Structure, Union, POINTER
+
+# DirectInput 구조체
+PUL = POINTER(c_ulong)
+
+class KeyBdInput(Structure):
+    _fields_ = [("wVk", c_ushort), ("wScan", c_ushort), ("dwFlags", c_ulong),
+                ("time", c_ulong), ("dwExtraInfo", PUL)]
+
+class HardwareInput(Structure):
+    _fields_ = [("uMsg", c_ulong), ("wParamL", c_ushort), ("wParamH", c_ushort)]
+
+class MouseInput(Structure):
+    _fields_ = [("dx", c_long), ("dy", c_long), ("mouseData", c_ulong),
+                ("dwFlags", c_ulong), ("time", c_ulong), ("dwExtraInfo", PUL)]
+
+class Input_I(Union):
+    _fields_ = [("ki", KeyBdInput), ("mi", MouseInput), ("hi", HardwareInput)]
+
+class Input(Structure):
+    _fields_ = [("type", c_ulong), ("ii", Input_I)]
+
+INPUT_SIZE = ctypes.sizeof(Input)
+
+# 상수
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004   # wScan에 UTF-16 코드 단위 (문자 입력)
+KEYEVENTF_SCANCODE = 0x0008
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+MOUSEEVENTF_WHEEL = 0x0800
+MOUSEEVENTF_ABSOLUTE = 0x8000   # dx/dy가 주 모니터 기준 0~65535 좌표
+WHEEL_DELTA = 120               # 휠 1칸
+
+DEFAULT_SCREEN = (1920, 1080)   # 해상도를 알 수 없을 때 (Windows 외)
+
+# 주입 입력 표시 (dwExtraInfo, 'KM' + 프로세스 ID 하위 16비트)
+INJECTED_MARKER = 0x4B4D0000 | (os.getpid() & 0xFFFF)
+
+def injected_extra():
+    """dwExtraInfo에 넣을 표시 값"""
+    return ctypes.cast(INJECTED_MARKER, PUL)
+
+def screen_size():
+    """주 모니터 해상도 (절대 좌표 변환용, 알 수 없으면 DEFAULT_SCREEN)"""
+    try:
+        from ctypes import windll
+        width = windll.user32.GetSystemMetrics(0)
+        height = windll.user32.GetSystemMetrics(1)
+    except (ImportError, OSError):
+        return DEFAULT_SCREEN
+    return (width, height) if width > 0 and height > 0 else DEFAULT_SCREEN
+
+def is_injected(extra_info):
+    """dwExtraInfo 값이 이 프로세스가 보낸 입력인지 확인"""
+    if isinstance(extra_info, PUL):
+        extra_info = ctypes.cast(extra_info, ctypes.c_void_p).value
+    return extra_info == INJECTED_MARKER
+
+# DirectInput 확장 스캔코드 -> Linux 키코드 (나머지는 값이 같음)
+LINUX_EXTENDED_KEYCODES = {
+    0xC8: 103, 0xD0: 108, 0xCB: 105, 0xCD: 106,   # 방향키
+    0xD3: 111, 0xD2: 110, 0xC7: 102, 0xCF: 107,   # delete, insert, home, end
+    0xC9: 104, 0xD1: 109,                         # pageup, pagedown
+    0xB5: 98, 0x9C: 96,                           # num/, numenter
+    0x9D: 97, 0xB8: 100,                          # rightctrl, rightalt
+    0xDB: 125, 0xDC: 126, 0xDD: 127,              # win, rightwin, menu
+    0xB7: 99, 0xC5: 119,                          # printscreen, pause
+}
+
+
+class SendInputBackend:
+    """Windows SendInput 출력"""
+    __slots__ = ('_send_input',)
+
+    def __init__(self):
+        try:
+            from ctypes import windll
+        except ImportError:
+            raise RuntimeError("SendInput backend is only available on Windows")
+
+        self._send_input = windll.user32.SendInput
+
+    def send(self, inputs, count):
+        """Input 배열 전송"""
+        return self._send_input(count, inputs, INPUT_SIZE)
+
+
+class UInputBackend:
+    """Linux uinput 출력 (python-evdev 필요, 키보드 입력만)"""
+    __slots__ = ('_device', '_ev_key')
+
+    def __init__(self):
+        try:
+            from evdev import UInput, ecodes
+        except ImportError:
+            raise RuntimeError("uinput backend requires the 'evdev' package")
+
+        self._device = UInput(name='KeyM')
+        self._ev_key = ecodes.EV_KEY
+
+    def send(self, inputs, count):
+        """Input 배열을 evdev 이벤트로 변환해 전송 (유니코드 문자 입력은 키코드가 없어 건너뜀)"""
+        write = self._device.write
+        for i in range(count):
+            inp = inputs[i]
+            if inp.type != INPUT_KEYBOARD:
+                continue
+
+            ki = inp.ii.ki
+            if ki.dwFlags & KEYEVENTF_UNICODE:
+                continue
+            code = LINUX_EXTENDED_KEYCODES.get(ki.wScan, ki.wScan)
+            write(self._ev_key, code, 0 if ki.dwFlags & KEYEVENTF_KEYUP else 1)
+
+        self._device.syn()
+        return count
+
+    def close(self):
+        """장치 해제"""
+        self._device.close()
+
+
+class NullBackend:
+    """출력 없음 (측정용)"""
+    __slots__ = ()
+
+    def send(self, inputs, count):
+        return count
+
+
+class RecordingBackend:
+    """메모리 기록 출력
+
+    events: (t_ns, type, scan_code, flags) 튜플 목록
+    (마우스 입력은 scan_code 자리에 (dx, dy, mouseData))
+    """
+    __slots__ = ('events', 'calls', '_clock', '_lock')
+
+    def __init__(self, clock=time.perf_counter_ns):
+        self.events = []
+        self.calls = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def send(self, inputs, count):
+        """Input 배열 기록"""
+        t = self._clock()
+        with self._lock:
+            self.calls += 1
+            append = self.events.append
+            for i in range(count):
+                inp = inputs[i]
+                if inp.type == INPUT_KEYBOARD:
+                    ki = inp.ii.ki
+                    append((t, INPUT_KEYBOARD, ki.wScan, ki.dwFlags))
+                elif inp.type == INPUT_MOUSE:
+                    mi = inp.ii.mi
+                    data = mi.mouseData - (1 << 32) if mi.mouseData >= 1 << 31 else mi.mouseData
+                    append((t, INPUT_MOUSE, (mi.dx, mi.dy, data), mi.dwFlags))
+        return count
+
+    def clear(self):
+        """기록 초기화"""
+        with self._lock:
+            self.events = []
+            self.calls = 0
+
+
+BACKENDS = {
+    'sendinput': SendInputBackend,
+    'uinput': UInputBackend,
+    'null': NullBackend,
+    'recording': RecordingBackend,
+}
+
+def create_backend(backend=None):
+    """출력 백엔드 생성 (이름 또는 인스턴스)"""
+    if backend is None:
+        backend = 'sendinput' if os.name == 'nt' else 'null'
+
+    if isinstance(backend, str):
+        cls = BACKENDS.get(backend.lower())
+        if cls is None:
+            raise ValueError(f"Unknown output backend: {backend}")
+        return cls()
+
+    if not callable(getattr(backend, 'send', None)):
+        raise ValueError("Output backend must provide send(inputs, count)")
+
+    return backend
@@ -0,0 +1,1909 @@
+import os
+import sys
+import time
+import threading
+import argparse
+import importlib.util
+
+from backend import RecordingBackend, INPUT_MOUSE, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE, is_injected
+from core import (MacroCore, SCANCODE_MAP, STEP_BLOCK, RUNNING, ALT_KEYS, ECHO_WINDOW_NS, MOUSE_ACTIONS,
+                  expand_actions, text_chunks)
+
+# ========================================
+# 공통 도구
+# ========================================
+
+def load_config(path=None):
+    """config 모듈 로드 (경로 지정 가능)"""
+    if not path:
+        import config
+        return config
+
+    spec = importlib.util.spec_from_file_location('bench_config', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_macros(config, zero=False):
+    """앱과 같은 경로로 매크로 변환 (zero=True면 모든 대기 0)
+
+    반복/서브루틴 블록은 실행 순서대로 펼친 (hold, key, delay) 목록으로 반환
+    """
+    from app import MacroApp
+
+    app = MacroApp('null')
+    defaults = app._read_defaults(config)
+    if zero:
+        defaults.update(press=0, release=0, sequence=0, text_rate=0)
+
+    raw_subroutines = getattr(config, 'SUBROUTINES', {})
+    subroutines = app._convert_subroutines(raw_subroutines, defaults)
+    converted = app._convert_actions(app._normalize_macros(config.MACROS), defaults, raw_subroutines)
+    for info in converted.values():
+        info['actions'] = list(expand_actions(info['actions'], subroutines))
+
+    if zero:
+        for info in converted.values():
+            info['actions'] = [_zero_action(item) for item in info['actions']]
+
+    return converted, defaults
+
+def _zero_action(item):
+    """액션의 모든 대기를 0으로 (문자 간격, 클릭 홀드, 이동 시간 포함)"""
+    kind = item[0]
+    if kind == 'text':
+        return item[:3] + (0, 0)
+    if kind == 'click':
+        return (kind, item[1], 0, 0)
+    if kind == 'rmove':
+        return item[:3] + (0,) + item[4:7] + (0,)
+    if kind in MOUSE_ACTIONS:
+        return item[:-1] + (0,)
+    return (0, item[1], 0)
+
+def _action_time(item):
+    """키 외 액션(문자/마우스)의 실행 시간 (초, 컴파일과 같은 대기 계산)"""
+    from analyzer import _measure_mouse
+
+    if item[0] == 'text':
+        _, text, size, interval, delay = item
+        chunks = text_chunks(text, size)
+        return sum(len(chunk) * interval for chunk in chunks[:-1]) + max(delay, 0)
+    return _measure_mouse(item)[1] / 1e9
+
+def expected_steps(actions):
+    """실제 출력되는 스캔코드 키의 [scan, hold, gap] 목록 (트리거 키 자신도 출력됨)
+
+    문자/마우스 액션은 키 쌍을 만들지 않으므로 실행 시간을 앞 키의 gap에 더함
+    (첫 키보다 앞이면 반복 시 이어지는 마지막 키의 gap에 더함)
+    """
+    steps = []
+    leading = 0.0
+
+    for item in actions:
+        if item[0] == 'text' or item[0] in MOUSE_ACTIONS:
+            if steps:
+                steps[-1][2] += _action_time(item)
+            else:
+                leading += _action_time(item)
+            continue
+
+        hold, key, delay = item
+        scan_code = SCANCODE_MAP.get(key)
+        if scan_code is None:
+            continue
+
+        steps.append([scan_code, hold, delay])
+
+    if steps:
+        steps[-1][2] += leading
+    return steps
+
+def program_sends(program):
+    """컴파일된 프로그램 1회 실행의 전송 횟수 (블록은 본문 × 반복 횟수)"""
+    return sum(step.repeat * program_sends(step.body) if step.flags & STEP_BLOCK else bool(step.count)
+               for step in program)
+
+def percentile(values, p):
+    """단순 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def key_pairs(events):
+    """기록된 키 이벤트를 (down_t, up_t, scan) 쌍으로 묶음 (마우스/유니코드 입력 제외)"""
+    pairs = []
+    downs = {}
+
+    for t, kind, scan_code, flags in events:
+        if kind == INPUT_MOUSE or flags & KEYEVENTF_UNICODE:
+            continue
+        if flags & KEYEVENTF_KEYUP:
+            down_t = downs.pop(scan_code, None)
+            if down_t is not None:
+                pairs.append((down_t, t, scan_code))
+        else:
+            downs[scan_code] = t
+
+    pairs.sort()
+    return pairs
+
+def timing_errors(pairs, steps, sequence, repeat):
+    """설정값 대비 hold/gap 오차(ns)와 예정 총 시간 계산"""
+    hold_err = []
+    gap_err = []
+    scheduled = 0.0
+    count = len(steps)
+
+    if not count:
+        return hold_err, gap_err, scheduled
+
+    for i, (down_t, up_t, _) in enumerate(pairs):
+        _, hold, gap = steps[i % count]
+        hold_err.append((up_t - down_t) - hold * 1e9)
+        scheduled += hold * 1e9
+
+        if i + 1 < len(pairs):
+            if i % count == count - 1:
+                gap += sequence if repeat else 0
+            gap_err.append((pairs[i + 1][0] - up_t) - gap * 1e9)
+            scheduled += gap * 1e9
+
+    return hold_err, gap_err, scheduled
+
+def sim_errors(events, steps, sequence, mode, release_ns=float('inf')):
+    """가상 시계 기록 이벤트 → (최대 키 타이밍 오차 us, 뗌 이후 새로 시작한 입력 수)
+
+    뗌에 잘린 마지막 홀드는 오차 계산에서 제외, 마우스 버튼 뗌은 새 입력이 아님
+    """
+    from mouse import BUTTONS
+
+    mouse_ups = {up for _, up in BUTTONS.values()}
+    pairs = [pair for pair in key_pairs(events) if pair[1] < release_ns]
+    hold_err, gap_err, _ = timing_errors(pairs, steps, sequence, mode == 1)
+    worst = max((abs(e) for e in hold_err + gap_err), default=0.0) / 1e3
+    late = sum(1 for t, kind, _, flags in events if t > release_ns and
+               (flags not in mouse_ups if kind == INPUT_MOUSE else not flags & KEYEVENTF_KEYUP))
+    return worst, late
+
+def run_macro(core, trigger, info, repeat=False, duration=0.0):
+    """실제 _run_once/_run_repeat 경로로 매크로 실행 (mode 0/빈 매크로처럼 프로그램이 없으면 False)"""
+    program = core.programs.get(trigger)
+    if not program:
+        return False
+
+    if not repeat:
+        core._run_once(core._begin_run(trigger, 2), program)
+        return True
+
+    run = core._begin_run(trigger, 1)
+
+    worker = threading.Thread(target=core._run_repeat, args=(run, program), daemon=True)
+    worker.start()
+    time.sleep(duration)
+    run.stop()
+    worker.join()
+    return True
+
+def _fmt_ms(ns):
+    return f"{ns / 1e6:8.3f}"
+
+# ========================================
+# 벤치마크 스위트
+# ========================================
+
+def bench_macros(args):
+    """config.MACROS 전체 실행 측정"""
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, zero=args.zero)
+
+    recorder = RecordingBackend()
+    core = MacroCore(recorder)
+    core.configure(macros, defaults)
+
+    print("=" * 99)
+    print(f"{'trigger':<10}{'mode':>5}{'iter':>9}{'events':>8}{'calls':>7}{'events/s':>11}"
+          f"{'ovh/evt ms':>12}{'hold err ms':>14}{'gap err ms':>14}{'p95 ms':>9}")
+    print("=" * 99)
+
+    for trigger, info in macros.items():
+        if args.trigger and trigger not in args.trigger:
+            continue
+
+        mode = info['mode']
+        repeat = args.repeat or mode == 1
+        if mode == 0:
+            print(f"{trigger:<10}{mode:>5}   (비활성)")
+            continue
+
+        steps = expected_steps(info['actions'])
+        loop_time = sum(hold + gap for _, hold, gap in steps) + defaults['sequence']
+        duration = max(loop_time * args.iterations, args.min_duration)
+
+        recorder.clear()
+        start = time.perf_counter_ns()
+        if not run_macro(core, trigger, info, repeat, duration):
+            print(f"{trigger:<10}{mode:>5}   (실행할 입력 없음)")
+            continue
+
+        events = list(recorder.events)
+        pairs = key_pairs(events)
+        if repeat and pairs:
+            # 중단으로 잘린 마지막 쌍 제외
+            pairs = pairs[:-1]
+
+        hold_err, gap_err, scheduled = timing_errors(
+            pairs, steps, defaults['sequence'], repeat)
+
+        elapsed = (events[-1][0] - start) if events else 0
+        n_events = len(events)
+        iterations = len(pairs) / len(steps) if steps else 0
+        rate = n_events / (elapsed / 1e9) if elapsed else 0.0
+        overhead = (elapsed - scheduled) / n_events if n_events else 0.0
+        errors = [abs(e) for e in hold_err + gap_err]
+        mean_hold = sum(hold_err) / len(hold_err) if hold_err else 0.0
+        mean_gap = sum(gap_err) / len(gap_err) if gap_err else 0.0
+
+        print(f"{trigger:<10}{mode:>5}{iterations:>9.1f}{n_events:>8}{recorder.calls:>7}{rate:>11.1f}"
+              f"{_fmt_ms(overhead):>12}{_fmt_ms(mean_hold):>14}{_fmt_ms(mean_gap):>14}"
+              f"{_fmt_ms(percentile(errors, 95)):>9}")
+
+    print("=" * 99)
+    core.cleanup()
+    return 0
+
+def bench_batch(args):
+    """대기 0 구간 묶음 전송 효과 측정 (SendInput 호출 수, 실행 시간)"""
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, zero=True)
+    runs = args.runs
+
+    print("=" * 84)
+    print(f"{'trigger':<10}{'actions':>8}{'events':>8}{'calls off':>11}{'calls on':>10}"
+          f"{'us/run off':>13}{'us/run on':>12}{'speedup':>10}")
+    print("=" * 84)
+
+    for trigger, info in macros.items():
+        if args.trigger and trigger not in args.trigger:
+            continue
+
+        result = {}
+        for batch in (False, True):
+            recorder = RecordingBackend()
+            core = MacroCore(recorder, batch_input=batch)
+            core.configure(macros, defaults)
+
+            program = core.programs.get(trigger)
+            if not program:
+                core.cleanup()
+                break
+
+            start = time.perf_counter_ns()
+            for _ in range(runs):
+                core._run_once(core._begin_run(trigger, 2), program)
+            elapsed = time.perf_counter_ns() - start
+
+            result[batch] = (recorder.calls / runs, len(recorder.events) / runs, elapsed / runs)
+            core.cleanup()
+
+        if not result:
+            continue
+        calls_off, events, time_off = result[False]
+        calls_on, _, time_on = result[True]
+        speedup = time_off / time_on if time_on else 0.0
+
+        print(f"{trigger:<10}{len(info['actions']):>8}{events:>8.0f}{calls_off:>11.0f}{calls_on:>10.0f}"
+              f"{time_off / 1e3:>13.1f}{time_on / 1e3:>12.1f}{speedup:>9.2f}x")
+
+    print("=" * 84)
+    print(f"hold/delay 0 기준, 트리거당 {runs}회 실행 평균")
+    return 0
+
+class CountingBackend:
+    """호출/이벤트 수만 세는 출력 (기록 비용 제외용)"""
+    __slots__ = ('calls', 'events', 'last_ns')
+
+    def __init__(self):
+        self.calls = 0
+        self.events = 0
+        self.last_ns = 0
+
+    def send(self, inputs, count):
+        self.calls += 1
+        self.events += count
+        self.last_ns = time.perf_counter_ns()
+        return count
+
+def bench_overhead(args):
+    """mode 1 루프의 입력 이벤트당 엔진 오버헤드 측정 (대기 0)"""
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, zero=True)
+    duration = max(args.min_duration, 1.0)
+
+    print("=" * 60)
+    print(f"{'trigger':<10}{'loops':>10}{'events':>12}{'calls':>10}{'ns/event':>14}")
+    print("=" * 60)
+
+    for trigger, info in macros.items():
+        if args.trigger and trigger not in args.trigger:
+            continue
+
+        counter = CountingBackend()
+        core = MacroCore(counter)
+        core.configure(macros, defaults)
+
+        start = time.perf_counter_ns()
+        if not run_macro(core, trigger, info, repeat=True, duration=duration):
+            core.cleanup()
+            continue
+        elapsed = counter.last_ns - start
+
+        # 문자/마우스 액션은 키 눌림/뗌 쌍이 아니므로 이벤트 단위로 계산
+        events = counter.events
+        loops = core.stats[trigger].iterations if trigger in core.stats else 0
+        per_event = elapsed / events if events else 0.0
+
+        print(f"{trigger:<10}{loops:>10}{events:>12}{counter.calls:>10}{per_event:>14.1f}")
+        core.cleanup()
+
+    print("=" * 60)
+    return 0
+
+LEGACY_CHECK_INTERVAL = 0.001  # 이전 폴링 방식의 체크 간격
+
+def _thread_switches(native_id):
+    """스레드의 자발적 컨텍스트 스위치 수 (Linux 전용, 없으면 None)"""
+    try:
+        with open(f'/proc/self/task/{native_id}/status') as f:
+            for line in f:
+                if line.startswith('voluntary_ctxt_switches'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _legacy_poll_wait(cancel, duration, counter):
+    """이전 방식: CHECK_INTERVAL마다 깨어나 중단 조건 확인"""
+    end_time = time.perf_counter() + duration
+    while time.perf_counter() < end_time:
+        if cancel.is_set():
+            return False
+        counter[0] += 1
+        time.sleep(LEGACY_CHECK_INTERVAL)
+    return not cancel.is_set()
+
+def bench_wait(args):
+    """중단 가능 대기: 깨어남 횟수와 해제→중지 지연 측정"""
+    from core import MacroRun
+
+    hold = 1.0
+    cancel_after = 0.3
+    rounds = args.rounds
+    core = MacroCore('null')
+
+    def measure(strategy):
+        wakeups = []
+        switches = []
+        cpu = []
+        latency = []
+
+        for _ in range(rounds):
+            run = MacroRun('bench', 1)
+            counter = [0]
+            result = {}
+
+            def waiter():
+                result['tid'] = threading.get_native_id()
+                result['switch0'] = _thread_switches(result['tid'])
+                cpu0 = time.thread_time_ns()
+                if strategy == 'poll':
+                    _legacy_poll_wait(run.cancel, hold, counter)
+                else:
+                    run.begin()
+                    core._wait_until(run, int(hold * 1e9))
+                result['end'] = time.perf_counter_ns()
+                result['cpu'] = time.thread_time_ns() - cpu0
+                result['switch1'] = _thread_switches(result['tid'])
+
+            worker = threading.Thread(target=waiter, daemon=True)
+            worker.start()
+            time.sleep(cancel_after)
+            released = time.perf_counter_ns()
+            run.cancel.set()
+            worker.join()
+
+            wakeups.append(counter[0] if strategy == 'poll' else 1)
+            if result['switch0'] is not None and result['switch1'] is not None:
+                switches.append(result['switch1'] - result['switch0'])
+            cpu.append(result['cpu'])
+            latency.append(result['end'] - released)
+
+        return wakeups, switches, cpu, latency
+
+    print("=" * 88)
+    print(f"대기 {hold:.1f}s 중 {cancel_after:.1f}s 시점에 해제, {rounds}회")
+    print(f"{'strategy':<10}{'wakeups':>10}{'ctx sw':>10}{'cpu us':>10}"
+          f"{'p50 lat us':>14}{'p99 lat us':>14}{'max lat us':>14}")
+    print("=" * 88)
+
+    for strategy in ('poll', 'event'):
+        wakeups, switches, cpu, latency = measure(strategy)
+        sw = f"{sum(switches) / len(switches):>10.1f}" if switches else f"{'n/a':>10}"
+        print(f"{strategy:<10}{sum(wakeups) / rounds:>10.1f}{sw}{sum(cpu) / rounds / 1e3:>10.1f}"
+              f"{percentile(latency, 50) / 1e3:>14.1f}{percentile(latency, 99) / 1e3:>14.1f}"
+              f"{max(latency) / 1e3:>14.1f}")
+
+    # 실제 mode 1 경로: 홀드 중 트리거 해제 → key-up 전송까지
+    recorder = RecordingBackend()
+    core = MacroCore(recorder)
+    core.configure({'bench': {'actions': [(hold, 'a', 0)], 'mode': 1}},
+                   {'press': hold, 'release': 0, 'sequence': 0})
+    latency = []
+    switches = []
+
+    for _ in range(rounds):
+        recorder.clear()
+        state = core.states['bench']
+        run = core._begin_run('bench', 1, core.press(state))
+        worker = threading.Thread(target=core._run_repeat, args=(run, core.programs['bench']), daemon=True)
+        worker.start()
+        time.sleep(0.01)
+        switch0 = _thread_switches(worker.native_id)
+        time.sleep(cancel_after)
+        switch1 = _thread_switches(worker.native_id)
+
+        # 핸들러의 release 처리와 동일
+        released = time.perf_counter_ns()
+        core.release(state)
+        worker.join()
+
+        ups = [t for t, _, _, flags in recorder.events if flags & KEYEVENTF_KEYUP]
+        if ups:
+            latency.append(ups[-1] - released)
+        if switch0 is not None and switch1 is not None:
+            switches.append(switch1 - switch0)
+
+    sw = f"{sum(switches) / len(switches):.1f}" if switches else "n/a"
+    print("-" * 88)
+    print(f"mode 1 홀드 중 해제 → key-up: p50 {percentile(latency, 50) / 1e3:.1f}us, "
+          f"max {max(latency) / 1e3:.1f}us, 대기 중 컨텍스트 스위치 {sw}")
+    print("=" * 88)
+    core.cleanup()
+    return 0
+
+def bench_drift(args):
+    """mode 1 반복 시 누적 드리프트 측정 (절대 기한 스케줄링 검증)"""
+    config = load_config(args.config)
+    macros, defaults = load_macros(config)
+    loops = max(args.iterations, 20)
+
+    recorder = RecordingBackend()
+    core = MacroCore(recorder)
+    core.configure(macros, defaults)
+
+    print("=" * 90)
+    print(f"{'trigger':<10}{'loops':>7}{'loop ms':>10}{'drift@1 ms':>12}{'drift@N ms':>12}"
+          f"{'wait mean ms':>14}{'wait max ms':>13}{'resyncs':>9}")
+    print("=" * 90)
+
+    for trigger, info in macros.items():
+        if args.trigger and trigger not in args.trigger:
+            continue
+        if info['mode'] == 0:
+            continue
+
+        steps = expected_steps(info['actions'])
+        if not steps:
+            continue
+        loop_ns = (sum(hold + gap for _, hold, gap in steps) + defaults['sequence']) * 1e9
+
+        recorder.clear()
+        start = time.perf_counter_ns()
+        run_macro(core, trigger, info, repeat=True, duration=loops * loop_ns / 1e9)
+
+        # 각 루프 첫 key-down의 예정 시각 대비 지연
+        pairs = key_pairs(recorder.events)
+        count = len(steps)
+        full = len(pairs) // count
+        drifts = [pairs[k * count][0] - (start + k * loop_ns) for k in range(full)]
+        stats = core.stats[trigger].summary()
+
+        print(f"{trigger:<10}{full:>7}{loop_ns / 1e6:>10.1f}"
+              f"{(drifts[1] if len(drifts) > 1 else 0) / 1e6:>12.3f}{(drifts[-1] if drifts else 0) / 1e6:>12.3f}"
+              f"{stats['mean_drift_ms']:>14.3f}{stats['max_drift_ms']:>13.3f}{stats['resyncs']:>9}")
+
+    print("=" * 90)
+    print("drift@k: k번째 루프 시작 시각 - (실행 시작 + k × 루프 시간)")
+    core.cleanup()
+    return 0
+
+def bench_timer(args):
+    """대기 전략별 정확도 백분위수와 CPU 사용 측정"""
+    from timing import PrecisionTimer, STRATEGIES
+
+    targets = (0.001, 0.005, 0.01, 0.02)
+    samples = args.samples
+    cancel = threading.Event()
+
+    # time.sleep 해상도
+    overshoot = []
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        time.sleep(0.001)
+        overshoot.append(time.perf_counter_ns() - start - 1_000_000)
+
+    probe = PrecisionTimer('hybrid', args.spin_budget)
+    probe.calibrate()
+
+    print("=" * 86)
+    print(f"time.sleep(1ms) 초과: p50 {percentile(overshoot, 50) / 1e3:.1f}us, "
+          f"p90 {percentile(overshoot, 90) / 1e3:.1f}us")
+    print(f"보정 결과: 대기 해상도 {probe.resolution_ns / 1e3:.1f}us, "
+          f"스핀 구간 {probe.spin_ns / 1e3:.1f}us, 스핀 예산 {args.spin_budget:.0%}, "
+          f"OS 타이머 {f'{probe.period_ms}ms' if probe.period_ms else '기본'}")
+    print("=" * 86)
+    print(f"{'strategy':<10}{'target ms':>10}{'spin us':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"
+          f"{'max us':>10}{'cpu %':>9}")
+    print("-" * 86)
+
+    for strategy in STRATEGIES:
+        timer = PrecisionTimer(strategy, args.spin_budget)
+        timer.resolution_ns = probe.resolution_ns
+        timer.spin_ns = probe.spin_ns
+
+        for target in targets:
+            wait_ns = int(target * 1e9)
+            errors = []
+            cpu0 = time.thread_time_ns()
+            wall0 = time.perf_counter_ns()
+
+            deadline = time.perf_counter_ns()
+            for _ in range(samples):
+                deadline += wait_ns
+                timer.wait_until(deadline, cancel, wait_ns)
+                errors.append(time.perf_counter_ns() - deadline)
+
+            cpu = (time.thread_time_ns() - cpu0) / (time.perf_counter_ns() - wall0) * 100
+            spin = {'sleep': 0, 'hybrid': timer.spin_window(wait_ns), 'busy': wait_ns}[strategy]
+            print(f"{strategy:<10}{target * 1e3:>10.0f}{spin / 1e3:>10.1f}{percentile(errors, 50) / 1e3:>10.1f}"
+                  f"{percentile(errors, 95) / 1e3:>10.1f}{percentile(errors, 99) / 1e3:>10.1f}"
+                  f"{max(errors) / 1e3:>10.1f}{cpu:>9.1f}")
+
+    print("=" * 86)
+    probe.close()
+    print("오차: 기한 대비 실제 복귀 시각 (절대 기한 기준 연속 대기)")
+    return 0
+
+class FakeEvent:
+    """keyboard 이벤트 대용 (name, scan_code, event_type)"""
+    __slots__ = ('name', 'scan_code', 'event_type', 'time')
+
+    def __init__(self, name, event_type='down', scan_code=0):
+        self.name = name
+        self.scan_code = scan_code
+        self.event_type = event_type
+        self.time = time.time()
+
+class ThreadCounter:
+    """측정 구간 동안 시작된 스레드 수 집계"""
+
+    def __init__(self):
+        self.started = 0
+        self.peak = threading.active_count()
+        self._original = None
+
+    def __enter__(self):
+        original = self._original = threading.Thread.start
+        counter = self
+
+        def start(thread):
+            counter.started += 1
+            original(thread)
+            counter.peak = max(counter.peak, threading.active_count())
+
+        threading.Thread.start = start
+        return self
+
+    def __exit__(self, *exc):
+        threading.Thread.start = self._original
+
+def bench_scheduler(args):
+    """트리거 연타 시 타이머 스레드 생성 수와 예약 지연 측정"""
+    from scheduler import Scheduler
+    from handler import EventHandler
+
+    count = args.runs * 10
+    keys = [f'k{i}' for i in range(10)]
+    delay = 0.02
+
+    print("=" * 84)
+    print(f"예약 {count}회 (키 10개에 반복 재예약, {delay * 1e3:.0f}ms 뒤 실행)")
+    print(f"{'method':<18}{'threads':>9}{'peak':>7}{'us/call':>10}{'fired':>8}"
+          f"{'p50 lat us':>12}{'p99 lat us':>12}")
+    print("=" * 84)
+
+    for method in ('threading.Timer', 'Scheduler'):
+        latency = []
+        fired = [0]
+        handles = {}
+        scheduler = Scheduler()
+
+        def fire(key, due):
+            fired[0] += 1
+            latency.append((time.perf_counter() - due) * 1e9)
+
+        with ThreadCounter() as threads:
+            start = time.perf_counter_ns()
+            for i in range(count):
+                key = keys[i % len(keys)]
+                due = time.perf_counter() + delay
+                old = handles.get(key)
+                if old:
+                    old.cancel()
+                if method == 'Scheduler':
+                    handles[key] = scheduler.call_later(delay, fire, key, due)
+                else:
+                    timer = threading.Timer(delay, fire, args=(key, due))
+                    handles[key] = timer
+                    timer.start()
+            per_call = (time.perf_counter_ns() - start) / count
+            time.sleep(delay * 5)
+
+        scheduler.shutdown()
+        print(f"{method:<18}{threads.started:>9}{threads.peak:>7}{per_call / 1e3:>10.2f}{fired[0]:>8}"
+              f"{percentile(latency, 50) / 1e3:>12.1f}{percentile(latency, 99) / 1e3:>12.1f}")
+
+    # 실제 핸들러 경로: mode 2 트리거 연타
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, zero=True)
+    core = MacroCore(RecordingBackend())
+    core.configure(macros, defaults)
+    handler = EventHandler(core, config.TOGGLE_KEY, config.FORCE_QUIT_KEYS)
+    trigger = next(key for key, info in macros.items() if info['mode'] == 2)
+    spam = args.runs * 5
+
+    with ThreadCounter() as threads:
+        for _ in range(spam):
+            handler.handle_press(FakeEvent(trigger, 'down'))
+            handler.handle_release(FakeEvent(trigger, 'up'))
+            time.sleep(0.0005)
+        time.sleep(0.1)
+        handler.close()
+
+    print("-" * 84)
+    print(f"핸들러 경로 [{trigger}] 누름/뗌 {spam}회: 스레드 생성 {threads.started}개 "
+          f"(매크로 실행 스레드 포함)")
+    print("=" * 84)
+    core.cleanup()
+    return 0
+
+def bench_latency(args):
+    """트리거 → 첫 SendInput 지연: 요청마다 스레드 생성 vs 스레드 풀"""
+    from pool import WorkerPool, DEFAULT_POOL_SIZE
+
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, zero=True)
+    trigger = next(key for key, info in macros.items() if info['mode'] == 2)
+    rounds = args.runs
+
+    print("=" * 72)
+    print(f"[{trigger}] start() → 첫 SendInput, {rounds}회")
+    print(f"{'method':<22}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'max us':>10}")
+    print("=" * 72)
+
+    # 'pool + N loops': 스레드 수보다 많은 mode 1 반복이 실행 중일 때도 mode 2가 바로 시작되는지
+    loops = [f'{trigger}#{i}' for i in range(DEFAULT_POOL_SIZE + 1)]
+    failed = False
+    for label, size, looping in (('thread per start', 0, ()),
+                                 (f'pool ({DEFAULT_POOL_SIZE} workers)', DEFAULT_POOL_SIZE, ()),
+                                 (f'pool + {len(loops)} loops', DEFAULT_POOL_SIZE, loops)):
+        core = MacroCore(RecordingBackend(), pool=WorkerPool(size))
+        core.configure(dict(macros, **{key: dict(macros[trigger], mode=1) for key in looping}), defaults)
+        for key in looping:
+            core.start(key)
+        event = core.mode2_events[trigger]
+        latency = []
+
+        for _ in range(rounds):
+            if not core.start(trigger):
+                continue
+            if not event.wait(1.0):
+                break
+            time.sleep(0.001)
+            latency.append(core.stats[trigger].start_latency)
+
+        if len(latency) < rounds:
+            failed = True
+            print(f"{label:<22}{'FAIL':>10} ({len(latency)}/{rounds}회만 시작)")
+        else:
+            print(f"{label:<22}{percentile(latency, 50) / 1e3:>10.1f}{percentile(latency, 95) / 1e3:>10.1f}"
+                  f"{percentile(latency, 99) / 1e3:>10.1f}{max(latency) / 1e3:>10.1f}")
+        core.cleanup()
+
+    print("=" * 72)
+    return 1 if failed else 0
+
+def bench_concurrent(args):
+    """mode 1 매크로 1/2/4개 동시 반복 처리량과 실행 간 공정성"""
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, args.zero)
+    source = (args.trigger or [key for key, info in macros.items() if info['actions']])[0]
+    # 대기 0이면 MAX_ITERATIONS에 닿기 전에 끊음
+    duration = args.min_duration if args.zero else max(args.min_duration, 1.0)
+
+    print("=" * 84)
+    print(f"[{source}] mode 1 동시 반복 {duration:.1f}s씩 ({'대기 0' if args.zero else '설정 타이밍'})")
+    print(f"{'runs':>5}{'iter/s':>12}{'events/s':>12}{'sends min':>13}{'sends max':>13}"
+          f"{'fairness':>10}{'mean drift ms':>16}")
+    print("=" * 84)
+
+    for count in (1, 2, 4):
+        # 같은 트리거는 동시에 하나만 실행되므로 같은 동작의 복사본을 등록 (공정성 비교)
+        chosen = [f'{source}#{i}' for i in range(count)]
+        bench_macros = {key: dict(macros[source], mode=1) for key in chosen}
+        backend = RecordingBackend()
+        core = MacroCore(backend)
+        core.configure(bench_macros, defaults)
+
+        runs = []
+        for key in chosen:
+            runs.append(core._begin_run(key, 1))
+
+        start = time.perf_counter()
+        for run in runs:
+            core._submit(run, core._run_repeat, core.programs[run.trigger])
+        time.sleep(duration)
+        for key in chosen:
+            core.stop(key)
+        while core.runs:
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+
+        iterations = [run.stats.iterations for run in runs]
+        total = sum(iterations)
+        drift = sum(run.stats.total_drift for run in runs) / max(1, sum(run.stats.waits for run in runs))
+        sends = [run.stats.sends for run in runs]
+        fairness = min(sends) / max(sends) if max(sends) else 0.0
+        print(f"{count:>5}{total / elapsed:>12.1f}{len(backend.events) / elapsed:>12.0f}"
+              f"{min(sends):>13}{max(sends):>13}{fairness:>10.2f}{drift / 1e6:>16.3f}")
+        core.cleanup()
+
+    print("=" * 84)
+    return 0
+
+def bench_telemetry(args):
+    """config.MACROS 실행 후 텔레메트리 보고서 (설정값 대비 실제 전송 시각 오차)"""
+    from telemetry import Telemetry
+
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, args.zero)
+    core = MacroCore(RecordingBackend())
+    core.configure(macros, defaults)
+
+    for trigger, info in macros.items():
+        if args.trigger and trigger not in args.trigger:
+            continue
+        if not info['mode'] or not core.programs.get(trigger):
+            continue
+
+        repeat = args.repeat or info['mode'] == 1
+        run_macro(core, trigger, info, repeat=repeat, duration=args.min_duration)
+
+    print("=" * 68)
+    print(core.telemetry.format_report())
+    print("=" * 68)
+
+    # 기록 1회 비용
+    telemetry = Telemetry()
+    telemetry.register('bench', core.programs[next(iter(core.programs))])
+    record = telemetry.record
+    count = args.runs * 500
+    start = time.perf_counter_ns()
+    for i in range(count):
+        record(i, 0, 0, i, i)
+    per_record = (time.perf_counter_ns() - start) / count
+    print(f"record() 1회: {per_record:.0f} ns (SendInput 호출당 1회, 할당 없음)")
+
+    if args.dump:
+        print(f"저장: {core.telemetry.dump(args.dump)}")
+
+    core.cleanup()
+    return 0
+
+HOOK_BUCKETS_US = (1, 2, 5, 10, 20, 50, 100, 500)  # 지연 히스토그램 구간 상한
+
+def _hook_streams(handler, rng, count):
+    """재생할 이벤트 스트림 {이름: [(이벤트 이름, 'down'/'up', 간격 s)]}"""
+    triggers = list(handler.core.macros)
+    mode1 = [key for key in triggers if handler.core.macros[key]['mode'] == 1]
+    typing = [key for key in 'abcdefghijklmnopqrstuvwxyzABC,.; ' if key not in triggers]
+    typing[-1] = 'space'
+    toggle = handler.toggle_key
+    chord = sorted(handler.force_quit_keys)
+
+    streams = {'typing burst': [], 'trigger spam': [], 'held repeat': [], 'toggle/quit chord': []}
+
+    # 1. 빠른 타자 (미등록 키, 간격 없음)
+    for _ in range(count // 2):
+        key = rng.choice(typing)
+        streams['typing burst'] += [(key, 'down', 0), (key, 'up', 0)]
+
+    # 2. 트리거 연타
+    for _ in range(count // 2):
+        key = rng.choice(triggers)
+        streams['trigger spam'] += [(key, 'down', 0.0002), (key, 'up', 0.0002)]
+
+    # 3. 누르고 있는 키의 OS 자동 반복 (트리거/일반 키)
+    while len(streams['held repeat']) < count:
+        key = rng.choice(mode1 + typing[:3])
+        streams['held repeat'] += [(key, 'down', 0.001)] * 20 + [(key, 'up', 0.001)]
+
+    # 4. 토글 키와 강제 종료 조합 (트리거 사이사이)
+    while len(streams['toggle/quit chord']) < count:
+        key = rng.choice(triggers)
+        streams['toggle/quit chord'] += [(toggle, 'down', 0.001), (toggle, 'up', 0.001),
+                                         (key, 'down', 0.001), (key, 'up', 0.001),
+                                         (toggle, 'down', 0.001), (toggle, 'up', 0.001)]
+        streams['toggle/quit chord'] += [(name, 'down', 0.001) for name in chord]
+        streams['toggle/quit chord'] += [(name, 'up', 0.001) for name in chord]
+
+    return streams
+
+def _histogram(values_us):
+    """구간별 개수 문자열"""
+    counts = [0] * (len(HOOK_BUCKETS_US) + 1)
+    for value in values_us:
+        for i, limit in enumerate(HOOK_BUCKETS_US):
+            if value < limit:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+def bench_hook(args):
+    """가짜 keyboard 이벤트 스트림으로 handle_press/handle_release 콜백 지연 측정"""
+    import io
+    import random
+    import contextlib
+    from handler import EventHandler
+
+    class BenchHandler(EventHandler):
+        """강제 종료 조합 시 프로세스를 끝내지 않고 횟수만 기록"""
+
+        def shutdown(self):
+            self.shutdowns += 1
+
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, args.zero)
+    if not any(info['mode'] == 1 for info in macros.values()):
+        # 자동 반복 스트림용으로 첫 트리거를 mode 1로 측정
+        first = next(iter(macros))
+        macros[first] = dict(macros[first], mode=1)
+
+    rng = random.Random(0)
+    count = args.runs * 10
+    labels = ['<1'] + [f'<{limit}' for limit in HOOK_BUCKETS_US[1:]] + [f'{HOOK_BUCKETS_US[-1]}+']
+
+    print("=" * 124)
+    print(f"핸들러 콜백 지연 (us), 스트림당 약 {count}개 이벤트")
+    print(f"{'stream':<20}{'callback':<9}{'count':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>9}   "
+          + ' '.join(f'{label:>5}' for label in labels))
+    print("=" * 124)
+
+    # 'busy core lock': 트리거 연타 중 다른 스레드가 코어 _lock을 2ms씩 잡음 (실행 종료/리로드 경합)
+    for name in ('typing burst', 'trigger spam', 'held repeat', 'toggle/quit chord', 'busy core lock'):
+        core = MacroCore(RecordingBackend())
+        core.configure(macros, defaults)
+        handler = BenchHandler(core, getattr(config, 'TOGGLE_KEY', '`'),
+                               getattr(config, 'FORCE_QUIT_KEYS', None))
+        handler.shutdowns = 0
+        stream = _hook_streams(handler, rng, count)[
+            'trigger spam' if name == 'busy core lock' else name]
+        done = threading.Event()
+        if name == 'busy core lock':
+            def contend():
+                while not done.is_set():
+                    with core._lock:
+                        time.sleep(0.002)
+                    time.sleep(0.0005)
+            threading.Thread(target=contend, daemon=True).start()
+
+        callbacks = {'down': handler.handle_press, 'up': handler.handle_release}
+        latency = {'down': [], 'up': []}
+        clock = time.perf_counter_ns
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for key, edge, gap in stream:
+                event = FakeEvent(key, edge)
+                callback = callbacks[edge]
+                start = clock()
+                callback(event)
+                latency[edge].append((clock() - start) / 1e3)
+                if gap:
+                    time.sleep(gap)
+            done.set()
+            handler.close()
+
+        for edge, label in (('down', 'press'), ('up', 'release')):
+            values = latency[edge]
+            histogram = _histogram(values)
+            print(f"{name:<20}{label:<9}{len(values):>7}{percentile(values, 50):>8.1f}"
+                  f"{percentile(values, 95):>8.1f}{percentile(values, 99):>8.1f}{max(values):>9.1f}   "
+                  + ' '.join(f'{n:>5}' for n in histogram))
+
+        metrics = handler.metrics.summary()
+        print(f"{'':<20}디스패치 {metrics['dispatched']}회, 지연 p50 {metrics['lag_p50_us']:.1f}us / "
+              f"p99 {metrics['lag_p99_us']:.1f}us, 큐 최대 {metrics['max_depth']}, 버림 {metrics['dropped']}")
+        if handler.shutdowns:
+            print(f"{'':<20}강제 종료 조합 감지 {handler.shutdowns}회 (종료는 생략)")
+        core.cleanup()
+
+    print("=" * 124)
+    return 0
+
+def bench_routing(args):
+    """트리거 수(3→200)별 키 입력 1회당 분배 비용: 키별 훅 vs 전역 훅 1개"""
+    import random
+    from handler import EventHandler
+
+    names = [key for key in SCANCODE_MAP if key not in ('`', 'alt', 'shift', 'delete')]
+    scan_of = dict(SCANCODE_MAP)
+    typing = [f'text{i}' for i in range(30)]
+    for i, name in enumerate(typing):
+        scan_of[name] = 0x400 + i
+
+    rng = random.Random(0)
+    events = args.runs * 100
+
+    print("=" * 88)
+    print(f"키 입력 {events}회 (등록 키 5%), 이벤트당 ns")
+    print(f"{'triggers':>9}{'hooks(keys)':>13}{'hooks(global)':>15}"
+          f"{'keys: other':>13}{'keys: trig':>12}{'global: other':>15}{'global: trig':>14}")
+    print("=" * 88)
+
+    for count in (3, 10, 50, 100, 200):
+        triggers = [names[i] if i < len(names) else f'key{i}' for i in range(count)]
+        for i, name in enumerate(triggers):
+            scan_of.setdefault(name, 0x200 + i)
+
+        # 동작 없는 mode 2 매크로 (분배 경로만 측정)
+        macros = {key: {'mode': 2, 'actions': [(0, key, 0)]} for key in triggers}
+        core = MacroCore(RecordingBackend())
+        core.configure(macros, {'press': 0, 'release': 0, 'sequence': 0})
+        handler = EventHandler(core, '`', ['alt', 'shift', 'delete'])
+
+        # 키별 훅: keyboard.on_press_key/on_release_key가 스캔코드별 목록에 등록하는 방식 재현
+        by_scan = {}
+        registered = 0
+        for key in ['`', 'alt', 'shift', 'delete'] + triggers:
+            press, release = handler.handle_press, handler.handle_release
+            by_scan.setdefault(scan_of.get(key, 0), []).extend([
+                lambda e, cb=press: e.event_type == 'up' or cb(e),
+                lambda e, cb=release: e.event_type == 'down' or cb(e),
+            ])
+            registered += 2
+
+        def route_keys(event):
+            for hook in by_scan.get(event.scan_code, ()):
+                if not hook(event):
+                    return False
+            return True
+
+        stream = []
+        for _ in range(events // 2):
+            key = rng.choice(triggers) if rng.random() < 0.05 else rng.choice(typing)
+            stream += [FakeEvent(key, 'down', scan_of[key]), FakeEvent(key, 'up', scan_of[key])]
+
+        row = []
+        for route in (route_keys, handler.handle_event):
+            cost = {False: [0, 0], True: [0, 0]}
+            clock = time.perf_counter_ns
+            for event in stream:
+                start = clock()
+                route(event)
+                elapsed = clock() - start
+                bucket = cost[event.name in macros]
+                bucket[0] += elapsed
+                bucket[1] += 1
+            row += [cost[False][0] / max(1, cost[False][1]), cost[True][0] / max(1, cost[True][1])]
+
+        print(f"{count:>9}{registered:>13}{1:>15}{row[0]:>13.0f}{row[1]:>12.0f}{row[2]:>15.0f}{row[3]:>14.0f}")
+        handler.close()
+        core.cleanup()
+
+    print("=" * 88)
+    return 0
+
+class LoopbackBackend(RecordingBackend):
+    """보낸 입력을 OS 훅처럼 핸들러에 그대로 되돌리는 기록 출력 (주입 입력 재생)
+
+    keyboard 훅처럼 유니코드 입력(VK_PACKET)과 마우스 입력, Alt가 눌린 동안의
+    주입 입력(Alt 눌림 자신 포함)은 콜백에 전달하지 않음.
+    alt에 'user'를 넣으면 사용자가 Alt를 누르고 있는 상태
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.handler = None
+        self.names = {scan: key for key, scan in SCANCODE_MAP.items()}
+        self.echoes = []   # (키, 'down'/'up', 핸들러 반환값)
+        self.alt = set()   # 눌린 Alt (주입한 키 이름 또는 'user')
+        self.dropped = 0   # 훅에 전달하지 않은 키 입력 수
+        self.marked = 0    # dwExtraInfo 표시가 있는 입력 수
+        self.sent = 0
+
+    def send(self, inputs, count):
+        super().send(inputs, count)
+        for i in range(count):
+            inp = inputs[i]
+            ki = inp.ii.mi if inp.type == INPUT_MOUSE else inp.ii.ki
+            self.sent += 1
+            self.marked += is_injected(ki.dwExtraInfo)
+            if inp.type == INPUT_MOUSE or ki.dwFlags & KEYEVENTF_UNICODE:
+                continue
+
+            key = self.names.get(ki.wScan)
+            edge = 'up' if ki.dwFlags & KEYEVENTF_KEYUP else 'down'
+            if key in ALT_KEYS:
+                (self.alt.discard if edge == 'up' else self.alt.add)(key)
+            if self.alt:
+                self.dropped += 1
+                continue
+
+            if self.handler:
+                callback = self.handler.handle_release if edge == 'up' else self.handler.handle_press
+                self.echoes.append((key, edge, callback(FakeEvent(key, edge))))
+        return count
+
+def bench_echo(args):
+    """주입 입력 재생 검사: 매크로가 보낸 입력을 훅에 되돌려 정확히 통과되는지 확인"""
+    import io
+    import contextlib
+    from handler import EventHandler
+
+    class BenchHandler(EventHandler):
+        """강제 종료 조합 시 프로세스를 끝내지 않고 횟수만 기록"""
+
+        def shutdown(self):
+            self.shutdowns += 1
+
+    timings = {'press': 0.005, 'release': 0.005, 'sequence': 0.005}
+    toggle, quit_keys = '`', ['alt', 'shift', 'delete']
+
+    def setup(macros):
+        backend = LoopbackBackend()
+        core = MacroCore(backend)
+        core.configure(macros, timings, [toggle] + quit_keys)
+        handler = BenchHandler(core, toggle, quit_keys)
+        handler.shutdowns = 0
+        backend.handler = handler
+        return core, handler, backend
+
+    def tap(handler, key):
+        handler.handle_press(FakeEvent(key, 'down'))
+        handler.handle_release(FakeEvent(key, 'up'))
+
+    def settle(core, handler):
+        handler.flush()
+        while core.runs or not handler.requests.empty():
+            time.sleep(0.001)
+            handler.flush()
+        time.sleep(0.06)  # mode 2 차단 해제 대기
+
+    def downs(backend, key):
+        scan = SCANCODE_MAP[key]
+        return sum(1 for _, _, code, flags in backend.events if code == scan and not flags & KEYEVENTF_KEYUP)
+
+    def action(key):
+        return (timings['press'], key, timings['release'])
+
+    results = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # 1. 매크로가 자기 트리거 키를 누름 → 에코는 통과, 재실행 없음
+        core, handler, backend = setup({'5': {'mode': 2, 'actions': [action('m'), action('5'), action('m')]}})
+        for _ in range(args.rounds):
+            tap(handler, '5')
+            settle(core, handler)
+        runs = downs(backend, 'm') // 2
+        echoes = [ok for key, _, ok in backend.echoes if key == '5']
+        results.append(('own trigger', len(echoes), sum(echoes),
+                        runs == args.rounds and all(echoes) and downs(backend, '5') == args.rounds))
+        handler.close()
+        core.cleanup()
+
+        # 2. 다른 매크로의 트리거를 누름 → 그 매크로는 실행 안 됨, 끝난 직후 사용자 입력은 바로 실행
+        core, handler, backend = setup({
+            '5': {'mode': 2, 'actions': [action('m'), action('6')]},
+            '6': {'mode': 2, 'actions': [action('enter')]},
+        })
+        for _ in range(args.rounds):
+            tap(handler, '5')
+            settle(core, handler)
+        injected_only = downs(backend, 'enter') == 0
+        for _ in range(args.rounds):
+            time.sleep(0.01)  # 이전 방식은 0.15초 동안 이 입력을 매크로 에코로 보고 통과시킴
+            tap(handler, '6')
+            settle(core, handler)
+        echoes = [ok for key, _, ok in backend.echoes if key == '6']
+        results.append(('other trigger', len(echoes), sum(echoes),
+                        injected_only and all(echoes) and downs(backend, 'enter') == args.rounds))
+        handler.close()
+        core.cleanup()
+
+        # 3. 토글/강제 종료 키 주입 → 토글/종료로 처리되지 않음
+        core, handler, backend = setup({'5': {'mode': 2, 'actions': [
+            action('shift'), action('alt'), (0.02, 'delete', 0), action(toggle)]}})
+        for _ in range(args.rounds):
+            tap(handler, '5')
+            settle(core, handler)
+        # Alt 눌림은 훅에 오지 않고, 뗌은 장부에 없지만 강제 종료 키 훅(suppress=False)이라 통과
+        echoes = [ok or key in ALT_KEYS for key, _, ok in backend.echoes if key in quit_keys or key == toggle]
+        results.append(('toggle/quit keys', len(echoes), sum(echoes),
+                        all(echoes) and core.macro_enabled and not handler.shutdowns and
+                        not handler.pressed_force_quit))
+        marked, sent = backend.marked, backend.sent
+        handler.close()
+        core.cleanup()
+
+        # 4. 트리거 문자가 든 문자 입력 → 훅에 오지 않으므로 바로 뒤 사용자 입력은 그대로 실행
+        core, handler, backend = setup({
+            'f4': {'mode': 2, 'actions': [('text', 'hi 5', 32, 0, 0)]},
+            '5': {'mode': 2, 'actions': [action('m')]},
+        })
+        for _ in range(args.rounds):
+            tap(handler, 'f4')
+            settle(core, handler)
+            tap(handler, '5')
+            settle(core, handler)
+        typed = _typed_text(backend.events) == 'hi 5' * args.rounds
+        echoes = [ok for key, _, ok in backend.echoes if key == '5']
+        results.append(('text with trigger', len(echoes), sum(echoes),
+                        typed and not echoes and downs(backend, 'm') == args.rounds))
+        marked, sent = marked + backend.marked, sent + backend.sent
+        handler.close()
+        core.cleanup()
+
+        # 5. 매크로가 Alt를 누른 직후 사용자의 강제 종료 조합 → Alt가 에코로 삼켜지지 않음
+        core, handler, backend = setup({'5': {'mode': 2, 'actions': [action('alt'), action('m')]}})
+        quits = 0
+        for _ in range(args.rounds):
+            handler.shutdowns = 0
+            tap(handler, '5')
+            settle(core, handler)
+            for key in quit_keys:
+                handler.handle_press(FakeEvent(key, 'down'))
+            for key in quit_keys:
+                handler.handle_release(FakeEvent(key, 'up'))
+            time.sleep(0.005)
+            quits += handler.shutdowns > 0
+        results.append(('injected alt', backend.dropped, 0, quits == args.rounds))
+        handler.close()
+        core.cleanup()
+
+        # 6. 사용자가 Alt를 누른 동안 주입된 트리거 키 → 훅에 오지 않은 기록은 입력별 시간 창 후 버림
+        core, handler, backend = setup({
+            '5': {'mode': 2, 'actions': [action('m'), action('6')]},
+            '6': {'mode': 2, 'actions': [action('enter')]},
+        })
+        for _ in range(args.rounds):
+            backend.alt.add('user')
+            tap(handler, '5')
+            settle(core, handler)
+            backend.alt.discard('user')
+            time.sleep(ECHO_WINDOW_NS / 1e9 + 0.02)  # 이전 방식은 1초 동안 이 입력을 삼킴
+            tap(handler, '6')
+            settle(core, handler)
+        results.append(('dropped while alt', backend.dropped, 0,
+                        downs(backend, 'enter') == args.rounds))
+        handler.close()
+        core.cleanup()
+
+    print("=" * 72)
+    print(f"{'scenario':<24}{'echoes':>10}{'passed':>10}{'result':>10}")
+    print("=" * 72)
+    for name, total, passed, ok in results:
+        print(f"{name:<24}{total:>10}{passed:>10}{'OK' if ok else 'FAIL':>10}")
+    print("-" * 72)
+    print(f"dwExtraInfo 표시: {marked}/{sent}개 입력")
+    print("=" * 72)
+
+    return 0 if all(ok for *_, ok in results) and marked == sent else 1
+
+def bench_sim(args):
+    """가상 시계 시뮬레이션: 타임라인이 설정값과 정확히 같은지, 실제 시간 대비 CPU 시간 측정
+
+    앱과 같은 변환(반복/서브루틴 블록)으로 실행하고, 블록을 펼친 목록으로 실행한 결과와 비교
+    """
+    from simulator import simulate
+    from app import MacroApp
+
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, args.zero)
+    if args.zero:
+        compact, subroutines = macros, None
+    else:
+        data = MacroApp('null').compile_config(config)
+        compact, subroutines = data['macros'], data['subroutines']
+    triggers = args.trigger or list(macros)
+    hold_ms = 10000  # mode 1 누르고 있는 시간
+
+    print("=" * 100)
+    print(f"가상 시계 시뮬레이션: mode 2 = 1회 탭, mode 1 = {hold_ms}ms 누른 뒤 뗌, "
+          f"오차 = 타임라인 - 설정값 (us)")
+    print(f"{'trigger':<10}{'mode':>6}{'events':>8}{'virtual ms':>13}{'cpu ms':>10}{'speedup':>10}"
+          f"{'max err':>10}{'after up':>10}{'expanded':>10}{'result':>8}")
+    print("=" * 100)
+
+    failed = False
+    for trigger in triggers:
+        if trigger not in macros:
+            print(f"[오류] 트리거 '{trigger}'이(가) 설정에 없습니다")
+            return 1
+
+        steps = expected_steps(macros[trigger]['actions'])
+        for mode in (2, 1):
+            case = {trigger: dict(compact[trigger], mode=mode)}
+            presses = [(0, 0)] if mode == 2 else [(0, hold_ms)]
+
+            start = time.process_time_ns()
+            events = simulate(case, trigger, presses, defaults, subroutines=subroutines, raw=True)
+            cpu = time.process_time_ns() - start
+            again = simulate({trigger: dict(macros[trigger], mode=mode)}, trigger, presses, defaults, raw=True)
+
+            # 뗌 이후 새로 눌린 키가 없어야 하고, 뗌에 잘린 마지막 홀드는 오차 계산에서 제외
+            release_ns = presses[-1][1] * 1e6 if mode == 1 else float('inf')
+            worst, late = sim_errors(events, steps, defaults['sequence'], mode, release_ns)
+            virtual = events[-1][0] / 1e6 if events else 0.0
+
+            ok = worst < 1.0 and not late and events == again
+            failed = failed or not ok
+            print(f"{trigger:<10}{mode:>6}{len(events):>8}{virtual:>13.3f}{cpu / 1e6:>10.2f}"
+                  f"{virtual / (cpu / 1e6) if cpu else 0.0:>9.0f}x{worst:>10.3f}{late:>10}"
+                  f"{'same' if events == again else 'differs':>10}{'OK' if ok else 'FAIL':>8}")
+
+    print("=" * 100)
+    return 1 if failed else 0
+
+BENCH_TEXT = "안녕하세요! 오늘 8시 정각에 던전 입구에서 모여요~ gg wp :) 🎮"  # 40글자 (한글/기호/BMP 밖 문자)
+
+def _typed_text(events):
+    """기록된 유니코드 눌림 → 입력된 문자열 (서로게이트 쌍 결합, CR은 줄바꿈)"""
+    units = [scan for _, _, scan, flags in events if flags & KEYEVENTF_UNICODE and not flags & KEYEVENTF_KEYUP]
+    return b''.join(code.to_bytes(2, 'little') for code in units).decode('utf-16-le', 'replace').replace('\r', '\n')
+
+def bench_text(args):
+    """문자 입력 처리량: 묶음 크기별 SendInput 호출 수와 초당 글자 수, 속도 제한 정확도
+
+    unlimited: 대기 없이 엔진 + 기록 백엔드 비용만 (실제 SendInput 비용 제외),
+    key tuples: 같은 길이를 글자마다 ('key',) 액션으로 보냈을 때 (기본 타이밍, 가상 시계)
+    """
+    from app import MacroApp
+    from simulator import simulate
+
+    config = load_config(args.config)
+    app = MacroApp('null')
+    text = BENCH_TEXT
+    runs = args.runs
+    config_chunk = app._read_defaults(config)['text_chunk']
+
+    def convert(chunk, rate, actions=None):
+        defaults = dict(app._read_defaults(config), text_chunk=chunk, text_rate=rate)
+        macros = app._convert_actions({'t': {'actions': actions or [('text', text)], 'mode': 2}}, defaults)
+        return macros, defaults
+
+    print("=" * 84)
+    print(f"문자 입력 {len(text)}글자 ({len(text.encode('utf-16-le')) // 2} UTF-16 단위), 기록 백엔드, {runs}회 평균")
+    print(f"{'case':<26}{'calls':>8}{'events':>8}{'us/run':>10}{'chars/s':>14}{'typed':>10}")
+    print("=" * 84)
+
+    failed = False
+    for chunk in (1, 8, 32, len(text)):
+        macros, defaults = convert(chunk, 0)
+        recorder = RecordingBackend()
+        core = MacroCore(recorder)
+        core.configure(macros, defaults)
+        program = core.programs['t']
+
+        start = time.perf_counter_ns()
+        for _ in range(runs):
+            core._run_once(core._begin_run('t', 2), program)
+        elapsed = (time.perf_counter_ns() - start) / runs
+
+        typed = _typed_text(recorder.events[:len(recorder.events) // runs])
+        failed = failed or typed != text
+        print(f"{f'unlimited, chunk {chunk}':<26}{recorder.calls / runs:>8.0f}{len(recorder.events) / runs:>8.0f}"
+              f"{elapsed / 1e3:>10.1f}{len(text) / (elapsed / 1e9):>14,.0f}{'OK' if typed == text else 'FAIL':>10}")
+        core.cleanup()
+
+    # 같은 글자 수를 글자마다 키 액션으로 (스캔코드 표의 키로 대신 측정)
+    keys = [('a',)] * len(text)
+    macros, defaults = convert(32, 0, keys)
+    events = simulate(macros, 't', timings=defaults)
+    span = events[-1][0] / 1e3
+    print(f"{f'key tuples x{len(keys)}':<26}{len(keys):>8}{len(events):>8}{span * 1e6:>10.0f}"
+          f"{len(text) / span:>14,.1f}{'-':>10}")
+
+    # 속도 제한: 실제 대기로 실행해 달성한 초당 글자 수와 글자 간격 중앙값 (묶음 크기는 기본값)
+    # 한 글자가 늦으면 다음 글자는 절대 기한대로 바로 나가므로 최소 간격 대신 중앙값으로 비교
+    print("-" * 84)
+    print(f"{'TEXT_RATE':<26}{'chunk':>8}{'calls':>8}{'ms':>10}{'chars/s':>14}{'p50 gap ms':>12}")
+    for rate in (50, 100, 400):
+        macros, defaults = convert(config_chunk, rate)
+        recorder = RecordingBackend()
+        core = MacroCore(recorder)
+        core.configure(macros, defaults)
+
+        core._run_once(core._begin_run('t', 2), core.programs['t'])
+        # 글자별 첫 눌림 시각 (서로게이트 쌍의 두 번째 단위 제외)
+        downs = [t for t, _, scan, flags in recorder.events
+                 if not flags & KEYEVENTF_KEYUP and not 0xDC00 <= scan <= 0xDFFF]
+        span = (downs[-1] - downs[0]) / 1e9
+        achieved = (len(downs) - 1) / span if span else 0.0
+        gap = percentile([b - a for a, b in zip(downs, downs[1:])], 50) / 1e9
+        failed = (failed or abs(achieved - rate) / rate > 0.05 or abs(gap * rate - 1) > 0.1 or
+                  recorder.calls != len(text) or _typed_text(recorder.events) != text)
+        print(f"{rate:<26}{macros['t']['actions'][0][2]:>8}{recorder.calls:>8}{span * 1e3:>10.1f}"
+              f"{achieved:>14,.1f}{gap * 1e3:>12.2f}")
+        core.cleanup()
+
+    # 키 사이 문자 입력: 키 타이밍 검사(expected_steps)가 문자 입력 시간을 간격에 넣는지 (가상 시계)
+    print("-" * 84)
+    mixed = [('a',), ('text', 'hi 5'), ('b', 0.05)]
+    for rate in (0, 50):
+        macros, defaults = convert(config_chunk, rate, mixed)
+        steps = expected_steps(macros['t']['actions'])
+        for mode, presses in ((2, [(0, 0)]), (1, [(0, 1000)])):
+            events = simulate({'t': dict(macros['t'], mode=mode)}, 't', presses, defaults, raw=True)
+            worst, late = sim_errors(events, steps, defaults['sequence'], mode,
+                                     presses[-1][1] * 1e6 if mode == 1 else float('inf'))
+            ok = worst < 1.0 and not late
+            failed = failed or not ok
+            print(f"{f'key + text + key, rate {rate}, mode {mode}':<42}{len(events):>8}"
+                  f"{'max err us':>14}{worst:>10.3f}{'OK' if ok else 'FAIL':>10}")
+
+    print("=" * 84)
+    return 1 if failed else 0
+
+def bench_mouse(args):
+    """마우스 경로: 설정 로드 시 경로 계산/컴파일 비용, 실행 중 틱당 엔진 비용과 실제 주입 간격 오차
+
+    engine: 가상 시계(대기 없음)로 실행한 틱당 CPU 시간 = 대기를 뺀 최대 주입 속도,
+    real: 실제 대기(hybrid)로 실행한 틱 간격 오차 (첫 이동 기준)
+    """
+    from app import MacroApp
+    from mouse import build_path
+    from simulator import create_core
+
+    config = load_config(args.config)
+    app = MacroApp('null')
+    runs = max(1, args.runs // 10)
+    duration = 0.5
+
+    print("=" * 96)
+    print(f"마우스 상대 이동 (800, -300) {duration}s 경로, 기록 백엔드, 경로 계산 {runs}회 평균")
+    print(f"{'path':<22}{'rate':>6}{'points':>8}{'path us':>10}{'us/point':>10}{'compile ms':>12}"
+          f"{'engine us/tick':>16}{'max ticks/s':>12}")
+    print("=" * 96)
+
+    cases = [(path, jitter, rate) for rate in (125, 1000)
+             for path, jitter in (('linear', 0), ('bezier', 0), ('bezier', 2))]
+    for path, jitter, rate in cases:
+        start = time.perf_counter_ns()
+        for _ in range(runs):
+            steps = build_path(800, -300, duration, path, jitter, rate)
+        path_ns = (time.perf_counter_ns() - start) / runs
+
+        defaults = dict(app._read_defaults(config), mouse_rate=rate, mouse_jitter=jitter)
+        macros = app._convert_actions({'m': {'actions': [('rmove', 800, -300, duration, path)], 'mode': 2}},
+                                      defaults)
+        start = time.perf_counter_ns()
+        core, clock, recorder = create_core(macros, defaults)
+        compile_ns = time.perf_counter_ns() - start
+
+        program = core.programs['m']
+        start = time.perf_counter_ns()
+        for _ in range(runs):
+            core._run_once(core._begin_run('m', 2), program)
+        engine_ns = (time.perf_counter_ns() - start) / runs / len(steps)
+
+        moved = [scan for _, kind, scan, _ in recorder.events[:len(recorder.events) // runs] if kind == INPUT_MOUSE]
+        total = (sum(dx for dx, _, _ in moved), sum(dy for _, dy, _ in moved))
+        label = f"{path}{f' jitter {jitter}' if jitter else ''}{'' if total == (800, -300) else ' FAIL'}"
+        print(f"{label:<22}{rate:>6}{len(steps):>8}{path_ns / 1e3:>10.1f}{path_ns / len(steps) / 1e3:>10.2f}"
+              f"{compile_ns / 1e6:>12.2f}{engine_ns / 1e3:>16.2f}{1e9 / engine_ns:>12,.0f}")
+        core.cleanup()
+
+    # 실제 대기로 실행: 틱 간격 오차
+    print("-" * 96)
+    print(f"{'real (hybrid)':<22}{'rate':>6}{'moves':>8}{'p50 us':>10}{'p99 us':>10}{'max us':>12}"
+          f"{'target/s':>12}{'achieved/s':>14}")
+    failed = False
+    for rate in (125, 500, 1000):
+        defaults = dict(app._read_defaults(config), mouse_rate=rate, mouse_jitter=0)
+        macros = app._convert_actions({'m': {'actions': [('rmove', 800, -300, duration)], 'mode': 2}}, defaults)
+        recorder = RecordingBackend()
+        core = MacroCore(recorder)
+        core.configure(macros, defaults)
+
+        core._run_once(core._begin_run('m', 2), core.programs['m'])
+        times = [t for t, kind, _, _ in recorder.events if kind == INPUT_MOUSE]
+        interval = duration / round(duration * rate) * 1e9
+        errors = sorted(abs(t - times[0] - k * interval) for k, t in enumerate(times))
+        span = (times[-1] - times[0]) / 1e9
+        achieved = (len(times) - 1) / span if span else 0.0
+        target = 1e9 / interval
+        failed = failed or abs(achieved - target) / target > 0.05
+        print(f"{'linear':<22}{rate:>6}{len(times):>8}{percentile(errors, 50) / 1e3:>10.1f}"
+              f"{percentile(errors, 99) / 1e3:>10.1f}{errors[-1] / 1e3:>12.1f}{target:>12,.1f}{achieved:>14,.1f}")
+        core.cleanup()
+
+    # 키 사이 마우스 동작: 키 타이밍 검사(expected_steps)가 동작 시간을 간격에 넣고 버튼 뗌을 새 입력으로 보지 않는지 (가상 시계)
+    print("-" * 96)
+    from simulator import simulate
+    defaults = dict(app._read_defaults(config), mouse_rate=125, mouse_jitter=0)
+    mixed = [('a',), ('click', 'left', 0.02), ('move', 100, 100), ('rmove', 30, -20, 0.05, 'bezier'),
+             ('scroll', -2), ('b', 0.05)]
+    for mode, presses in ((2, [(0, 0)]), (1, [(0, 1000)])):
+        macros = app._convert_actions({'m': {'actions': mixed, 'mode': mode}}, defaults)
+        steps = expected_steps(macros['m']['actions'])
+        events = simulate(macros, 'm', presses, defaults, raw=True)
+        worst, late = sim_errors(events, steps, defaults['sequence'], mode,
+                                 presses[-1][1] * 1e6 if mode == 1 else float('inf'))
+        ok = worst < 1.0 and not late
+        failed = failed or not ok
+        print(f"{f'key + mouse + key, mode {mode}':<36}{len(events):>8}"
+              f"{'max err us':>14}{worst:>10.3f}{'OK' if ok else 'FAIL':>10}")
+
+    print("=" * 96)
+    return 1 if failed else 0
+
+def bench_stress(args):
+    """빠른 연타 스트레스: 눌림/뗌 쌍을 1ms 미만 간격으로 보내 뗌 유실과 폭주가 없는지 확인"""
+    import io
+    import random
+    import contextlib
+    from handler import EventHandler
+    from core import MAX_ITERATIONS, IDLE
+
+    class BenchHandler(EventHandler):
+        """강제 종료 조합 시 프로세스를 끝내지 않고 횟수만 기록"""
+
+        def shutdown(self):
+            self.shutdowns += 1
+
+    class StressCore(MacroCore):
+        """종료된 실행을 모두 모아 둠"""
+
+        def _end_run(self, run):
+            self.ended.append(run)
+            MacroCore._end_run(self, run)
+
+    config = load_config(args.config)
+    macros, defaults = load_macros(config, args.zero)
+    trigger = (args.trigger or [next(iter(macros))])[0]
+    if trigger not in macros:
+        print(f"[오류] 트리거 '{trigger}'이(가) 설정에 없습니다")
+        return 1
+
+    pairs = args.runs * 50
+    rng = random.Random(0)
+    toggle = getattr(config, 'TOGGLE_KEY', '`')
+    quit_keys = getattr(config, 'FORCE_QUIT_KEYS', ['alt', 'shift', 'delete'])
+
+    print("=" * 112)
+    print(f"트리거 '{trigger}' 눌림/뗌 {pairs}쌍, 누름/간격 0.1~0.9ms, 중단 지연 = 취소 요청 → 실행 종료 (us)")
+    print(f"{'mode':<6}{'presses':>9}{'runs':>7}{'skipped':>9}{'p50':>9}{'p99':>9}{'max':>9}"
+          f"{'runaway':>9}{'stuck':>7}{'left':>6}{'result':>9}")
+    print("=" * 112)
+
+    failed = False
+    for mode in (1, 2):
+        backend = RecordingBackend()
+        core = StressCore(backend)
+        core.ended = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            core.configure({trigger: dict(macros[trigger], mode=mode)}, defaults, [toggle] + quit_keys)
+            handler = BenchHandler(core, toggle, quit_keys)
+        handler.shutdowns = 0
+        state = core.states[trigger]
+        down, up = FakeEvent(trigger, 'down'), FakeEvent(trigger, 'up')
+
+        for _ in range(pairs):
+            handler.handle_press(down)
+            time.sleep(rng.uniform(0.0001, 0.0009))
+            handler.handle_release(up)
+            time.sleep(rng.uniform(0.0001, 0.0009))
+        released = time.perf_counter()
+
+        # 마지막 뗌 이후 정리 대기 (mode 2는 마지막 실행이 끝날 때까지)
+        handler.flush()
+        while (core.runs or not handler.requests.empty()) and time.perf_counter() - released < 5.0:
+            time.sleep(0.001)
+            handler.flush()
+
+        runs = core.ended
+        latency = sorted(run.stats.stop_latency for run in runs if run.cancelled)
+        runaway = sum(1 for run in runs
+                      if run.stats.iterations >= MAX_ITERATIONS or (mode == 1 and not run.cancelled))
+        held = {}
+        for _, kind, scan, flags in backend.events:
+            if kind == INPUT_MOUSE or flags & KEYEVENTF_UNICODE:
+                continue
+            held[scan] = held.get(scan, 0) + (-1 if flags & KEYEVENTF_KEYUP else 1)
+        stuck = sum(1 for count in held.values() if count)
+        left = len(core.runs) + (state.phase != IDLE) + state.held
+        ok = not runaway and not stuck and not left and len(runs) <= state.seq
+        failed = failed or not ok
+
+        def pick(p):
+            return percentile(latency, p) / 1e3 if latency else 0.0
+
+        print(f"{mode:<6}{state.seq:>9}{len(runs):>7}{state.seq - len(runs):>9}{pick(50):>9.1f}"
+              f"{pick(99):>9.1f}{latency[-1] / 1e3 if latency else 0.0:>9.1f}"
+              f"{runaway:>9}{stuck:>7}{left:>6}{'OK' if ok else 'FAIL':>9}")
+        print(f"      {handler.metrics.format_summary()}")
+
+        handler.close()
+        core.cleanup()
+
+    print("-" * 112)
+    print("presses: 받아들인 눌림 (mode 2는 실행 중/차단 중 눌림 제외), skipped: 실행 등록 전에 뗀 눌림")
+    print("runaway: 뗌 없이 끝나지 않은 실행, stuck: 눌린 채 남은 출력 키, left: 남은 실행/상태")
+    print("=" * 112)
+    return 1 if failed else 0
+
+def bench_reload(args):
+    """설정 핫 리로드: 전체 로드 대비 변경 종류별 리로드 시간과 실행 중 매크로 유지 확인"""
+    import io
+    import shutil
+    import tempfile
+    import contextlib
+    from app import MacroApp, read_config
+    from watcher import ConfigWatcher
+
+    class BenchApp(MacroApp):
+        """훅 등록/해제를 횟수만 기록"""
+
+        def setup_hooks(self):
+            self.hooks += 1
+
+        def remove_hooks(self):
+            pass
+
+    source = getattr(load_config(args.config), '__file__', None)
+    workdir = tempfile.mkdtemp(prefix='keym_reload_')
+    path = os.path.join(workdir, 'config.py')
+    shutil.copyfile(source, path)
+    with open(path, encoding='utf-8') as f:
+        base = f.read()
+
+    def write(suffix):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(base + '\n' + suffix + '\n')
+
+    app = BenchApp('null')
+    app.hooks = 0
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    # 첫 트리거 하나의 액션 변경 / 기본 타이밍 변경 / 트리거 추가 (라운드마다 번갈아)
+    first = "_k = next(iter(MACROS))\nMACROS[_k] = dict(MACROS[_k], actions=MACROS[_k]['actions'] + [('m', {})])"
+    scenarios = [
+        ('unchanged (touch)', lambda r: ''),
+        ('one macro edited', lambda r: first.format(0.01 + 0.01 * (r % 2))),
+        ('default timing', lambda r: f"KEY_RELEASE_DURATION = {0.02 + 0.001 * (r % 2 + 1)}"),
+        ('trigger added', lambda r: "MACROS['f9'] = {'actions': [('a',)], 'mode': 2}" if r % 2 == 0 else ''),
+    ]
+
+    rounds = max(2, args.rounds)
+    print("=" * 84)
+    print(f"설정 리로드 ({os.path.basename(source)}), {rounds}회")
+    print(f"{'change':<22}{'p50 ms':>10}{'max ms':>10}{'recompiled':>12}{'rehooks':>10}")
+    print("=" * 84)
+
+    full = []
+    for _ in range(rounds):
+        write('')
+        if app.handler:
+            app.handler.close()
+            app.core.cleanup()
+        app.core = MacroCore('null')
+        start = time.perf_counter_ns()
+        with quiet:
+            app.load_config(read_config(path))
+        full.append(time.perf_counter_ns() - start)
+    print(f"{'full load_config':<22}{percentile(full, 50) / 1e6:>10.2f}{max(full) / 1e6:>10.2f}"
+          f"{len(app.core.programs):>12}{'-':>10}")
+
+    telemetry = app.core.telemetry
+    registered = len(telemetry._names)
+    reloads = 0
+    for name, suffix in scenarios:
+        write('')
+        with quiet:
+            app.reload_config()
+        times = []
+        recompiled = 0
+        hooks = app.hooks
+        for r in range(rounds):
+            write(suffix(r))
+            before = dict(app.core.programs)
+            start = time.perf_counter_ns()
+            with quiet:
+                app.reload_config()
+            times.append(time.perf_counter_ns() - start)
+            recompiled += sum(before.get(t) is not p for t, p in app.core.programs.items())
+            reloads += 1
+        print(f"{name:<22}{percentile(times, 50) / 1e6:>10.2f}{max(times) / 1e6:>10.2f}"
+              f"{recompiled / rounds:>12.1f}{app.hooks - hooks:>10}")
+
+    # 텔레메트리 번호: 교체된 번호를 재사용해 전체 재컴파일을 반복해도 더 늘지 않음
+    ids = len(telemetry._names)
+    for r in range(rounds):
+        write(scenarios[2][1](r))
+        with quiet:
+            app.reload_config()
+        reloads += 1
+    reused = len(telemetry._names) == ids
+    ids = len(telemetry._names)
+
+    # 실행 중인 매크로: 리로드로 정의가 바뀌어도 시작할 때의 프로그램으로 끝까지 실행
+    write('')
+    with quiet:
+        app.reload_config()
+    core = app.core
+    trigger = next(t for t, info in core.macros.items() if info['mode'] == 2)
+    program = core.programs[trigger]
+    core.start(trigger)
+    time.sleep(0.01)
+    write(f"MACROS[{trigger!r}] = {{'actions': [('a',)], 'mode': 2}}")
+    with quiet:
+        app.reload_config()
+    core.mode2_events[trigger].wait(5.0)
+    run = core.stats[trigger]
+    sends = program_sends(program)
+    kept = run.sends == sends and core.programs[trigger] is not program
+
+    # 모드 변경: 멈추는 중인 이전 실행이 새 상태의 실행을 IDLE로 되돌리지 않아야 함
+    write("MACROS['f9'] = {'actions': [('a',)], 'mode': 1}")
+    with quiet:
+        app.reload_config()
+    old_run = core._begin_run('f9', 1)
+    write("MACROS['f9'] = {'actions': [('a',)], 'mode': 2}")
+    with quiet:
+        app.reload_config()
+    new_run = core._begin_run('f9', 2)
+    with core._lock:
+        core._end_run(old_run)
+    state = core.states['f9']
+    isolated = (new_run is not None and state.run is new_run and state.phase == RUNNING and
+                core.runs.get('f9') is new_run and core._begin_run('f9', 2) is None)
+    with core._lock:
+        core._end_run(new_run)
+
+    # 감시 → 적용까지 (저장 시각 → 리로드 완료)
+    applied = []
+    done = threading.Event()
+    watcher = ConfigWatcher(path, lambda: (app.reload_config(), done.set()), 0.05)
+    watcher.start()
+    edit = scenarios[1][1]
+    for r in range(rounds):
+        done.clear()
+        time.sleep(0.06)
+        with quiet:
+            saved = time.perf_counter_ns()
+            write(edit(r))
+            done.wait(2.0)
+        applied.append(time.perf_counter_ns() - saved)
+    watcher.stop()
+
+    print("-" * 84)
+    print(f"실행 중 매크로 유지: {'OK' if kept else 'FAIL'} (리로드 전에 시작한 [{trigger}] {run.sends}/{sends}회 전송)")
+    print(f"텔레메트리 매크로 번호: {'OK' if reused else 'FAIL'} (첫 로드 {registered}개 → 리로드 {reloads}회 후 {ids}개)")
+    print(f"모드 변경 중 이전 실행 종료: {'OK' if isolated else 'FAIL'} (새 상태의 실행 유지, 동시 실행 없음)")
+    print(f"저장 → 적용 (0.05s 간격 감시): p50 {percentile(applied, 50) / 1e6:.1f}ms, max {max(applied) / 1e6:.1f}ms")
+    print("=" * 84)
+
+    app.handler.close()
+    core.cleanup()
+    shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if kept and isolated and reused else 1
+
+def bench_cache(args):
+    """설정 캐시: 시작 시 설정 적용 시간 (이전 방식 / 캐시 없음 / 캐시 사용)"""
+    import io
+    import tempfile
+    import contextlib
+    import cache
+    from app import MacroApp, __version__
+
+    config_path = getattr(load_config(args.config), '__file__', None)
+    cache_path = os.path.join(tempfile.mkdtemp(prefix='keym_cache_'), cache.CACHE_NAME)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    results = {}
+
+    def launch(method):
+        """main.py와 같은 순서로 설정 적용 → (설정 준비 ns, 전체 ns, 설정 데이터)
+
+        설정 준비: config 실행/검증/변환 또는 캐시 읽기, 나머지는 코어/핸들러 준비
+        """
+        start = time.perf_counter_ns()
+        with quiet:
+            app = MacroApp('null')
+            if method == 'cache hit':
+                key = cache.source_key(config_path, __version__)
+                data = cache.load(cache_path, key)
+                prepared = time.perf_counter_ns()
+            else:
+                config = load_config(config_path)
+                app.validate_config(config)
+                if method == 'before (validate x2)':
+                    app.validate_config(config)
+                data = app.compile_config(config)
+                prepared = time.perf_counter_ns()
+                if method != 'before (validate x2)':
+                    cache.save(cache_path, cache.source_key(config_path, __version__), data)
+            app.apply_config(data, config_path)
+        end = time.perf_counter_ns()
+
+        app.handler.close()
+        app.core.cleanup()
+        return prepared - start, end - start, data
+
+    rounds = max(3, args.rounds)
+    for method in ('before (validate x2)', 'cache miss (+save)', 'cache hit'):
+        results[method] = [launch(method) for _ in range(rounds)]
+
+    print("=" * 72)
+    print(f"설정 적용 시간 ({os.path.basename(config_path)} 실행 ~ 핸들러 준비), {rounds}회")
+    print(f"{'method':<24}{'prepare p50':>12}{'prepare min':>12}{'total p50':>12}{'total min':>12}")
+    print("=" * 72)
+    for method, runs in results.items():
+        prepare = [p for p, _, _ in runs]
+        total = [t for _, t, _ in runs]
+        print(f"{method:<24}{percentile(prepare, 50) / 1e6:>12.2f}{min(prepare) / 1e6:>12.2f}"
+              f"{percentile(total, 50) / 1e6:>12.2f}{min(total) / 1e6:>12.2f}")
+
+    same = all(data == results['cache miss (+save)'][0][2] for _, _, data in results['cache hit'])
+    print("-" * 72)
+    print("prepare: config 실행/검증/변환 또는 캐시 읽기 (ms), total: 코어/스레드/핸들러 준비까지")
+    print(f"캐시 파일 {os.path.getsize(cache_path)} bytes, 캐시 데이터 = 변환 결과: {'OK' if same else 'FAIL'}")
+    print("=" * 72)
+    return 0 if same else 1
+
+def _rss_kb():
+    """현재 프로세스 RSS (KB, 측정할 수 없으면 0)"""
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize // 1024
+        return 0
+
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+MEMORY_CHILD = """
+import io, sys, contextlib
+sys.path[:0] = [{root!r}, {modules!r}]
+from bench import _rss_kb, load_config
+from app import MacroApp
+with contextlib.redirect_stdout(io.StringIO()):
+    app = MacroApp('null')
+    app.load_config(load_config({config!r}))
+before = _rss_kb()
+if {method!r} == 'asset':
+    image = app.tray.load_icon_asset()
+    ok = image is not None
+else:
+    try:
+        from PIL import Image
+    except ImportError:
+        print(before, -1, 0)
+        raise SystemExit
+    with Image.open({icon!r}) as source:
+        image = source.resize((64, 64), Image.Resampling.LANCZOS)
+    ok = True
+print(before, _rss_kb() - before if ok else -1, 'PIL' in sys.modules)
+"""
+
+def bench_memory(args):
+    """트레이 아이콘 로드 방식별 RSS (새 프로세스에서 엔진 준비 후 아이콘 로드)"""
+    import subprocess
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    config_path = getattr(load_config(args.config), '__file__', None)
+    rounds = max(1, min(args.rounds, 5))
+
+    print("=" * 76)
+    print(f"RSS (KB), 새 프로세스 {rounds}회 중앙값: 엔진 = app 임포트 + 설정 적용")
+    print(f"{'icon':<28}{'engine':>10}{'icon delta':>12}{'total':>10}{'PIL loaded':>14}")
+    print("=" * 76)
+
+    for method, label in (('asset', 'pre-rendered icon64.ico'), ('pil', 'PIL open + LANCZOS')):
+        samples = []
+        for _ in range(rounds):
+            code = MEMORY_CHILD.format(root=root, modules=os.path.join(root, 'modules'),
+                                       config=config_path, method=method,
+                                       icon=os.path.join(root, 'icon.ico'))
+            out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=root)
+            fields = out.stdout.split()
+            if len(fields) == 3:
+                samples.append((int(fields[0]), int(fields[1]), fields[2]))
+
+        if not samples or samples[0][1] < 0:
+            print(f"{label:<28}{'-':>10}{'n/a':>12}{'-':>10}{'-':>14}"
+                  f"   ({'파일 없음' if method == 'asset' else 'PIL 없음'})")
+            continue
+
+        engine = sorted(s[0] for s in samples)[len(samples) // 2]
+        delta = sorted(s[1] for s in samples)[len(samples) // 2]
+        print(f"{label:<28}{engine:>10}{delta:>12}{engine + delta:>10}{samples[0][2]:>14}")
+
+    print("=" * 76)
+    return 0
+
+SUITES = {
+    'memory': bench_memory,
+    'sim': bench_sim,
+    'text': bench_text,
+    'mouse': bench_mouse,
+    'cache': bench_cache,
+    'reload': bench_reload,
+    'stress': bench_stress,
+    'echo': bench_echo,
+    'routing': bench_routing,
+    'hook': bench_hook,
+    'telemetry': bench_telemetry,
+    'concurrent': bench_concurrent,
+    'latency': bench_latency,
+    'scheduler': bench_scheduler,
+    'timer': bench_timer,
+    'drift': bench_drift,
+    'wait': bench_wait,
+    'overhead': bench_overhead,
+    'macros': bench_macros,
+    'batch': bench_batch,
+}
+
+def run_bench(argv=None):
+    """벤치마크 진입점 (main.py --bench)"""
+    parser = argparse.ArgumentParser(prog='main.py --bench', description='KeyM 벤치마크')
+    parser.add_argument('suite', nargs='?', default='macros', choices=sorted(SUITES))
+    parser.add_argument('--config', help='config.py 경로 (기본: 프로그램 폴더)')
+    parser.add_argument('--trigger', action='append', help='측정할 트리거 키 (반복 지정 가능)')
+    parser.add_argument('--repeat', action='store_true', help='모든 매크로를 mode 1 경로로 실행')
+    parser.add_argument('--iterations', type=int, default=5, help='mode 1 반복 횟수 (기본 5)')
+    parser.add_argument('--min-duration', type=float, default=0.2, help='mode 1 최소 실행 시간(초)')
+    parser.add_argument('--rounds', type=int, default=10, help='지연 측정 라운드 수 (wait 등)')
+    parser.add_argument('--runs', type=int, default=200, help='반복 측정 횟수 (batch 등)')
+    parser.add_argument('--samples', type=int, default=50, help='대기 정확도 표본 수 (timer)')
+    parser.add_argument('--spin-budget', type=float, default=0.25, help='hybrid 스핀 예산 (timer)')
+    parser.add_argument('--dump', help='텔레메트리 기록 저장 경로 (telemetry)')
+    parser.add_argument('--zero', action='store_true', help='모든 hold/delay를 0으로 (엔진 오버헤드만 측정)')
+    args = parser.parse_args(argv)
+
+    return SUITES[args.suite](args)
+
+if __name__ == "__main__":
+    sys.exit(run_bench())
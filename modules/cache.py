@@ -0,0 +1,50 @@
+import os
+import marshal
+import hashlib
+
+CACHE_NAME = 'keym_config.cache'  # 실행 폴더에 저장
+MAGIC = b'KMC1'
+
+def source_key(path, version):
+    """config.py 원본 + 프로그램 버전 해시 (sha256, 32바이트)"""
+    with open(path, 'rb') as f:
+        source = f.read()
+    return hashlib.sha256(source + b'\0' + version.encode()).digest()
+
+def load(path, key):
+    """캐시 읽기 (없거나, 키가 다르거나, 깨졌으면 None)
+
+    내용은 검증/변환이 끝난 설정 데이터 (dict/list/tuple/str/숫자만, marshal 형식)
+    """
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    if blob[:4] != MAGIC or blob[4:36] != key:
+        return None
+
+    try:
+        data = marshal.loads(blob[36:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    return data if isinstance(data, dict) else None
+
+def save(path, key, data):
+    """캐시 쓰기 (임시 파일에 쓴 뒤 교체, 실패하면 False)"""
+    try:
+        blob = marshal.dumps(data)
+    except ValueError:
+        return False
+
+    temp = path + '.tmp'
+    try:
+        with open(temp, 'wb') as f:
+            f.write(MAGIC + key + blob)
+        os.replace(temp, path)
+    except OSError:
+        return False
+
+    return True
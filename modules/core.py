@@ -1,29 +1,17 @@
 import time
+import itertools
 import threading
 import ctypes
-from ctypes import c_ulong, c_ushort, c_long, Structure, Union, POINTER, windll
+from ctypes import c_ulong
 
-# DirectInput 구조체
-PUL = POINTER(c_ulong)
-
-class KeyBdInput(Structure):
-    _fields_ = [("wVk", c_ushort), ("wScan", c_ushort), ("dwFlags", c_ulong), 
-                ("time", c_ulong), ("dwExtraInfo", PUL)]
-
-class HardwareInput(Structure):
-    _fields_ = [("uMsg", c_ulong), ("wParamL", c_ushort), ("wParamH", c_ushort)]
-
-class MouseInput(Structure):
-    _fields_ = [("dx", c_long), ("dy", c_long), ("mouseData", c_ulong), 
-                ("dwFlags", c_ulong), ("time", c_ulong), ("dwExtraInfo", PUL)]
-
-class Input_I(Union):
-    _fields_ = [("ki", KeyBdInput), ("mi", MouseInput), ("hi", HardwareInput)]
-
-class Input(Structure):
-    _fields_ = [("type", c_ulong), ("ii", Input_I)]
-
-SendInput = windll.user32.SendInput
+from backend import (Input, Input_I, KeyBdInput, MouseInput, INPUT_KEYBOARD, INPUT_MOUSE,
+                     KEYEVENTF_SCANCODE, KEYEVENTF_KEYUP, KEYEVENTF_EXTENDEDKEY, KEYEVENTF_UNICODE,
+                     MOUSEEVENTF_MOVE, MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_WHEEL, WHEEL_DELTA,
+                     create_backend, injected_extra, screen_size)
+from mouse import BUTTONS, build_path, absolute_coords
+from timing import PrecisionTimer
+from pool import WorkerPool
+from telemetry import Telemetry
 
 # 스캔코드 맵
 SCANCODE_MAP = {
@@ -84,58 +72,402 @@ EXTENDED_KEYS = frozenset({
     'win', 'rightwin', 'menu', 'printscreen'
 })
 
-# 상수
-KEYEVENTF_SCANCODE = 0x0008
-KEYEVENTF_KEYUP = 0x0002
-KEYEVENTF_EXTENDEDKEY = 0x0001
+# Alt 키 (keyboard 훅은 Alt가 눌린 동안의 주입 입력을 콜백에 전달하지 않으므로 에코 장부에 기록 안 함)
+ALT_KEYS = frozenset({'alt', 'rightalt'})
 
 # 안전 설정
 MAX_ITERATIONS = 10000  # mode1 최대 반복 횟수
-CHECK_INTERVAL = 0.001  # 종료 체크 간격
-CLEANUP_DELAY = 0.15    # 실행 키 정리 딜레이
-MODE2_BLOCK_DELAY = 0.05  # mode2 차단 해제 딜레이
+ECHO_WINDOW_NS = 100_000_000  # 입력마다 이 시간 안에 훅에 돌아오지 않으면 놓친 것으로 보고 버림
+ECHO_DEPTH = 8  # 키 눌림/뗌별로 보낸 시각을 기억하는 최근 입력 수
+MODE2_BLOCK_NS = 50_000_000  # mode2 뗀 뒤 재입력 차단 시간
+RESYNC_THRESHOLD_NS = 50_000_000  # 이만큼 밀리면 일정 재설정 (몰아치기 방지)
+
+# 마우스 액션 (변환 결과의 첫 값)
+MOUSE_ACTIONS = frozenset({'click', 'move', 'rmove', 'scroll'})
+
+# 문자 입력 ('text', ...)
+TEXT_CHUNK_SIZE = 32  # SendInput 1회에 보내는 글자 수 기본값
+
+# 트리거 상태 (TriggerState.phase)
+IDLE = 0      # 대기
+ARMED = 1     # 눌림, 시작 요청됨 (실행 등록 전)
+RUNNING = 2   # 실행 중
+STOPPING = 3  # 취소 신호 보냄, 실행 종료 대기
+
+# 스텝 플래그
+STEP_HOLD = 0x01    # 홀드 대기 (중단 시 release 전송)
+STEP_BLOCK = 0x02   # 반복/서브루틴 블록 (body를 repeat회 실행)
+
+def routine_actions(routine, is_last):
+    """변환된 서브루틴에서 호출 위치에 맞는 액션 목록 선택"""
+    if is_last and routine['last'] is not None:
+        return routine['last']
+    return routine['actions']
+
+def expand_actions(actions, subroutines=None):
+    """변환된 액션(반복/호출 블록 포함)을 실행 순서의 (hold, key, delay)로 펼침 (측정/검사용)
+    
+    문자 입력 ('text', ...)은 그대로 둠
+    """
+    for item in actions:
+        kind = item[0]
+        if kind == 'repeat':
+            for _ in range(item[1]):
+                yield from expand_actions(item[2], subroutines)
+        elif kind == 'call':
+            yield from expand_actions(routine_actions(subroutines[item[1]], item[2]), subroutines)
+        else:
+            yield item
+
+def text_chunks(text, size):
+    """문자열을 SendInput 1회 단위(size 글자)로 나눔"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def text_units(char):
+    """문자 → UTF-16 코드 단위 (BMP 밖 문자는 서로게이트 쌍, 줄바꿈은 Enter와 같은 CR)"""
+    if char == '\n':
+        return (0x0D,)
+    code = ord(char)
+    if code < 0x10000:
+        return (code,)
+    code -= 0x10000
+    return (0xD800 | code >> 10, 0xDC00 | code & 0x3FF)
+
+def called_subroutines(actions):
+    """변환된 액션에서 호출하는 서브루틴 이름 (반복 블록 안 포함)"""
+    for item in actions:
+        if item[0] == 'repeat':
+            yield from called_subroutines(item[2])
+        elif item[0] == 'call':
+            yield item[1]
+
+def block_macros(program, macros):
+    """프로그램 안 블록(반복/서브루틴)의 텔레메트리 매크로 번호를 macros에 추가"""
+    for step in program:
+        if step.flags & STEP_BLOCK:
+            macros.add(step.macro)
+            block_macros(step.body, macros)
+
+class Step:
+    """컴파일된 실행 스텝
+    
+    대기 없이 이어지는 입력을 미리 만든 Input 배열 하나로 묶고,
+    전송 후 wait_ns 만큼 대기. STEP_BLOCK 스텝은 입력 없이
+    컴파일된 body를 repeat회 실행 (반복/서브루틴을 펼치지 않음)
+    """
+    __slots__ = ('inputs', 'count', 'wait_ns', 'flags', 'release', 'release_echo',
+                 'echoes', 'index', 'scans', 'keyups', 'actions', 'body', 'repeat', 'macro')
+    
+    def __init__(self, inputs, count, wait_ns, flags=0, release=None, release_echo=-1,
+                 echoes=(), index=-1, scans=(), keyups=(), actions=(), body=(), repeat=0, macro=0):
+        self.inputs = inputs      # Input 포인터/배열 (count가 0이면 None)
+        self.count = count
+        self.wait_ns = wait_ns
+        self.flags = flags
+        self.release = release    # 홀드 중 중단 시 보낼 key-up 포인터
+        self.release_echo = release_echo  # release의 에코 장부 인덱스
+        self.echoes = echoes      # 훅이 감시하는 키의 에코 장부 인덱스
+        self.index = index        # 대기가 속한 액션 인덱스
+        self.scans = scans        # 이벤트별 스캔코드/keyup/액션 인덱스 (텔레메트리)
+        self.keyups = keyups
+        self.actions = actions
+        self.body = body          # 블록 본문 (컴파일된 스텝 튜플, 서브루틴은 공유)
+        self.repeat = repeat      # 블록 반복 횟수
+        self.macro = macro        # 블록의 텔레메트리 매크로 번호
+
+class RunStats:
+    """실행별 타이밍 드리프트 통계 (ns)
+    
+    drift: 각 대기가 끝난 시각 - 예정 기한
+    """
+    __slots__ = ('waits', 'total_drift', 'max_drift', 'last_drift',
+                 'resyncs', 'iterations', 'sends', 'elapsed', 'start_latency', 'stop_latency')
+    
+    def __init__(self):
+        self.start_latency = 0  # 시작 요청 → 첫 SendInput
+        self.stop_latency = 0   # 취소 요청 → 실행 종료
+        self.waits = 0
+        self.total_drift = 0
+        self.max_drift = 0
+        self.last_drift = 0
+        self.resyncs = 0
+        self.iterations = 0
+        self.sends = 0
+        self.elapsed = 0
+    
+    def record(self, drift):
+        """대기 1회 드리프트 기록"""
+        self.waits += 1
+        self.total_drift += drift
+        self.last_drift = drift
+        if drift > self.max_drift:
+            self.max_drift = drift
+    
+    def summary(self):
+        """통계 요약 (ms)"""
+        return {
+            'waits': self.waits,
+            'iterations': self.iterations,
+            'sends': self.sends,
+            'mean_drift_ms': self.total_drift / self.waits / 1e6 if self.waits else 0.0,
+            'max_drift_ms': self.max_drift / 1e6,
+            'last_drift_ms': self.last_drift / 1e6,
+            'resyncs': self.resyncs,
+            'elapsed_ms': self.elapsed / 1e6,
+            'start_latency_us': self.start_latency / 1e3,
+            'stop_latency_us': self.stop_latency / 1e3,
+        }
+
+# 실행 ID 발급
+_run_ids = itertools.count(1)
+
+class MacroRun:
+    """매크로 실행 단위 상태
+    
+    cancel은 실행별 취소 신호. 대기는 이 이벤트에서 블록되며
+    stop/토글/강제 중지/트리거 해제 시 바로 깨어남.
+    deadline은 실행 시작 시각 기준의 절대 기한(clock 기준 ns)
+    """
+    __slots__ = ('run_id', 'trigger', 'mode', 'seq', 'program', 'macro', 'cancel', 'requested',
+                 'cancelled', 'first_send', 'started', 'deadline', 'stats', 'clock')
+    
+    def __init__(self, trigger, mode, seq=0, clock=time.perf_counter_ns):
+        self.run_id = next(_run_ids)
+        self.trigger = trigger
+        self.mode = mode
+        self.seq = seq  # 이 실행을 시작한 눌림 번호
+        self.program = ()  # 등록 시점의 컴파일 결과 (리로드와 무관하게 끝까지 사용)
+        self.macro = 0     # 텔레메트리 매크로 번호
+        self.cancel = threading.Event()
+        self.clock = clock
+        self.requested = clock()
+        self.cancelled = 0  # 취소 요청 시각
+        self.first_send = 0
+        self.started = 0
+        self.deadline = 0
+        self.stats = RunStats()
+    
+    def begin(self):
+        """실행 시작 시각 기록"""
+        self.started = self.deadline = self.clock()
+    
+    def stop(self):
+        """취소 신호 (요청 시각은 처음 한 번만 기록)"""
+        if not self.cancelled:
+            self.cancelled = self.clock()
+        self.cancel.set()
+
+class TriggerState:
+    """트리거별 상태 머신
+    
+    IDLE → ARMED(눌림) → RUNNING(실행 등록) → STOPPING(뗌/취소) → IDLE(실행 종료).
+    전이는 모두 코어 _lock 안에서 일어나고 눌릴 때마다 seq가 1 증가.
+    시작/종료는 자기 seq가 최신일 때만 상태를 바꾸므로 실행이 등록되기 전에
+    뗀 입력(ARMED → IDLE)도, 이전 실행의 늦은 종료도 새 눌림을 덮어쓰지 않음.
+    held는 사용자가 실제로 누르고 있는지 (키 반복 무시)
+    """
+    __slots__ = ('trigger', 'mode', 'phase', 'seq', 'held', 'run', 'unblock_at')
+    
+    def __init__(self, trigger, mode):
+        self.trigger = trigger
+        self.mode = mode
+        self.phase = IDLE
+        self.seq = 0
+        self.held = False
+        self.run = None
+        self.unblock_at = 0  # mode 2 재입력 허용 시각 (clock 기준 ns)
 
 class MacroCore:
     """매크로 코어 엔진"""
-    __slots__ = ('macro_enabled', 'macros', 'timings', 'mode2_events',
-                 'pressed_keys', 'executing_keys', 'user_triggers',
-                 'is_running', 'current_macro', 'stop_signal',
-                 '_extra', '_input_cache', '_cleanup_timers', '_lock')
+    __slots__ = ('macro_enabled', 'macros', 'subroutines', 'programs', 'timings', 'mode2_events',
+                 'states', 'watch_keys', 'echo_slots',
+                 'runs', 'stats',
+                 'backend', 'batch_input', 'screen', 'clock', 'timer', 'pool', 'telemetry', '_macro_ids', '_extra', '_input_cache',
+                 '_echo_sent', '_echo_seen', '_echo_time', '_blocks', '_lock', '_send_lock')
     
-    def __init__(self):
+    def __init__(self, backend=None, batch_input=True, timer=None, pool=None,
+                 telemetry=None, clock=None):
         self.macro_enabled = True
         self.macros = {}
+        self.subroutines = {}
+        self.programs = {}
+        self._blocks = {}  # 컴파일된 서브루틴 {(이름, 마지막 여부): (스텝 튜플, 텔레메트리 번호)}
         self.timings = {'press': 0.02, 'release': 0.02, 'sequence': 0.02}
         self.mode2_events = {}
         
-        self.pressed_keys = set()
-        self.executing_keys = set()
-        self.user_triggers = set()
+        # 트리거별 상태 머신 (디스패처 스레드와 실행 스레드가 _lock 안에서 전이, 훅은 잡지 않음)
+        self.states = {}
+        
+        # 주입 입력 에코 장부 (훅이 감시하는 키별 보낸/돌아온 횟수)
+        self.watch_keys = set()
+        self.echo_slots = {}
+        self._echo_sent = []
+        self._echo_seen = []
+        self._echo_time = []
+        
+        self.runs = {}   # 트리거별 실행 중인 MacroRun (여러 매크로 동시 실행)
+        self.stats = {}  # 트리거별 마지막 실행 통계
+        
+        # 출력 백엔드 (sendinput, uinput, null, recording 또는 인스턴스)
+        self.backend = create_backend(backend)
+        self.batch_input = batch_input
+        self.screen = screen_size()  # 마우스 절대 좌표 변환 기준 (설정 적용 시 갱신)
         
-        self.is_running = False
-        self.current_macro = None
-        self.stop_signal = threading.Event()
+        # 시계 (ns 정수 반환) / 정밀 대기 타이머 (sleep, hybrid, busy)
+        # 시뮬레이션은 둘 다 VirtualClock을 넣어 대기 없이 실행
+        self.clock = clock or time.perf_counter_ns
+        self.timer = timer or PrecisionTimer()
         
-        # DirectInput 캐싱
-        self._extra = c_ulong(0)
+        # 실행 스레드 풀 (configure 시 준비)
+        self.pool = pool
+        
+        # 입력 타이밍 기록 (Telemetry(0)이면 기록 안 함)
+        self.telemetry = telemetry if telemetry is not None else Telemetry()
+        self._macro_ids = {}
+        
+        # DirectInput 캐싱 (모든 입력의 dwExtraInfo에 프로세스 표시)
+        self._extra = injected_extra()
         self._input_cache = {}
-        self._cleanup_timers = {}
         self._lock = threading.Lock()
+        self._send_lock = threading.Lock()  # 공유 출력 경로 (스텝 단위로 번갈아 전송)
     
-    def configure(self, macros, timings):
-        """설정 적용"""
+    def configure(self, macros, timings, watch_keys=(), subroutines=None):
+        """설정 적용
+        
+        watch_keys: 트리거 외에 훅이 감시하는 키 (토글, 강제 종료)
+        subroutines: 변환된 SUBROUTINES (('call', 이름) 대상, 한 번만 컴파일해 공유)
+        """
         if not isinstance(macros, dict) or not isinstance(timings, dict):
             raise ValueError("Invalid configuration format")
         
         self.macros = macros
+        self.subroutines = subroutines or {}
+        self._blocks = {}
         self.timings = timings
+        self.screen = screen_size()
+        
+        # 에코 장부 (키마다 눌림/뗌 2칸)
+        self.watch_keys = set(macros) | set(watch_keys)
+        self.echo_slots = {key: slot * 2 for slot, key in enumerate(sorted(self.watch_keys))}
+        size = len(self.echo_slots) * 2
+        self._echo_sent = [0] * size
+        self._echo_seen = [0] * size
+        self._echo_time = [0] * (size * ECHO_DEPTH)
+        
+        # 실행 스레드 미리 준비 (키 입력 시 스레드 생성 비용 제거)
+        if self.pool is None:
+            self.pool = WorkerPool()
         
-        # mode 2 이벤트 초기화
+        # 매크로 컴파일
+        self.programs = {
+            key: self._compile(key, info['actions'])
+            for key, info in macros.items() if info.get('mode')
+        }
+        self._macro_ids = {key: self.telemetry.register(key, program)
+                           for key, program in self.programs.items()}
+        
+        self.states = {key: TriggerState(key, macros[key]['mode']) for key in self.programs}
+        
+        # mode 2 완료 이벤트 초기화
         for key, info in macros.items():
             if info.get('mode') == 2:
                 self.mode2_events[key] = threading.Event()
                 self.mode2_events[key].set()
     
+    def update(self, macros, timings, watch_keys=(), subroutines=None):
+        """설정 교체 (핫 리로드) → 다시 컴파일한 트리거 목록
+        
+        정의가 같은 매크로는 컴파일 결과, 상태, 텔레메트리 번호를 그대로 쓰고
+        바뀐 매크로만 다시 컴파일한 뒤 _lock 안에서 한 번에 교체.
+        서브루틴이나 화면 해상도(마우스 절대 좌표)가 바뀌면 전부 다시 컴파일.
+        실행 중인 매크로는 시작할 때 받은 프로그램으로 계속 실행되며
+        mode가 바뀌거나 삭제된 트리거의 실행만 취소됨
+        """
+        if not isinstance(macros, dict) or not isinstance(timings, dict):
+            raise ValueError("Invalid configuration format")
+        
+        watch_keys = set(macros) | set(watch_keys)
+        subroutines = subroutines or {}
+        screen = screen_size()
+        rebuild = (watch_keys != self.watch_keys or subroutines != self.subroutines or
+                   screen != self.screen)
+        if rebuild:
+            # 컴파일 중에만 쓰는 값 (실행 중인 프로그램은 이미 만든 스텝을 참조)
+            self.subroutines = subroutines
+            self.screen = screen
+            self._blocks = {}
+        
+        # 에코 장부: 기존 키 번호는 유지하고 새 키만 뒤에 추가 (실행 중인 이전 프로그램도 유효)
+        if watch_keys != self.watch_keys:
+            echo_slots = {key: slot for key, slot in self.echo_slots.items() if key in watch_keys}
+            size = len(self._echo_sent)
+            for key in sorted(watch_keys - set(echo_slots)):
+                echo_slots[key] = size
+                size += 2
+            
+            grow = [0] * (size - len(self._echo_sent))
+            self._echo_sent.extend(grow)
+            self._echo_seen.extend(grow)
+            self._echo_time.extend(grow * ECHO_DEPTH)
+            self.echo_slots = echo_slots
+        
+        # 바뀐 매크로만 컴파일 (감시 키/서브루틴/해상도가 바뀌면 전부)
+        programs = {}
+        macro_ids = {}
+        changed = []
+        for key, info in macros.items():
+            if not info.get('mode'):
+                continue
+            
+            if not rebuild and key in self.programs and self.macros.get(key) == info:
+                programs[key] = self.programs[key]
+                macro_ids[key] = self._macro_ids[key]
+            else:
+                programs[key] = self._compile(key, info['actions'])
+                macro_ids[key] = self.telemetry.register(key, programs[key])
+                changed.append(key)
+        
+        with self._lock:
+            # 상태 머신: mode가 같으면 유지, 삭제/모드 변경은 실행 취소
+            # 새 상태는 이전 눌림 번호를 이어받아 이전 실행의 seq와 겹치지 않게 함
+            states = {}
+            for key, state in self.states.items():
+                if key in programs and macros[key]['mode'] == state.mode:
+                    states[key] = state
+                else:
+                    self._disarm(state)
+            
+            for key in programs:
+                if key not in states:
+                    states[key] = TriggerState(key, macros[key]['mode'])
+                    old = self.states.get(key)
+                    if old is not None:
+                        states[key].seq = old.seq
+                if macros[key]['mode'] == 2 and key not in self.mode2_events:
+                    self.mode2_events[key] = threading.Event()
+                    self.mode2_events[key].set()
+            
+            self.macros = macros
+            self.timings = timings
+            self.watch_keys = watch_keys
+            self.programs = programs
+            self._macro_ids = macro_ids
+            self.states = states
+            
+            # 텔레메트리: 현재 프로그램과 실행 중인 (이전) 프로그램이 쓰는 번호만 유지
+            live = set(macro_ids.values())
+            for program in programs.values():
+                block_macros(program, live)
+            for run in self.runs.values():
+                live.add(run.macro)
+                block_macros(run.program, live)
+        
+        # 교체/삭제된 매크로 번호 해제 (기록과 겹치지 않게 출력 잠금 안에서)
+        with self._send_lock:
+            self.telemetry.retain(live)
+        
+        return changed
+    
     def toggle_macro(self):
         """매크로 토글"""
         self.macro_enabled = not self.macro_enabled
@@ -146,13 +478,11 @@ class MacroCore:
     def _force_stop_all(self):
         """모든 매크로 강제 중지"""
         with self._lock:
-            self.stop_signal.set()
-            self.is_running = False
-            self.current_macro = None
-            self.pressed_keys.clear()
+            for state in self.states.values():
+                self._disarm(state)
     
-    def _send_input(self, scan_code, is_extended, is_keyup):
-        """DirectInput 전송"""
+    def _key_input(self, scan_code, is_extended, is_keyup):
+        """캐싱된 DirectInput 구조체 조회"""
         flags = KEYEVENTF_SCANCODE
         if is_extended:
             flags |= KEYEVENTF_EXTENDEDKEY
@@ -160,233 +490,553 @@ class MacroCore:
             flags |= KEYEVENTF_KEYUP
         
         cache_key = (scan_code, flags)
-        if cache_key not in self._input_cache:
+        cached = self._input_cache.get(cache_key)
+        if cached is None:
             ii = Input_I()
-            ii.ki = KeyBdInput(0, scan_code, flags, 0, POINTER(c_ulong)(self._extra))
-            self._input_cache[cache_key] = Input(c_ulong(1), ii)
+            ii.ki = KeyBdInput(0, scan_code, flags, 0, self._extra)
+            cached = self._input_cache[cache_key] = Input(c_ulong(INPUT_KEYBOARD), ii)
         
-        SendInput(1, ctypes.pointer(self._input_cache[cache_key]), ctypes.sizeof(Input))
+        return cached
     
-    def _should_stop_mode1(self, trigger_key):
-        """mode1 중단 조건 체크"""
-        return (trigger_key not in self.pressed_keys or 
-                not self.macro_enabled or 
-                self.stop_signal.is_set())
+    def _char_input(self, code, is_keyup):
+        """캐싱된 유니코드 문자 입력 구조체 조회 (wVk 0, wScan에 UTF-16 코드 단위)"""
+        flags = KEYEVENTF_UNICODE
+        if is_keyup:
+            flags |= KEYEVENTF_KEYUP
+        
+        cache_key = (code, flags)
+        cached = self._input_cache.get(cache_key)
+        if cached is None:
+            ii = Input_I()
+            ii.ki = KeyBdInput(0, code, flags, 0, self._extra)
+            cached = self._input_cache[cache_key] = Input(c_ulong(INPUT_KEYBOARD), ii)
+        
+        return cached
     
-    def _interruptible_sleep(self, duration, trigger_key):
-        """중단 가능한 sleep"""
-        if duration <= 0:
-            return True
+    def _mouse_input(self, dx, dy, data, flags):
+        """캐싱된 마우스 입력 구조체 조회 (경로의 같은 이동량도 공유)"""
+        cache_key = (dx, dy, data, flags)
+        cached = self._input_cache.get(cache_key)
+        if cached is None:
+            ii = Input_I()
+            ii.mi = MouseInput(dx, dy, data, flags, 0, self._extra)
+            cached = self._input_cache[cache_key] = Input(c_ulong(INPUT_MOUSE), ii)
         
-        end_time = time.perf_counter() + duration
+        return cached
+    
+    def _compile(self, trigger, actions, numbers=None):
+        """(hold, key, delay) 목록을 실행 스텝 목록으로 컴파일
         
-        while time.perf_counter() < end_time:
-            if self._should_stop_mode1(trigger_key):
-                return False
-            time.sleep(CHECK_INTERVAL)
+        스캔코드/확장키/에코 장부 조회와 Input 생성을 로드 시 한 번만 수행.
+        주입 입력은 장부로 정확히 구분하므로 매크로가 자기 트리거 키도 누를 수 있음.
+        반복 블록은 본문을 한 번만 컴파일해 STEP_BLOCK 스텝이 repeat회 실행하고
+        (1회 반복은 그대로 이어 붙임), 서브루틴 호출은 한 번 컴파일한 본문을 공유.
+        문자 입력은 글자마다 유니코드 눌림/뗌 쌍을 만들어 size 글자씩 한 배열로 묶고
+        묶음 사이에 글자 수 × interval 대기 (스캔코드 표와 무관, 한글 포함).
+        마우스 상대 이동 경로는 여기서 틱별 이동 입력으로 미리 계산 (실행 중 계산 없음).
+        액션 번호는 블록 안까지 앞에서부터 매김
+        """
+        if numbers is None:
+            numbers = itertools.count()
+        program = []
+        pending = []
+        meta = []
+        echoes = []
+        batch = self.batch_input
+        last = -1
+        
+        def emit(wait, index, flags=0, release=None, release_echo=-1):
+            count = len(pending)
+            if count == 1:
+                inputs = ctypes.pointer(pending[0])
+            elif count:
+                inputs = (Input * count)(*pending)
+            else:
+                inputs = None
+            
+            scans, keyups, indices = zip(*meta) if meta else ((), (), ())
+            program.append(Step(inputs, count, int(wait * 1e9), flags, release, release_echo,
+                                tuple(echoes), index, scans, keyups, indices))
+            pending.clear()
+            meta.clear()
+            echoes.clear()
+        
+        def press(down, up, code, echo, hold, delay, index):
+            # 눌림 → (hold 대기) → 뗌 → delay 대기
+            pending.append(down)
+            meta.append((code, 0, index))
+            if echo >= 0:
+                echoes.append(echo)
+            if hold > 0:
+                emit(hold, index, STEP_HOLD, ctypes.pointer(up), echo + 1 if echo >= 0 else -1)
+            elif not batch:
+                emit(0, index)
+            
+            pending.append(up)
+            meta.append((code, 1, index))
+            if echo >= 0:
+                echoes.append(echo + 1)
+            if delay > 0 or not batch:
+                emit(delay, index)
+        
+        def single(inputs, code, delay, index):
+            # 단일 입력 (마우스 이동/휠) → delay 대기
+            pending.append(inputs)
+            meta.append((code, 0, index))
+            if delay > 0 or not batch:
+                emit(delay, index)
+        
+        def block(body, repeat, macro):
+            # 블록 앞의 묶인 입력은 먼저 내보냄 (블록 경계를 넘어 묶지 않음)
+            if pending:
+                emit(0, last)
+            program.append(Step(None, 0, 0, STEP_BLOCK, body=body, repeat=repeat, macro=macro))
+        
+        def walk(items):
+            nonlocal last
+            for item in items:
+                kind = item[0]
+                if kind == 'repeat':
+                    if item[1] == 1:
+                        walk(item[2])
+                    else:
+                        body = self._compile(trigger, item[2], numbers)
+                        block(body, item[1], self.telemetry.register(trigger, body))
+                    continue
+                
+                if kind == 'call':
+                    block(*self._subroutine(item[1], item[2]))
+                    continue
+                
+                if kind == 'text':
+                    _, text, size, interval, delay = item
+                    index = last = next(numbers)
+                    chunks = text_chunks(text, size)
+                    final = len(chunks) - 1
+                    for part, chunk in enumerate(chunks):
+                        # 유니코드 입력(VK_PACKET)은 훅 콜백에 오지 않으므로 에코 장부에 기록하지 않음
+                        for char in chunk:
+                            for code in text_units(char):
+                                for keyup in (0, 1):
+                                    pending.append(self._char_input(code, keyup))
+                                    meta.append((code, keyup, index))
+                        if part < final:
+                            emit(len(chunk) * interval, index)
+                        elif delay > 0 or not batch:
+                            emit(delay, index)
+                    continue
+                
+                if kind in MOUSE_ACTIONS:
+                    index = last = next(numbers)
+                    if kind == 'click':
+                        _, button, hold, delay = item
+                        down, up = BUTTONS[button]
+                        press(self._mouse_input(0, 0, 0, down), self._mouse_input(0, 0, 0, up),
+                              down, -1, hold, delay, index)
+                    elif kind == 'move':
+                        _, x, y, delay = item
+                        x, y = absolute_coords(x, y, self.screen)
+                        single(self._mouse_input(x, y, 0, MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE),
+                               0, delay, index)
+                    elif kind == 'scroll':
+                        _, clicks, delay = item
+                        single(self._mouse_input(0, 0, clicks * WHEEL_DELTA & 0xFFFFFFFF, MOUSEEVENTF_WHEEL),
+                               0, delay, index)
+                    else:
+                        # 미리 계산한 경로: 틱마다 (간격 대기 → 이동), 마지막 틱 뒤 delay
+                        _, dx, dy, duration, path, jitter, rate, delay = item
+                        steps = build_path(dx, dy, duration, path, jitter, rate)
+                        interval = duration / len(steps) if duration > 0 else 0
+                        for move_x, move_y in steps:
+                            if interval:
+                                emit(interval, index)
+                            if move_x or move_y:
+                                pending.append(self._mouse_input(move_x, move_y, 0, MOUSEEVENTF_MOVE))
+                                meta.append((0, 0, index))
+                        if delay > 0 or not batch:
+                            emit(delay, index)
+                    continue
+                
+                hold, key, delay = item
+                index = last = next(numbers)
+                
+                # 미등록 키는 건너뜀
+                scan_code = SCANCODE_MAP.get(key)
+                if scan_code is None:
+                    continue
+                
+                is_extended = key in EXTENDED_KEYS
+                echo = -1 if key in ALT_KEYS else self.echo_slots.get(key, -1)
+                press(self._key_input(scan_code, is_extended, False),
+                      self._key_input(scan_code, is_extended, True),
+                      scan_code, echo, hold, delay, index)
         
-        return not self._should_stop_mode1(trigger_key)
+        walk(actions)
+        if pending:
+            emit(0, last)
+        
+        return tuple(program)
     
-    def _execute_key(self, key, trigger_key, hold, delay, mode):
-        """단일 키 실행"""
-        # 트리거 키는 딜레이만 처리
-        if key == trigger_key:
-            if delay > 0:
-                if mode == 1:
-                    return self._interruptible_sleep(delay, trigger_key)
-                else:
-                    time.sleep(delay)
-            return True
+    def _subroutine(self, name, is_last):
+        """서브루틴 컴파일 (이름/호출 위치별 한 번만) → (스텝 튜플, 반복 1, 텔레메트리 번호)"""
+        key = (name, bool(is_last))
+        compiled = self._blocks.get(key)
+        if compiled is None:
+            label = '@' + name
+            body = self._compile(label, routine_actions(self.subroutines[name], is_last))
+            compiled = self._blocks[key] = (body, 1, self.telemetry.register(label, body))
+        return compiled
+    
+    def _should_stop(self, run):
+        """실행 중단 조건 체크"""
+        return run.cancel.is_set() or not self.macro_enabled
+    
+    def _wait_until(self, run, wait_ns):
+        """다음 절대 기한까지 중단 가능 대기
         
-        # 스캔코드 조회
-        scan_code = SCANCODE_MAP.get(key)
-        if scan_code is None:
-            return True
+        기한은 이전 기한 + wait_ns로 계산하므로 오버헤드와 초과 수면이
+        누적되지 않고 다음 대기에서 흡수됨
+        """
+        run.deadline += wait_ns
+        
+        # 취소 신호에서 블록 (폴링 없음, 마지막 구간은 타이머 전략에 따라 스핀)
+        if not self.timer.wait_until(run.deadline, run.cancel, wait_ns):
+            return False
+        
+        if self._should_stop(run):
+            return False
+        
+        drift = self.clock() - run.deadline
+        run.stats.record(drift)
         
-        is_extended = key in EXTENDED_KEYS
-        is_macro_trigger = key in self.macros
+        # 크게 밀렸으면 몰아서 따라잡지 않고 일정 재설정
+        if drift > RESYNC_THRESHOLD_NS:
+            run.deadline += drift
+            run.stats.resyncs += 1
         
-        # 매크로 트리거면 실행 목록 추가
-        if is_macro_trigger:
-            self.executing_keys.add(key)
+        return True
+    
+    def _note_echoes(self, echoes):
+        """주입 직전 에코 장부 기록 (_send_lock 안에서 호출, 보낸 쪽만 기록)"""
+        sent = self._echo_sent
+        times = self._echo_time
+        now = self.clock()
+        for index in echoes:
+            count = sent[index]
+            times[index * ECHO_DEPTH + count % ECHO_DEPTH] = now
+            sent[index] = count + 1
+    
+    def take_echo(self, index):
+        """훅에 들어온 입력이 주입한 입력이면 장부에서 지우고 True (훅 스레드에서만 호출)
+        
+        보낸/돌아온 횟수를 각각 한 스레드만 쓰므로 잠금 없이 정확히 대응.
+        보낸 지 ECHO_WINDOW_NS가 지난 기록은 (사용자가 Alt를 누르고 있어 훅에 오지 않은
+        입력 등) 놓친 것으로 보고 보낸 순서대로 버림. ECHO_DEPTH개보다 오래된 기록도 버림
+        """
+        seen = self._echo_seen
+        done = seen[index]
+        sent = self._echo_sent[index]
+        if sent <= done:
+            return False
+        
+        done = max(done, sent - ECHO_DEPTH)
+        times = self._echo_time
+        base = index * ECHO_DEPTH
+        now = self.clock()
+        while done < sent and now - times[base + done % ECHO_DEPTH] > ECHO_WINDOW_NS:
+            done += 1
+        
+        if done == sent:
+            seen[index] = done
+            return False
+        
+        seen[index] = done + 1
+        return True
+    
+    def _run_program(self, run, program, macro_id=None):
+        """컴파일된 스텝 실행 (중단되면 False, 블록 본문은 재귀 실행)"""
+        send = self.backend.send
+        send_lock = self._send_lock
+        telemetry = self.telemetry
+        record = telemetry.record if telemetry.capacity else None
+        if macro_id is None:
+            macro_id = run.macro
+        clock = self.clock
+        held = None
+        held_echo = -1
         
         try:
-            # mode 1 중단 체크
-            if mode == 1 and self._should_stop_mode1(trigger_key):
-                return False
-            
-            # 키 눌림
-            self._send_input(scan_code, is_extended, False)
+            for number, step in enumerate(program):
+                # 중단 체크
+                if self._should_stop(run):
+                    return False
+                
+                # 반복/서브루틴 블록 (앞 스텝에서 홀드 중인 키는 없음)
+                if step.flags & STEP_BLOCK:
+                    body = step.body
+                    for _ in range(step.repeat):
+                        if not self._run_program(run, body, step.macro):
+                            return False
+                    continue
+                
+                if step.count:
+                    if not run.first_send:
+                        run.first_send = clock()
+                        run.stats.start_latency = run.first_send - run.requested
+                    
+                    flags = step.flags
+                    with send_lock:
+                        if step.echoes:
+                            self._note_echoes(step.echoes)
+                        send(step.inputs, step.count)
+                        if record:
+                            record(run.run_id, macro_id, number, run.deadline, clock())
+                    run.stats.sends += 1
+                    if flags & STEP_HOLD:
+                        held, held_echo = step.release, step.release_echo
+                    else:
+                        held = None
+                
+                # 대기
+                if step.wait_ns and not self._wait_until(run, step.wait_ns):
+                    return False
             
-            # hold 대기
-            if hold > 0:
-                if mode == 1:
-                    if not self._interruptible_sleep(hold, trigger_key):
-                        self._send_input(scan_code, is_extended, True)
-                        return False
-                else:
-                    time.sleep(hold)
+            return True
+        
+        finally:
+            # 홀드 중 중단되면 키 해제 보장
+            if held is not None:
+                try:
+                    with send_lock:
+                        if held_echo >= 0:
+                            self._note_echoes((held_echo,))
+                        send(held, 1)
+                except:
+                    pass
+    
+    def press(self, state):
+        """트리거 눌림 (디스패처 스레드) → 시작할 seq, 무시하면 0
+        
+        키 반복, 실행 중인 mode 2, 차단 시간 안의 mode 2는 무시.
+        mode 1은 이전 실행이 종료 대기(STOPPING) 중이어도 새로 눌림
+        """
+        with self._lock:
+            if state.held:
+                return 0
+            state.held = True
             
-            # 키 뗌
-            self._send_input(scan_code, is_extended, True)
+            phase = state.phase
+            if state.mode == 2:
+                if phase != IDLE or self.clock() < state.unblock_at:
+                    return 0
+            elif phase != IDLE and phase != STOPPING:
+                return 0
             
-            # delay 대기
-            if delay > 0:
-                if mode == 1:
-                    return self._interruptible_sleep(delay, trigger_key)
-                else:
-                    time.sleep(delay)
+            state.seq += 1
+            state.phase = ARMED
+            return state.seq
+    
+    def release(self, state):
+        """트리거 뗌 (디스패처 스레드) → 사용자가 누른 키였으면 True
+        
+        mode 1은 여기서 바로 취소 신호를 보내므로 실행이 등록되기 전(ARMED)에
+        뗀 입력도 사라지지 않음. mode 2는 끝까지 실행하고 잠시 재입력 차단
+        """
+        with self._lock:
+            if not state.held:
+                return False
+            state.held = False
             
+            if state.mode == 2:
+                state.unblock_at = self.clock() + MODE2_BLOCK_NS
+            else:
+                self._disarm(state)
             return True
+    
+    def disarm(self, state, seq):
+        """시작하지 않을 눌림 취소 (ARMED → IDLE, seq가 최신일 때만)"""
+        with self._lock:
+            if state.seq == seq and state.phase == ARMED:
+                state.phase = IDLE
+    
+    def _disarm(self, state):
+        """ARMED → IDLE, RUNNING → STOPPING (_lock 안에서 호출)"""
+        if state.phase == ARMED:
+            state.phase = IDLE
+        elif state.phase == RUNNING:
+            state.phase = STOPPING
+            state.run.stop()
+    
+    def _begin_run(self, trigger, mode, seq=0):
+        """실행 등록 (ARMED → RUNNING, 다른 트리거와는 동시 실행)
         
-        except Exception:
-            # 예외 발생 시 키 해제 보장
-            try:
-                self._send_input(scan_code, is_extended, True)
-            except:
-                pass
-            return False
+        seq가 있으면 그 눌림이 아직 최신이고 ARMED일 때만 등록 (이미 뗐으면 None).
+        seq 없이 직접 시작하면 새 눌림 번호를 받아 바로 등록
+        """
+        with self._lock:
+            state = self.states.get(trigger)
+            if state is None:
+                return None
+            if seq:
+                if state.seq != seq or state.phase != ARMED:
+                    return None
+            elif state.phase == ARMED or state.phase == RUNNING or (
+                    mode == 2 and state.phase == STOPPING):
+                return None
+            else:
+                state.seq += 1
+                seq = state.seq
+            
+            run = MacroRun(trigger, mode, seq, self.clock)
+            run.program = self.programs.get(trigger, ())
+            run.macro = self._macro_ids.get(trigger, 0)
+            state.phase = RUNNING
+            state.run = run
+            self.runs[trigger] = run
+            return run
+    
+    def _end_run(self, run):
+        """실행 등록 해제 (_lock 안에서 호출)
         
-        finally:
-            if is_macro_trigger:
-                # 비동기 정리
-                old_timer = self._cleanup_timers.get(key)
-                if old_timer:
-                    old_timer.cancel()
-                
-                timer = threading.Timer(CLEANUP_DELAY, self._cleanup_executing_key, args=(key,))
-                self._cleanup_timers[key] = timer
-                timer.start()
+        이 상태에 등록된 최신 눌림의 실행일 때만 IDLE로 되돌림 (새로 눌렸으면 그대로 둠)
+        """
+        now = self.clock()
+        if run.started:
+            run.stats.elapsed = now - run.started
+            if run.cancelled:
+                run.stats.stop_latency = now - run.cancelled
+            self.stats[run.trigger] = run.stats
+        
+        # 모드 변경으로 상태가 새로 만들어졌으면 이전 실행은 새 상태를 건드리지 않음
+        state = self.states.get(run.trigger)
+        if state is not None and state.run is run:
+            state.run = None
+            if state.seq == run.seq and state.phase != ARMED:
+                state.phase = IDLE
+        
+        if self.runs.get(run.trigger) is run:
+            del self.runs[run.trigger]
     
-    def _cleanup_executing_key(self, key):
-        """실행 키 정리"""
-        self.executing_keys.discard(key)
-        self._cleanup_timers.pop(key, None)
+    def _submit(self, run, runner, program):
+        """실행 스레드 풀에 요청 (큐가 가득 차면 등록 취소, mode 1은 스레드 수 제한 밖)"""
+        if self.pool.submit(runner, run, program, repeat=run.mode == 1, label=run.trigger):
+            return True
+        
+        with self._lock:
+            self._end_run(run)
+        
+        event = self.mode2_events.get(run.trigger)
+        if run.mode == 2 and event:
+            event.set()
+        return False
     
-    def _run_once(self, trigger, actions):
+    def _run_once(self, run, program):
         """mode 2: 1회 실행"""
-        event = self.mode2_events.get(trigger)
-        if event:
-            event.clear()
+        event = self.mode2_events.get(run.trigger)
         
         try:
-            for hold, key, delay in actions:
-                if not self.macro_enabled:
-                    break
-                self._execute_key(key, trigger, hold, delay, 2)
+            run.begin()
+            self._run_program(run, program)
+            run.stats.iterations = 1
         finally:
+            with self._lock:
+                self._end_run(run)
             if event:
                 event.set()
     
-    def _run_repeat(self, trigger, actions):
-        """mode 1: 연속 반복 (무한루프 방지)"""
-        iteration_count = 0
+    def _run_repeat(self, run, program):
+        """mode 1: 연속 반복 (뗌/취소 신호까지, 무한루프 방지)"""
+        sequence_ns = int(self.timings['sequence'] * 1e9)
+        stats = run.stats
         
         try:
-            while not self.stop_signal.is_set():
-                # 중단 조건 체크
-                if self._should_stop_mode1(trigger):
-                    break
-                
+            run.begin()
+            while not self._should_stop(run):
                 # 안전장치
-                iteration_count += 1
-                if iteration_count > MAX_ITERATIONS:
+                if stats.iterations >= MAX_ITERATIONS:
                     break
                 
-                # 액션 실행
-                for hold, key, delay in actions:
-                    if self._should_stop_mode1(trigger):
-                        return
-                    
-                    if not self._execute_key(key, trigger, hold, delay, 1):
-                        return
+                # 스텝 실행
+                if not self._run_program(run, program):
+                    break
+                stats.iterations += 1
                 
-                # 시퀀스 딜레이
-                if not self._interruptible_sleep(self.timings['sequence'], trigger):
+                # 시퀀스 딜레이 (0이고 동시 실행 중이면 다른 실행에 차례 양보)
+                if not sequence_ns:
+                    if len(self.runs) > 1:
+                        time.sleep(0)
+                elif not self._wait_until(run, sequence_ns):
                     break
         
         finally:
-            # 확실한 상태 정리
+            # 확실한 상태 정리 (같은 트리거가 이미 다시 눌렸으면 건드리지 않음)
             with self._lock:
-                self.is_running = False
-                self.current_macro = None
-                self.pressed_keys.discard(trigger)
+                self._end_run(run)
     
-    def start(self, trigger):
-        """매크로 시작"""
-        if not self.macro_enabled:
-            return False
-        
-        info = self.macros.get(trigger)
-        if not info:
-            return False
+    def start(self, trigger, seq=0):
+        """매크로 시작 (seq: 훅이 받은 눌림 번호, 이미 뗐으면 시작 안 함)
         
-        mode = info.get('mode', 0)
-        if mode == 0:
+        비활성/프로그램 없음으로 시작하지 않으면 그 눌림의 ARMED를 IDLE로 되돌림
+        (되돌리지 않으면 mode 2 트리거가 다시 눌리지 않음)
+        """
+        info = self.macros.get(trigger) if self.macro_enabled else None
+        mode = info.get('mode', 0) if info else 0
+        if mode not in (1, 2) or not self.programs.get(trigger):
+            state = self.states.get(trigger)
+            if seq and state is not None:
+                self.disarm(state, seq)
             return False
         
-        actions = info.get('actions', [])
-        if not actions:
+        run = self._begin_run(trigger, mode, seq)
+        if run is None:
             return False
         
         if mode == 2:
-            # mode 2: 중복 실행 방지
+            # 완료 대기용 이벤트 (중복 실행 방지는 상태 머신에서)
             event = self.mode2_events.get(trigger)
-            if event and not event.is_set():
-                return False
-            
-            threading.Thread(
-                target=self._run_once,
-                args=(trigger, actions),
-                daemon=True
-            ).start()
-            return True
-        
-        elif mode == 1:
-            # mode 1: 단일 실행만 허용
-            with self._lock:
-                if self.is_running:
-                    return False
-                
-                self.is_running = True
-                self.current_macro = trigger
-                self.stop_signal.clear()
-            
-            threading.Thread(
-                target=self._run_repeat,
-                args=(trigger, actions),
-                daemon=True
-            ).start()
-            return True
+            if event:
+                event.clear()
+            return self._submit(run, self._run_once, run.program)
         
-        return False
+        return self._submit(run, self._run_repeat, run.program)
     
     def stop(self, trigger):
-        """매크로 중단"""
+        """매크로 중단 (해당 트리거의 mode 1 실행만 취소)"""
         with self._lock:
-            if self.current_macro == trigger:
-                self.stop_signal.set()
-                self.is_running = False
-                self.pressed_keys.discard(trigger)
+            state = self.states.get(trigger)
+            if state is not None and state.mode == 1:
+                self._disarm(state)
     
-    def should_block_trigger(self, key):
-        """트리거 차단 확인"""
-        return key in self.executing_keys
+    def active_runs(self):
+        """실행 중인 매크로 목록 [(run_id, trigger, 반복 횟수)]"""
+        with self._lock:
+            return [(run.run_id, run.trigger, run.stats.iterations)
+                    for run in self.runs.values() if not run.cancel.is_set()]
     
     def cleanup(self):
         """종료 시 리소스 정리"""
         self.macro_enabled = False
-        self.stop_signal.set()
+        with self._lock:
+            for run in self.runs.values():
+                run.cancel.set()
         
-        # 타이머 취소
-        for timer in list(self._cleanup_timers.values()):
+        # 실행 스레드 종료
+        if self.pool:
+            self.pool.shutdown()
+        
+        # 백엔드 해제
+        close = getattr(self.backend, 'close', None)
+        if close:
             try:
-                timer.cancel()
+                close()
             except:
                 pass
-        self._cleanup_timers.clear()
+        
+        # 타이머 해상도 복원
+        close = getattr(self.timer, 'close', None)
+        if close:
+            close()
         
         # 상태 초기화
-        self.pressed_keys.clear()
-        self.executing_keys.clear()
-        self.user_triggers.clear()
\ No newline at end of file
+        for state in self.states.values():
+            state.held = False
\ No newline at end of file
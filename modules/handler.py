@@ -1,12 +1,41 @@
 import os
 import sys
-import subprocess
+import time
+import queue
 import threading
 
+from telemetry import HookMetrics
+
+# 키 분류 (디스패치 테이블)
+KEY_TOGGLE = 1      # 토글 키
+KEY_FORCE_QUIT = 2  # 강제 종료 조합 키
+KEY_MACRO_OFF = 3   # mode 0 매크로 키
+KEY_MODE1 = 4       # 연속 동작 트리거
+KEY_MODE2 = 5       # 단일 동작 트리거
+
+# 디스패처 요청 (훅 → 디스패처 스레드)
+REQ_PRESS = 1    # 트리거 눌림 (상태 전이 + 매크로 시작)
+REQ_TOGGLE = 2   # 매크로 토글
+REQ_QUIT = 3     # 강제 종료
+REQ_RELEASE = 4  # 트리거 뗌 (mode 1 취소, mode 2 재입력 차단)
+REQ_FLUSH = 5    # 앞선 요청 처리 완료 알림 (flush)
+
+DISPATCH_QUEUE_DEPTH = 256  # 디스패치 큐 최대 길이
+
 class EventHandler:
-    """키보드 이벤트 핸들러"""
-    __slots__ = ('core', 'toggle_key', 'blocked', 'force_quit_keys', 
-                 'pressed_force_quit', '_shutdown_lock', '_block_timers')
+    """키보드 이벤트 핸들러
+    
+    설정 로드 시 원본 이벤트 이름 → (분류, 트리거 상태, 키, 에코 인덱스) 테이블을 만들어
+    콜백마다 한 번의 조회로 처리 경로를 결정. 미등록 키는 조회 1회로 통과.
+    트리거별 눌림/실행 상태는 코어의 상태 머신(TriggerState) 하나로 관리.
+    
+    훅 콜백은 차단/통과만 결정하고 (요청, 트리거 상태, 키, 시각)을 큐에 넣음 (잠금 없음).
+    트리거 상태 전이와 실행 등록은 디스패처 스레드만 코어 _lock을 잡고 순서대로 처리하므로
+    실행 종료/리로드가 잠금을 잡고 있어도 훅 반환은 밀리지 않음. 출력은 실행 스레드에서 처리
+    """
+    __slots__ = ('core', 'toggle_key', 'force_quit_keys', 'pressed_force_quit',
+                 'dispatch', 'keys', 'metrics', 'requests',
+                 '_dispatcher', '_shutdown_lock')
     
     # Shift 키 매핑
     SHIFT_MAP = {
@@ -42,11 +71,16 @@ class EventHandler:
         
         self.core = core
         self.toggle_key = toggle_key
-        self.blocked = set()
         self.force_quit_keys = set(force_quit_keys or ['alt', 'shift', 'delete'])
         self.pressed_force_quit = set()
         self._shutdown_lock = False
-        self._block_timers = {}
+        self.build_dispatch()
+        
+        # 디스패처 스레드
+        self.metrics = HookMetrics()
+        self.requests = queue.SimpleQueue()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='KeyM-dispatch', daemon=True)
+        self._dispatcher.start()
     
     def _normalize_key(self, key_name):
         """키 이름 정규화"""
@@ -65,159 +99,236 @@ class EventHandler:
         
         return key_name
     
-    def _schedule_unblock(self, key, delay=0.05):
-        """차단 해제 예약"""
-        # 기존 타이머 취소
-        old_timer = self._block_timers.get(key)
-        if old_timer:
-            old_timer.cancel()
-        
-        # 새 타이머 시작
-        timer = threading.Timer(delay, self._unblock_key, args=(key,))
-        self._block_timers[key] = timer
-        timer.start()
+    def build_dispatch(self):
+        """디스패치 테이블 생성 (설정 로드 시 1회)
+        
+        정규화 결과가 등록 키인 모든 원본 이름(대문자, Shift 기호, 넘버패드)을 미리 펼침.
+        같은 키가 여러 분류에 속하면 강제 종료 > 토글 > 매크로 순으로 우선
+        """
+        kinds = {}
+        for key, info in self.core.macros.items():
+            mode = info.get('mode', 0)
+            kinds[key] = KEY_MODE1 if mode == 1 else KEY_MODE2 if mode == 2 else KEY_MACRO_OFF
+        kinds[self.toggle_key] = KEY_TOGGLE
+        for key in self.force_quit_keys:
+            kinds[key] = KEY_FORCE_QUIT
+        
+        self.keys = list(kinds)
+        states = self.core.states
+        echo_slots = self.core.echo_slots
+        entries = {key: (kind, states.get(key), key, echo_slots.get(key, -1))
+                   for key, kind in kinds.items()}
+        
+        dispatch = {}
+        for raw in set(kinds) | set(self.NUMPAD_MAP) | set(self.SHIFT_MAP):
+            entry = entries.get(self._normalize_key(raw))
+            if entry:
+                dispatch[raw] = entry
+        
+        self.dispatch = dispatch
     
-    def _unblock_key(self, key):
-        """키 차단 해제"""
-        self.blocked.discard(key)
-        self._block_timers.pop(key, None)
+    def update(self, toggle_key, force_quit_keys):
+        """설정 리로드 후 키 설정과 디스패치 테이블 교체 (훅 콜백은 그대로)"""
+        self.toggle_key = toggle_key
+        self.force_quit_keys = set(force_quit_keys)
+        self.pressed_force_quit &= self.force_quit_keys
+        self.build_dispatch()
     
-    def handle_press(self, event):
-        """키 눌림 처리"""
-        if self._shutdown_lock:
+    def _request(self, kind, arg, key, always=False):
+        """디스패처에 요청 (큐가 가득 차면 False, always면 항상 넣음)"""
+        requests = self.requests
+        depth = requests.qsize()
+        if depth >= DISPATCH_QUEUE_DEPTH and not always:
+            self.metrics.dropped += 1
             return False
         
-        if not event or not hasattr(event, 'name'):
+        requests.put((kind, arg, key, time.perf_counter_ns()))
+        if depth >= self.metrics.max_depth:
+            self.metrics.max_depth = depth + 1
+        return True
+    
+    def _dispatch_loop(self):
+        """디스패처 스레드: 큐의 요청으로 코어 구동"""
+        get = self.requests.get
+        metrics = self.metrics
+        clock = time.perf_counter_ns
+        
+        while True:
+            request = get()
+            if request is None:
+                return
+            
+            kind, arg, key, queued = request
+            n = metrics.dispatched
+            metrics.lag[n % metrics.capacity] = clock() - queued
+            metrics.dispatched = n + 1
+            
+            try:
+                if kind == REQ_PRESS:
+                    # IDLE → ARMED → 실행 등록 (키 반복, 실행 중인 mode 2, 차단 중이면 무시)
+                    seq = self.core.press(arg)
+                    if seq:
+                        self.core.start(key, seq)
+                
+                elif kind == REQ_RELEASE:
+                    # mode 1: ARMED → IDLE / RUNNING → STOPPING, mode 2: 잠시 재입력 차단
+                    self.core.release(arg)
+                
+                elif kind == REQ_FLUSH:
+                    arg.set()
+                
+                elif kind == REQ_TOGGLE:
+                    status = "활성화" if self.core.toggle_macro() else "비활성화"
+                    print(f"매크로 {status}")
+                
+                elif kind == REQ_QUIT:
+                    print("강제 종료 중...")
+                    self.shutdown()
+            
+            except Exception as e:
+                print(f"디스패치 오류: {e}")
+    
+    def handle_press(self, event):
+        """키 눌림 처리 (훅 콜백)
+        
+        미등록 키는 조회 1회로 바로 반환, 등록 키만 반환 지연 기록
+        """
+        entry = self.dispatch.get(getattr(event, 'name', None))
+        if entry is None:
+            return not self._shutdown_lock
+        
+        start = time.perf_counter_ns()
+        result = self._press(entry)
+        
+        metrics = self.metrics
+        n = metrics.hooks
+        metrics.hook[n % metrics.capacity] = time.perf_counter_ns() - start
+        metrics.hooks = n + 1
+        return result
+    
+    def handle_release(self, event):
+        """키 떼기 처리 (훅 콜백)
+        
+        미등록 키는 조회 1회로 바로 반환, 등록 키만 반환 지연 기록
+        """
+        entry = self.dispatch.get(getattr(event, 'name', None))
+        if entry is None:
+            return not self._shutdown_lock
+        
+        start = time.perf_counter_ns()
+        result = self._release(entry)
+        
+        metrics = self.metrics
+        n = metrics.hooks
+        metrics.hook[n % metrics.capacity] = time.perf_counter_ns() - start
+        metrics.hooks = n + 1
+        return result
+    
+    def handle_event(self, event):
+        """전역 훅 콜백 (HOOK_MODE='global')
+        
+        모든 키 이벤트가 들어오므로 미등록 키는 조회 1회 후 항상 통과.
+        강제 종료 키는 키별 훅과 같게 판단만 하고 입력은 막지 않음
+        """
+        entry = self.dispatch.get(getattr(event, 'name', None))
+        if entry is None:
             return True
         
-        key = self._normalize_key(event.name)
-        if not key:
+        start = time.perf_counter_ns()
+        if event.event_type == 'up':
+            result = self._release(entry)
+        else:
+            result = self._press(entry)
+        
+        metrics = self.metrics
+        n = metrics.hooks
+        metrics.hook[n % metrics.capacity] = time.perf_counter_ns() - start
+        metrics.hooks = n + 1
+        return result or entry[0] == KEY_FORCE_QUIT
+    
+    def _press(self, entry):
+        """등록 키 눌림 판단"""
+        kind, state, key, echo = entry
+        
+        # 1. 매크로가 주입한 입력은 그대로 통과
+        if echo >= 0 and self.core.take_echo(echo):
             return True
         
-        # 1. 강제 종료 체크
-        if key in self.force_quit_keys:
+        if self._shutdown_lock:
+            return False
+        
+        # 2. 강제 종료 체크
+        if kind == KEY_FORCE_QUIT:
             self.pressed_force_quit.add(key)
             if self.pressed_force_quit >= self.force_quit_keys:
-                print("강제 종료 중...")
-                self.shutdown()
-                return False
+                self._request(REQ_QUIT, 0, key)
             return False
         
-        # 2. 토글 키
-        if key == self.toggle_key:
-            status = "활성화" if self.core.toggle_macro() else "비활성화"
-            print(f"매크로 {status}")
+        # 3. 토글 키
+        if kind == KEY_TOGGLE:
+            self._request(REQ_TOGGLE, 0, key)
             return False
         
-        # 3. 매크로 비활성화 상태
-        if not self.core.macro_enabled:
-            return True
-        
-        # 4. 미등록 키
-        if key not in self.core.macros:
-            return True
+        core = self.core
         
-        # 5. 실행 중인 매크로 차단
-        if key in self.core.executing_keys:
+        # 4. 매크로 비활성화 상태
+        if not core.macro_enabled:
             return True
         
-        # 6. 이미 차단된 키
-        if key in self.blocked:
-            return False
-        
-        # 7. 사용자가 이미 누른 키
-        if key in self.core.user_triggers:
-            return False
-        
-        # 8. mode 2 중복 실행 방지
-        info = self.core.macros.get(key)
-        if info and info.get('mode') == 2:
-            event_obj = self.core.mode2_events.get(key)
-            if event_obj and not event_obj.is_set():
-                return False
-        
-        # 9. 중복 눌림 방지
-        if key in self.core.pressed_keys:
-            return False
-        
-        # 10. 매크로 시작
-        self.core.user_triggers.add(key)
-        self.blocked.add(key)
-        self.core.pressed_keys.add(key)
-        
-        if not self.core.start(key):
-            # 시작 실패 시 상태 롤백
-            self.core.user_triggers.discard(key)
-            self.blocked.discard(key)
-            self.core.pressed_keys.discard(key)
+        # 5. mode 0 매크로 키
+        if kind == KEY_MACRO_OFF:
             return False
         
+        # 6. 상태 전이/시작은 디스패처에서 (큐가 가득 차면 눌림 버림)
+        self._request(REQ_PRESS, state, key)
         return False
     
-    def handle_release(self, event):
-        """키 떼기 처리"""
-        if self._shutdown_lock:
-            return False
+    def _release(self, entry):
+        """등록 키 떼기 판단"""
+        kind, state, key, echo = entry
         
-        if not event or not hasattr(event, 'name'):
+        # 1. 매크로가 주입한 입력은 그대로 통과
+        if echo >= 0 and self.core.take_echo(echo + 1):
             return True
         
-        key = self._normalize_key(event.name)
-        if not key:
-            return True
+        if self._shutdown_lock:
+            return False
         
-        # 1. 강제 종료 키 해제
-        if key in self.force_quit_keys:
+        # 2. 강제 종료 키 해제
+        if kind == KEY_FORCE_QUIT:
             self.pressed_force_quit.discard(key)
             return False
         
-        # 2. 토글 키
-        if key == self.toggle_key:
+        # 3. 토글 키
+        if kind == KEY_TOGGLE:
             return False
         
-        # 3. 매크로 비활성화 상태
-        if not self.core.macro_enabled:
-            return True
-        
-        # 4. 미등록 키
-        if key not in self.core.macros:
-            return True
+        core = self.core
         
-        # 5. 실행 중인 매크로 차단
-        if key in self.core.executing_keys:
+        # 4. 매크로 비활성화 상태
+        if not core.macro_enabled:
             return True
         
-        # 6. 사용자가 누른 키가 아님
-        if key not in self.core.user_triggers:
+        # 5. mode 0 매크로 키
+        if kind == KEY_MACRO_OFF:
             return False
         
-        # 7. 상태 정리
-        self.core.user_triggers.discard(key)
-        self.core.pressed_keys.discard(key)
-        
-        info = self.core.macros.get(key)
-        if not info:
-            return False
-        
-        mode = info.get('mode', 0)
-        
-        if mode == 1:
-            # mode 1: 즉시 중단 및 차단 해제
-            self.core.stop(key)
-            self.blocked.discard(key)
-            
-            # 기존 타이머 취소
-            old_timer = self._block_timers.get(key)
-            if old_timer:
-                old_timer.cancel()
-                self._block_timers.pop(key, None)
-        
-        elif mode == 2:
-            # mode 2: 지연 후 차단 해제
-            self._schedule_unblock(key, 0.05)
-        
+        # 6. 뗌은 버리지 않음 (버리면 mode 1이 멈추지 않고 눌림 상태가 남음)
+        self._request(REQ_RELEASE, state, key, always=True)
         return False
     
+    def flush(self, timeout=1.0):
+        """지금까지 넣은 요청을 디스패처가 모두 처리할 때까지 대기 (처리되면 True)"""
+        done = threading.Event()
+        self.requests.put((REQ_FLUSH, done, None, time.perf_counter_ns()))
+        return done.wait(timeout)
+    
+    def close(self):
+        """디스패처 스레드 종료 (남은 요청 처리 후)"""
+        self.requests.put(None)
+        if self._dispatcher is not threading.current_thread():
+            self._dispatcher.join(1.0)
+    
     def shutdown(self):
         """완전 종료"""
         if self._shutdown_lock:
@@ -231,13 +342,8 @@ class EventHandler:
             if hasattr(self, 'core') and self.core:
                 self.core.cleanup()
             
-            # 2. 타이머 취소
-            for timer in list(self._block_timers.values()):
-                try:
-                    timer.cancel()
-                except:
-                    pass
-            self._block_timers.clear()
+            # 2. 디스패처 종료 요청 (디스패처 스레드에서 호출될 수 있으므로 대기 안 함)
+            self.requests.put(None)
             
             # 3. keyboard hook 해제
             try:
@@ -253,6 +359,7 @@ class EventHandler:
         finally:
             # 4. 프로세스 강제 종료
             try:
+                import subprocess
                 subprocess.Popen(
                     ['taskkill', '/F', '/PID', str(os.getpid())],
                     creationflags=subprocess.CREATE_NO_WINDOW
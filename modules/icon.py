@@ -0,0 +1,24 @@
+import os
+
+ICON_SIZE = 64               # 트레이 아이콘 크기
+ICON_ASSET = 'icon64.ico'    # 빌드 시 미리 렌더링한 트레이 아이콘
+
+class IconAsset:
+    """미리 렌더링한 ICO 바이트 (PIL 이미지 대신 pystray에 전달)
+
+    Windows의 pystray는 아이콘을 save(파일, format='ICO')로 임시 파일에 쓴 뒤
+    LoadImage로 읽기만 하므로 ICO 바이트를 그대로 쓰면 PIL이 필요 없음
+    """
+    __slots__ = ('data', 'size')
+
+    def __init__(self, data, size=(ICON_SIZE, ICON_SIZE)):
+        self.data = data
+        self.size = size
+
+    def save(self, fp, format=None, **params):
+        """파일(경로 또는 파일 객체)에 ICO 바이트 쓰기"""
+        if isinstance(fp, (str, bytes, os.PathLike)):
+            with open(fp, 'wb') as f:
+                f.write(self.data)
+        else:
+            fp.write(self.data)
@@ -0,0 +1,66 @@
+import random
+
+from backend import (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, MOUSEEVENTF_RIGHTDOWN,
+                     MOUSEEVENTF_RIGHTUP, MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP)
+
+# 버튼 → (눌림, 뗌) 플래그
+BUTTONS = {
+    'left': (MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP),
+    'right': (MOUSEEVENTF_RIGHTDOWN, MOUSEEVENTF_RIGHTUP),
+    'middle': (MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP),
+}
+
+# 부드러운 이동 경로
+PATHS = ('linear', 'bezier')
+MOVE_RATE = 125       # 초당 이동 좌표 수 기본값 (일반 마우스 폴링 주기 8ms)
+BEZIER_BEND = 0.25    # bezier 제어점이 직선에서 벗어나는 최대 거리 (이동 거리 비율)
+
+def path_ticks(duration, rate):
+    """이동 시간 → 틱 수 (0초면 한 번에 이동)"""
+    return max(1, round(duration * rate)) if duration > 0 else 1
+
+def build_path(dx, dy, duration=0, path='linear', jitter=0, rate=MOVE_RATE):
+    """상대 이동 → 틱별 정수 이동량 [(dx, dy)] (설정 로드 시 1회, 합은 정확히 (dx, dy))
+
+    linear: 직선 등속, bezier: 한쪽으로 휜 3차 곡선 + 가감속.
+    jitter: 중간 좌표에 더하는 ±px 흔들림 (끝점은 정확).
+    같은 액션은 항상 같은 경로 (난수 시드 = 액션 값)
+    """
+    ticks = path_ticks(duration, rate)
+    rng = random.Random(f"{dx},{dy},{duration},{path},{jitter},{rate}")
+
+    if path == 'bezier':
+        # 이동 방향의 수직 방향으로 두 제어점을 같은 쪽에 둠
+        bend = BEZIER_BEND * rng.uniform(0.5, 1.0) * rng.choice((-1, 1))
+        c1x, c1y = dx / 3 - dy * bend, dy / 3 + dx * bend
+        c2x, c2y = dx * 2 / 3 - dy * bend, dy * 2 / 3 + dx * bend
+
+    steps = []
+    x = y = 0
+    for i in range(1, ticks + 1):
+        t = i / ticks
+        if i == ticks:
+            px, py = dx, dy
+        else:
+            if path == 'bezier':
+                t = t * t * (3 - 2 * t)
+                u = 1 - t
+                px = 3 * u * u * t * c1x + 3 * u * t * t * c2x + t * t * t * dx
+                py = 3 * u * u * t * c1y + 3 * u * t * t * c2y + t * t * t * dy
+            else:
+                px, py = dx * t, dy * t
+            if jitter:
+                px += rng.uniform(-jitter, jitter)
+                py += rng.uniform(-jitter, jitter)
+
+        px, py = round(px), round(py)
+        steps.append((px - x, py - y))
+        x, y = px, py
+
+    return steps
+
+def absolute_coords(x, y, screen):
+    """화면 좌표(px) → SendInput 절대 좌표 (주 모니터 0~65535)"""
+    width, height = screen
+    return (min(65535, max(0, round(x * 65535 / max(1, width - 1)))),
+            min(65535, max(0, round(y * 65535 / max(1, height - 1)))))
@@ -0,0 +1,99 @@
+import queue
+import threading
+
+DEFAULT_POOL_SIZE = 4     # 미리 띄워 둘 실행 스레드 수
+DEFAULT_QUEUE_DEPTH = 8   # 대기 가능한 실행 요청 수
+
+class WorkerPool:
+    """미리 띄워 둔 매크로 실행 스레드 풀
+
+    키를 누를 때마다 스레드를 만드는 비용(수백 us)을 없애기 위해
+    대기 중인 스레드가 큐에서 실행 요청을 꺼내 처리.
+    반복 실행(mode 1)은 뗄 때까지 스레드를 잡으므로 요청할 때 스레드를 하나 보충하고
+    끝나면 그 수만큼 줄임 (반복 중인 트리거 수와 상관없이 size개가 새 요청을 받음).
+    size=0이면 요청마다 새 스레드 생성 (이전 방식, 비교용)
+    """
+    __slots__ = ('size', 'depth', '_queue', '_threads', '_closed', '_lock', '_spawned')
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, depth=DEFAULT_QUEUE_DEPTH):
+        if not isinstance(size, int) or size < 0:
+            raise ValueError("Worker pool size must be a non-negative integer")
+
+        if not isinstance(depth, int) or depth < 1:
+            raise ValueError("Run queue depth must be a positive integer")
+
+        self.size = size
+        self.depth = depth
+        self._queue = queue.Queue(maxsize=depth)
+        self._threads = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._spawned = 0
+
+        for _ in range(size):
+            self._spawn()
+
+    def _spawn(self):
+        """실행 스레드 1개 추가"""
+        with self._lock:
+            name = f'KeyM-worker-{self._spawned}'
+            self._spawned += 1
+            thread = threading.Thread(target=self._worker, name=name, daemon=True)
+            self._threads.append(thread)
+        thread.start()
+
+    def submit(self, fn, *args, repeat=False, label=None):
+        """실행 요청 (큐가 가득 차면 False)
+
+        repeat: 뗄 때까지 스레드를 잡는 반복 실행 (스레드를 하나 보충),
+        label: 실행 중 예외를 출력할 때 붙일 이름 (트리거)
+        """
+        if self._closed:
+            return False
+
+        if not self.size:
+            threading.Thread(target=_call, args=(fn, args, label), daemon=True).start()
+            return True
+
+        try:
+            self._queue.put_nowait((fn, args, repeat, label))
+        except queue.Full:
+            return False
+
+        if repeat:
+            self._spawn()
+        return True
+
+    def _worker(self):
+        """실행 스레드 루프 (반복 실행을 마친 스레드는 보충된 만큼 종료)"""
+        get = self._queue.get
+        while True:
+            task = get()
+            if task is None:
+                break
+
+            fn, args, repeat, label = task
+            _call(fn, args, label)
+            if repeat:
+                break
+
+        with self._lock:
+            self._threads.remove(threading.current_thread())
+
+    def shutdown(self):
+        """스레드 종료 요청"""
+        self._closed = True
+        with self._lock:
+            count = len(self._threads)
+        for _ in range(count):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+
+def _call(fn, args, label):
+    """실행 요청 처리 (예외는 트리거 이름과 함께 출력하고 스레드는 계속 사용)"""
+    try:
+        fn(*args)
+    except Exception as e:
+        print(f"매크로 실행 오류 [{label}]: {e!r}")
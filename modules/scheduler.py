@@ -0,0 +1,115 @@
+import time
+import heapq
+import threading
+
+class TimerHandle:
+    """예약 핸들 (취소/재예약)"""
+    __slots__ = ('scheduler', 'due', 'seq', 'callback', 'args', 'cancelled')
+
+    def __init__(self, scheduler, callback, args):
+        self.scheduler = scheduler
+        self.due = 0
+        self.seq = 0
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """예약 취소"""
+        self.cancelled = True
+
+    def reschedule(self, delay):
+        """같은 콜백을 delay초 뒤로 다시 예약"""
+        self.scheduler._push(self, delay)
+
+class Scheduler:
+    """공유 타이머 스레드 (heap 기반)
+
+    예약마다 threading.Timer 스레드를 만드는 대신 하나의 스레드가
+    기한 순으로 콜백을 실행. 취소된 항목은 꺼낼 때 버림
+    """
+    __slots__ = ('_heap', '_cond', '_thread', '_seq', '_running', 'fired')
+
+    def __init__(self):
+        self._heap = []
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self._seq = 0
+        self._running = True
+        self.fired = 0
+
+    def call_later(self, delay, callback, *args):
+        """delay초 뒤 callback(*args) 실행 예약"""
+        handle = TimerHandle(self, callback, args)
+        self._push(handle, delay)
+        return handle
+
+    def _push(self, handle, delay):
+        """힙에 (재)등록. 이전 항목은 seq가 달라져 무시됨"""
+        due = time.perf_counter() + delay
+        with self._cond:
+            self._seq += 1
+            handle.due = due
+            handle.seq = self._seq
+            handle.cancelled = False
+            heapq.heappush(self._heap, (due, self._seq, handle))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='KeyM-scheduler', daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is handle:
+                # 가장 이른 기한이 바뀌면 깨움
+                self._cond.notify()
+
+    def _loop(self):
+        """예약 실행 루프"""
+        heap = self._heap
+        while True:
+            with self._cond:
+                while self._running:
+                    if not heap:
+                        self._cond.wait()
+                        continue
+
+                    due, seq, handle = heap[0]
+                    if handle.cancelled or handle.seq != seq:
+                        heapq.heappop(heap)
+                        continue
+
+                    remaining = due - time.perf_counter()
+                    if remaining <= 0:
+                        heapq.heappop(heap)
+                        break
+
+                    self._cond.wait(remaining)
+                else:
+                    return
+
+            try:
+                self.fired += 1
+                handle.callback(*handle.args)
+            except Exception:
+                pass
+
+    def pending(self):
+        """대기 중인 예약 수"""
+        with self._cond:
+            return sum(1 for _, seq, h in self._heap if not h.cancelled and h.seq == seq)
+
+    def shutdown(self):
+        """스레드 종료"""
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cond.notify()
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_scheduler():
+    """프로세스 공용 스케줄러"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Scheduler()
+        return _shared
@@ -0,0 +1,179 @@
+import sys
+import time
+import argparse
+
+from backend import (RecordingBackend, INPUT_MOUSE, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE,
+                     MOUSEEVENTF_ABSOLUTE, MOUSEEVENTF_WHEEL, WHEEL_DELTA)
+from core import MacroCore, SCANCODE_MAP
+from mouse import BUTTONS
+from timing import VirtualClock
+from telemetry import Telemetry
+
+DEFAULT_HOLD_MS = 1000  # mode 1에서 뗌 시각을 주지 않았을 때 누르고 있는 시간
+
+# 스캔코드 → 키 이름
+KEY_NAMES = {scan: key for key, scan in SCANCODE_MAP.items()}
+
+# 마우스 버튼 플래그 → (이름, 'down'/'up')
+BUTTON_EVENTS = {flag: ('mouse ' + name, kind) for name, flags in BUTTONS.items()
+                 for flag, kind in zip(flags, ('down', 'up'))}
+
+class InlinePool:
+    """실행 요청을 호출한 스레드에서 바로 실행 (시뮬레이션용 스레드 풀)"""
+    __slots__ = ('size', 'depth')
+
+    def __init__(self):
+        self.size = 0
+        self.depth = 1
+
+    def submit(self, fn, *args, repeat=False, label=None):
+        fn(*args)
+        return True
+
+    def shutdown(self):
+        pass
+
+def create_core(macros, timings, batch_input=True, subroutines=None):
+    """가상 시계로 동작하는 코어 → (코어, 시계, 기록 백엔드)
+
+    시계/타이머/출력/스레드 풀만 바꾸고 컴파일, 상태 머신, 실행 경로는 실제와 같음
+    """
+    clock = VirtualClock()
+    recorder = RecordingBackend(clock)
+    core = MacroCore(recorder, batch_input, timer=clock, pool=InlinePool(),
+                     telemetry=Telemetry(0), clock=clock)
+    core.configure(macros, timings, subroutines=subroutines)
+    return core, clock, recorder
+
+def default_presses(mode):
+    """기본 입력: mode 2는 한 번 탭, mode 1은 DEFAULT_HOLD_MS 동안 누름"""
+    return [(0, 0)] if mode == 2 else [(0, DEFAULT_HOLD_MS)]
+
+def simulate(macros, trigger, presses=None, timings=None, batch_input=True, subroutines=None, raw=False):
+    """매크로 하나를 가상 시계로 실행 → 이벤트 타임라인 [(ms, 키, 'down'/'up')]
+
+    macros: 변환된 매크로 ({트리거: {'actions': [(hold, key, delay)], 'mode': n}})
+    subroutines: 변환된 SUBROUTINES (('call', 이름) 블록이 있을 때)
+    presses: 트리거 입력 [(누름 ms, 뗌 ms)] (생략 시 default_presses)
+    raw: True면 기록 백엔드 이벤트 그대로 [(ns, 입력 종류, 코드, 플래그)]
+    실제 대기 없이 실행되므로 10초짜리 반복도 CPU 수 ms 안에 끝나고 결과는 항상 같음
+    """
+    if trigger not in macros:
+        raise ValueError(f"Unknown trigger: {trigger}")
+
+    if timings is None:
+        timings = {'press': 0.02, 'release': 0.02, 'sequence': 0.02}
+
+    core, clock, recorder = create_core(macros, timings, batch_input, subroutines)
+    state = core.states.get(trigger)
+    if state is None:
+        return []
+
+    def press():
+        seq = core.press(state)
+        if seq:
+            core.start(trigger, seq)
+
+    if presses is None:
+        presses = default_presses(state.mode)
+
+    for down_ms, up_ms in presses:
+        if up_ms < down_ms:
+            raise ValueError(f"Release before press: {down_ms} > {up_ms}")
+        clock.call_at(int(down_ms * 1e6), press)
+        clock.call_at(int(up_ms * 1e6), core.release, state)
+
+    # 예약이 남아 있는 동안 진행 (실행은 눌림 예약 안에서 끝까지 진행됨)
+    while clock.run_next():
+        pass
+
+    core.cleanup()
+    if raw:
+        return list(recorder.events)
+    return timeline(recorder.events, core.screen)
+
+def timeline(events, screen=None):
+    """기록 백엔드 이벤트 → [(ms, 키, 'down'/'up')] (문자 입력은 문자, 표시할 수 없으면 U+코드)
+
+    마우스: 버튼 ('mouse left', 'down'/'up'), 상대 이동 ('+dx,+dy', 'move'),
+    절대 이동 ('@x,y', 'move', screen 기준 px), 휠 ('+칸', 'wheel')
+    """
+    rows = []
+    for t, kind, scan, flags in events:
+        if kind == INPUT_MOUSE:
+            rows.append((t / 1e6, *_mouse_event(scan, flags, screen)))
+        elif flags & KEYEVENTF_UNICODE:
+            rows.append((t / 1e6, _char_name(scan), 'up' if flags & KEYEVENTF_KEYUP else 'down'))
+        else:
+            rows.append((t / 1e6, KEY_NAMES.get(scan, f'0x{scan:02X}'),
+                         'up' if flags & KEYEVENTF_KEYUP else 'down'))
+    return rows
+
+def _mouse_event(data, flags, screen):
+    """마우스 입력 표시 (이름, 종류)"""
+    button = BUTTON_EVENTS.get(flags)
+    if button:
+        return button
+
+    dx, dy, wheel = data
+    if flags & MOUSEEVENTF_WHEEL:
+        return f'{wheel // WHEEL_DELTA:+d}', 'wheel'
+    if flags & MOUSEEVENTF_ABSOLUTE:
+        width, height = screen or (65536, 65536)
+        return f'@{round(dx * (width - 1) / 65535)},{round(dy * (height - 1) / 65535)}', 'move'
+    return f'{dx:+d},{dy:+d}', 'move'
+
+def _char_name(code):
+    """유니코드 입력 표시 이름"""
+    char = chr(code)
+    return char if char.isprintable() and char != ' ' else f'U+{code:04X}'
+
+def parse_press(text):
+    """'누름ms:뗌ms' 또는 'ms'(탭) → (누름, 뗌)"""
+    down, _, up = text.partition(':')
+    return float(down), float(up or down)
+
+def run_simulator(argv=None):
+    """시뮬레이터 진입점 (main.py --simulate)"""
+    from bench import load_config
+    from app import MacroApp
+
+    parser = argparse.ArgumentParser(prog='main.py --simulate',
+                                     description='KeyM 매크로 시뮬레이터 (가상 시계)')
+    parser.add_argument('trigger', help='실행할 트리거 키')
+    parser.add_argument('--config', help='config.py 경로 (기본: 프로그램 폴더)')
+    parser.add_argument('--press', action='append', type=parse_press, metavar='DOWN[:UP]',
+                        help='트리거 누름/뗌 시각 ms (반복 지정 가능, 예: 0:250)')
+    args = parser.parse_args(argv)
+
+    # 앱과 같은 변환 (반복/서브루틴 블록을 펼치지 않고 그대로 컴파일)
+    data = MacroApp('null').compile_config(load_config(args.config))
+    macros, defaults = data['macros'], data['defaults']
+    info = macros.get(args.trigger)
+    if info is None:
+        print(f"[오류] 트리거 '{args.trigger}'가 MACROS에 없습니다")
+        return 1
+
+    presses = args.press or default_presses(info['mode'])
+
+    start = time.process_time_ns()
+    events = simulate(macros, args.trigger, presses, defaults, subroutines=data['subroutines'])
+    cpu = time.process_time_ns() - start
+
+    # 트리거 입력과 출력 이벤트를 시각 순으로 합쳐 표시
+    rows = [(t, 0, f"[{args.trigger}] {'누름' if kind == 'down' else '뗌'}")
+            for down, up in presses for t, kind in ((down, 'down'), (up, 'up'))]
+    rows += [(t, 1, f"{kind:<6}{key}") for t, key, kind in events]
+    rows.sort(key=lambda row: (row[0], row[1]))
+
+    print(f"시뮬레이션: '{args.trigger}' (mode {info['mode']}), 입력 {len(presses)}회")
+    print(f"{'ms':>10}  event")
+    for t, _, text in rows:
+        print(f"{t:>10.3f}  {text}")
+
+    end = events[-1][0] if events else 0.0
+    print(f"출력 {len(events)}개, 가상 {end:.3f}ms, CPU {cpu / 1e6:.2f}ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_simulator())
@@ -0,0 +1,36 @@
+import time
+
+class StartupProfile:
+    """시작 단계별 시간 기록 (--startup-profile)
+
+    mark는 어느 스레드에서 불러도 되며 (list.append), 기준 시각은 main.py 첫 줄.
+    꺼져 있으면 아무것도 기록하지 않음
+    """
+    __slots__ = ('enabled', 'origin', 'marks')
+
+    def __init__(self, enabled=False, origin=None):
+        self.enabled = enabled
+        self.origin = origin or time.perf_counter_ns()
+        self.marks = []
+
+    def mark(self, name):
+        """현재 시각에 단계 이름 기록"""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter_ns()))
+
+    def elapsed(self, name):
+        """기준 시각부터 해당 단계까지 (ms, 없으면 None)"""
+        for mark, at in self.marks:
+            if mark == name:
+                return (at - self.origin) / 1e6
+        return None
+
+    def format_report(self):
+        """단계별 소요/누적 시간 텍스트"""
+        lines = ["시작 시간 분석 (main.py 기준, ms)",
+                 f"{'step':<32}{'step ms':>10}{'total ms':>10}"]
+        last = self.origin
+        for name, at in sorted(self.marks, key=lambda mark: mark[1]):
+            lines.append(f"{name:<32}{(at - last) / 1e6:>10.1f}{(at - self.origin) / 1e6:>10.1f}")
+            last = at
+        return '\n'.join(lines)
@@ -0,0 +1,222 @@
+import os
+import time
+import threading
+from array import array
+
+DEFAULT_CAPACITY = 8192  # 기록할 최근 입력 이벤트 수
+DROPPED = 0xFFFFFFFF     # 번호가 해제된 매크로의 지난 기록 (스텝 번호 자리에 표시, 실제 스텝 번호로는 나올 수 없음)
+
+class Telemetry:
+    """입력 타이밍 기록 (고정 크기 링 버퍼)
+
+    SendInput 호출마다 예정 시각, 실제 전송 시각, 실행 ID, 매크로, 스텝 번호를
+    미리 할당한 array에 덮어쓰므로 기록 중 메모리 할당이 없음.
+    한 호출에 묶인 이벤트별 키/액션 인덱스는 등록된 프로그램에서 복원.
+    리로드로 쓰이지 않게 된 매크로 번호는 retain으로 해제해 다음 등록에 재사용.
+    기록/해제/등록은 자체 잠금 안에서, rows는 잠금 안에서 복사한 뒤 풀어서 읽음
+    """
+    __slots__ = ('capacity', 'scheduled', 'actual', 'run_id', 'macro', 'step',
+                 'total', '_next', '_names', '_layouts', '_free', '_lock')
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if not isinstance(capacity, int) or capacity < 0:
+            raise ValueError("Telemetry capacity must be a non-negative integer")
+
+        self.capacity = capacity
+        self.scheduled = array('q', bytes(8 * capacity))  # 예정 시각 (perf_counter_ns)
+        self.actual = array('q', bytes(8 * capacity))     # 실제 전송 시각
+        self.run_id = array('q', bytes(8 * capacity))
+        self.macro = array('H', bytes(2 * capacity))
+        self.step = array('I', bytes(4 * capacity))      # 긴 문자 입력은 스텝이 65535개를 넘을 수 있음
+        self.total = 0   # 지금까지 기록된 전송 수
+        self._next = 0
+        self._names = []
+        self._layouts = []
+        self._free = []  # 해제되어 재사용할 매크로 번호
+        self._lock = threading.Lock()
+
+    def register(self, trigger, program):
+        """컴파일된 프로그램 등록 → 매크로 번호 (설정 로드/리로드 시 1회)
+
+        스텝별 (스캔코드, keyup, 액션 인덱스) 목록을 보관해 보고 시 이벤트로 펼침.
+        해제된 번호가 있으면 재사용하므로 번호는 동시에 쓰이는 프로그램 수를 넘지 않음
+        """
+        layout = tuple(tuple(zip(step.scans, step.keyups, step.actions)) for step in program)
+        with self._lock:
+            if self._free:
+                macro = self._free.pop()
+                self._names[macro] = trigger
+                self._layouts[macro] = layout
+                return macro
+
+            self._names.append(trigger)
+            self._layouts.append(layout)
+            return len(self._names) - 1
+
+    def retain(self, live):
+        """live에 없는 매크로 번호 해제 → 해제한 수 (리로드 후, 기록 중이 아닐 때 호출)
+
+        해제한 번호의 지난 기록은 재사용된 번호의 프로그램으로 잘못 풀리지 않게 버림
+        """
+        with self._lock:
+            freed = set()
+            for macro, layout in enumerate(self._layouts):
+                if layout is not None and macro not in live:
+                    self._names[macro] = None
+                    self._layouts[macro] = None
+                    freed.add(macro)
+            if not freed:
+                return 0
+
+            self._free.extend(sorted(freed, reverse=True))
+            for i in range(len(self)):
+                if self.macro[i] in freed:
+                    self.step[i] = DROPPED
+            return len(freed)
+
+    def record(self, run_id, macro, step, scheduled, actual):
+        """SendInput 1회 기록"""
+        with self._lock:
+            i = self._next
+            self.scheduled[i] = scheduled
+            self.actual[i] = actual
+            self.run_id[i] = run_id
+            self.macro[i] = macro
+            self.step[i] = step
+
+            i += 1
+            self._next = 0 if i == self.capacity else i
+            self.total += 1
+
+    def clear(self):
+        """기록 초기화"""
+        with self._lock:
+            self.total = 0
+            self._next = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def rows(self):
+        """기록된 이벤트 (오래된 순) [(run_id, 트리거, 액션, 스캔코드, keyup, 예정, 실제)]
+
+        기록 중에도 일관되게 읽도록 잠금 안에서 오래된 순으로 복사한 뒤 풀어냄
+        """
+        with self._lock:
+            count = len(self)
+            start = (self._next - count) % self.capacity if count else 0
+            order = [(start + n) % self.capacity for n in range(count)]
+            records = [(self.run_id[i], self.macro[i], self.step[i], self.scheduled[i], self.actual[i])
+                       for i in order]
+            names = list(self._names)
+            layouts = list(self._layouts)
+
+        rows = []
+        for run_id, macro, step, scheduled, actual in records:
+            if step == DROPPED:
+                continue
+            for scan, keyup, action in layouts[macro][step]:
+                rows.append((run_id, names[macro], action, scan, keyup, scheduled, actual))
+        return rows
+
+    def report(self):
+        """오차(실제 - 예정, us) 백분위 {트리거: {'all': ..., 액션 인덱스: ...}}"""
+        groups = {}
+        for _, trigger, action, _, _, scheduled, actual in self.rows():
+            error = (actual - scheduled) / 1e3
+            by_action = groups.setdefault(trigger, {'all': []})
+            by_action['all'].append(error)
+            by_action.setdefault(action, []).append(error)
+
+        return {
+            trigger: {key: _summarize(errors) for key, errors in by_action.items()}
+            for trigger, by_action in groups.items()
+        }
+
+    def format_report(self, actions=True):
+        """보고서 텍스트"""
+        report = self.report()
+        events = sum(by_action['all']['count'] for by_action in report.values())
+        lines = [f"최근 SendInput {len(self)}회 (전체 {self.total}회), 이벤트 {events}개, "
+                 f"오차 = 실제 - 예정 (us)",
+                 f"{'macro':<12}{'action':>8}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+
+        for trigger, by_action in report.items():
+            keys = ['all'] + sorted(k for k in by_action if k != 'all') if actions else ['all']
+            for key in keys:
+                s = by_action[key]
+                lines.append(f"{trigger:<12}{key:>8}{s['count']:>8}{s['p50']:>10.1f}"
+                             f"{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """보고서와 원본 기록을 파일로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.format_report())
+            f.write('\n\nrun_id,macro,action,scan,keyup,scheduled_ns,actual_ns,error_us\n')
+            for run_id, trigger, action, scan, keyup, scheduled, actual in self.rows():
+                f.write(f"{run_id},{trigger},{action},0x{scan:02X},{keyup},{scheduled},{actual},"
+                        f"{(actual - scheduled) / 1e3:.1f}\n")
+        return os.path.abspath(path)
+
+class HookMetrics:
+    """훅 콜백 반환 지연 / 디스패치 큐 지표 (고정 크기 링 버퍼, ns)
+
+    hook: 콜백 진입 → 반환, lag: 큐 적재 → 디스패처 처리 시작
+    """
+    __slots__ = ('capacity', 'hook', 'lag', 'hooks', 'dispatched', 'max_depth', 'dropped')
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.hook = array('q', bytes(8 * capacity))
+        self.lag = array('q', bytes(8 * capacity))
+        self.hooks = 0        # 기록된 콜백 수
+        self.dispatched = 0   # 디스패처가 처리한 요청 수
+        self.max_depth = 0    # 큐 최대 길이
+        self.dropped = 0      # 큐가 가득 차 버린 요청 수
+
+    def summary(self):
+        """지표 요약 (us)"""
+        hook = sorted(self.hook[:min(self.hooks, self.capacity)])
+        lag = sorted(self.lag[:min(self.dispatched, self.capacity)])
+
+        def pick(values, p):
+            if not values:
+                return 0.0
+            return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))] / 1e3
+
+        return {
+            'hooks': self.hooks,
+            'hook_p50_us': pick(hook, 50),
+            'hook_p99_us': pick(hook, 99),
+            'hook_max_us': hook[-1] / 1e3 if hook else 0.0,
+            'dispatched': self.dispatched,
+            'lag_p50_us': pick(lag, 50),
+            'lag_p99_us': pick(lag, 99),
+            'max_depth': self.max_depth,
+            'dropped': self.dropped,
+        }
+
+    def format_summary(self):
+        """요약 텍스트"""
+        s = self.summary()
+        return (f"훅 반환 p50 {s['hook_p50_us']:.1f}us / p99 {s['hook_p99_us']:.1f}us / "
+                f"max {s['hook_max_us']:.1f}us ({s['hooks']}회), "
+                f"디스패치 지연 p50 {s['lag_p50_us']:.1f}us / p99 {s['lag_p99_us']:.1f}us, "
+                f"큐 최대 {s['max_depth']}, 버림 {s['dropped']}")
+
+def default_dump_path(base):
+    """저장 파일 경로 (실행 폴더/telemetry_날짜_시각.txt)"""
+    return os.path.join(base, time.strftime('telemetry_%Y%m%d_%H%M%S.txt'))
+
+def _summarize(errors):
+    """단순 백분위 요약"""
+    ordered = sorted(errors)
+    last = len(ordered) - 1
+
+    def pick(p):
+        return ordered[min(last, int(round(p / 100.0 * last)))]
+
+    return {'count': len(ordered), 'p50': pick(50), 'p95': pick(95),
+            'p99': pick(99), 'max': ordered[-1]}
@@ -0,0 +1,199 @@
+import time
+import heapq
+import threading
+
+# 전략
+STRATEGIES = ('sleep', 'hybrid', 'busy')
+
+# 스핀 설정
+DEFAULT_SPIN_NS = 2_000_000    # 보정 전 스핀 구간
+SPIN_MARGIN_NS = 250_000       # 측정 해상도에 더하는 여유
+MAX_SPIN_NS = 20_000_000       # 스핀 구간 상한 (Windows 기본 타이머 해상도 15.6ms + 여유)
+
+# Windows 타이머 해상도 (timeBeginPeriod, 기본 15.6ms → 1ms)
+TIMER_PERIOD_MS = 1
+
+# 보정 설정
+CALIBRATION_SAMPLES = 20
+CALIBRATION_WAIT_NS = 1_000_000
+
+class PrecisionTimer:
+    """정밀 대기 타이머
+
+    sleep:  취소 이벤트에서만 대기 (CPU 최소, OS 해상도만큼 늦을 수 있음)
+    hybrid: 기한 직전까지 대기 후 마지막 구간만 스핀
+    busy:   전 구간 스핀 (가장 정확, CPU 사용)
+
+    spin_budget: hybrid에서 대기 시간 중 스핀에 쓸 수 있는 최대 비율 (상한).
+    거친 대기가 늦게 깨어나는 폭은 보정 전에 OS 타이머 해상도를 올려서 줄임
+    """
+    __slots__ = ('strategy', 'spin_budget', 'spin_ns', 'resolution_ns', 'calibrated', 'period_ms')
+
+    def __init__(self, strategy='hybrid', spin_budget=0.25):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown timer strategy: {strategy}")
+
+        if not 0 <= spin_budget <= 1:
+            raise ValueError("spin_budget must be between 0 and 1")
+
+        self.strategy = strategy
+        self.spin_budget = spin_budget
+        self.spin_ns = DEFAULT_SPIN_NS
+        self.resolution_ns = None
+        self.calibrated = False
+        self.period_ms = 0
+
+    def raise_resolution(self):
+        """OS 타이머 해상도를 TIMER_PERIOD_MS로 올림 (Windows만, close()에서 되돌림)"""
+        if self.period_ms:
+            return True
+
+        try:
+            from ctypes import windll
+            if windll.winmm.timeBeginPeriod(TIMER_PERIOD_MS) != 0:
+                return False
+        except (ImportError, AttributeError, OSError):
+            return False
+
+        self.period_ms = TIMER_PERIOD_MS
+        return True
+
+    def close(self):
+        """올린 OS 타이머 해상도 되돌림"""
+        if not self.period_ms:
+            return
+
+        try:
+            from ctypes import windll
+            windll.winmm.timeEndPeriod(self.period_ms)
+        except (ImportError, AttributeError, OSError):
+            pass
+        self.period_ms = 0
+
+    def calibrate(self, samples=CALIBRATION_SAMPLES):
+        """대기 해상도 측정 후 스핀 구간 결정 (시작 시 1회)
+
+        실제 대기에 쓰는 Event.wait로 1ms 대기를 반복해 초과 시간의 p90을 해상도로 사용
+        (OS 타이머 해상도를 먼저 올려 올린 뒤의 해상도를 측정)
+        """
+        self.raise_resolution()
+        event = threading.Event()
+        overshoot = []
+
+        for _ in range(samples):
+            start = time.perf_counter_ns()
+            event.wait(CALIBRATION_WAIT_NS / 1e9)
+            overshoot.append(time.perf_counter_ns() - start - CALIBRATION_WAIT_NS)
+
+        overshoot.sort()
+        resolution = max(0, overshoot[int(len(overshoot) * 0.9)])
+
+        self.resolution_ns = resolution
+        self.spin_ns = min(MAX_SPIN_NS, resolution + SPIN_MARGIN_NS)
+        self.calibrated = True
+        return resolution
+
+    def spin_window(self, wait_ns=0):
+        """hybrid 스핀 구간 (ns): 해상도 + 여유, 대기 시간 x 스핀 예산을 넘지 않음"""
+        if wait_ns:
+            return min(self.spin_ns, int(wait_ns * self.spin_budget))
+        return self.spin_ns
+
+    def wait_until(self, deadline_ns, cancel, wait_ns=0):
+        """deadline_ns(perf_counter_ns)까지 대기 (취소되면 False)"""
+        clock = time.perf_counter_ns
+        remaining = deadline_ns - clock()
+
+        if remaining <= 0:
+            return not cancel.is_set()
+
+        strategy = self.strategy
+        if strategy == 'sleep':
+            return not cancel.wait(remaining / 1e9)
+
+        if strategy == 'hybrid':
+            coarse = remaining - self.spin_window(wait_ns)
+            if coarse > 0 and cancel.wait(coarse / 1e9):
+                return False
+
+        # 스핀 (sleep(0)으로 GIL을 양보해 훅 콜백이 밀리지 않도록)
+        is_set = cancel.is_set
+        sleep = time.sleep
+        while clock() < deadline_ns:
+            if is_set():
+                return False
+            sleep(0)
+
+        return not is_set()
+
+
+class VirtualClock:
+    """가상 시계 (시뮬레이션용 시계 겸 타이머)
+
+    MacroCore의 clock과 timer에 함께 넣으면 대기가 실제로 자지 않고
+    시각만 기한으로 옮김. call_at으로 예약한 입력(트리거 뗌 등)은 대기 중
+    그 시각이 되면 실행되고, 취소되면 그 시각에서 바로 반환.
+    한 스레드에서만 사용 (결과가 항상 같음)
+    """
+    __slots__ = ('now_ns', 'strategy', 'spin_budget', 'spin_ns', 'resolution_ns', 'calibrated',
+                 '_events', '_seq')
+
+    def __init__(self, start_ns=0):
+        self.now_ns = start_ns
+        self.strategy = 'virtual'
+        self.spin_budget = 0
+        self.spin_ns = 0
+        self.resolution_ns = 0
+        self.calibrated = True
+        self._events = []
+        self._seq = 0
+
+    def __call__(self):
+        """현재 가상 시각 (ns)"""
+        return self.now_ns
+
+    def call_at(self, due_ns, callback, *args):
+        """due_ns(가상 시각)에 callback(*args) 실행 예약"""
+        self._seq += 1
+        heapq.heappush(self._events, (due_ns, self._seq, callback, args))
+
+    def pending(self):
+        """남은 예약 수"""
+        return len(self._events)
+
+    def next_due(self):
+        """가장 이른 예약 시각 (없으면 None)"""
+        return self._events[0][0] if self._events else None
+
+    def run_next(self):
+        """가장 이른 예약으로 시각을 옮겨 실행 (없으면 False)"""
+        if not self._events:
+            return False
+
+        due, _, callback, args = heapq.heappop(self._events)
+        if due > self.now_ns:
+            self.now_ns = due
+        callback(*args)
+        return True
+
+    def calibrate(self, samples=CALIBRATION_SAMPLES):
+        """보정 불필요 (해상도 0)"""
+        return 0
+
+    def close(self):
+        """정리할 것 없음"""
+
+    def wait_until(self, deadline_ns, cancel, wait_ns=0):
+        """deadline_ns까지 가상 대기 (사이의 예약 실행, 취소되면 False)"""
+        if cancel.is_set():
+            return False
+
+        events = self._events
+        while events and events[0][0] <= deadline_ns:
+            self.run_next()
+            if cancel.is_set():
+                return False
+
+        if deadline_ns > self.now_ns:
+            self.now_ns = deadline_ns
+        return not cancel.is_set()
@@ -1,64 +1,80 @@
 import sys
 import os
 import threading
-import subprocess
-from pystray import Icon, Menu, MenuItem
-from PIL import Image, ImageDraw
+
+from icon import ICON_ASSET, IconAsset
 
 class TrayIcon:
     """시스템 트레이 아이콘"""
-    __slots__ = ('on_exit_callback', 'icon', '_image', '_quit_lock', '_backup_timer')
+    __slots__ = ('on_exit_callback', 'on_report_callback', 'on_dump_callback',
+                 'icon', '_quit_lock', '_backup_timer')
     
-    def __init__(self, on_exit_callback):
-        if not callable(on_exit_callback) and on_exit_callback is not None:
-            raise ValueError("on_exit_callback must be callable or None")
+    def __init__(self, on_exit_callback, on_report_callback=None, on_dump_callback=None):
+        for callback in (on_exit_callback, on_report_callback, on_dump_callback):
+            if not callable(callback) and callback is not None:
+                raise ValueError("Tray callbacks must be callable or None")
         
         self.on_exit_callback = on_exit_callback
+        self.on_report_callback = on_report_callback
+        self.on_dump_callback = on_dump_callback
         self.icon = None
-        self._image = None
         self._quit_lock = False
         self._backup_timer = None
     
     def _create_default_icon(self):
         """기본 아이콘 생성"""
-        if self._image:
-            return self._image
+        from PIL import Image, ImageDraw
         
         try:
             img = Image.new('RGB', (64, 64), 'black')
             d = ImageDraw.Draw(img)
             d.ellipse([8, 8, 56, 56], fill='green', outline='white', width=3)
             d.text((20, 15), 'M', fill='white')
-            self._image = img
             return img
         except Exception as e:
             print(f"기본 아이콘 생성 실패: {e}")
             # 최소 아이콘
             return Image.new('RGB', (64, 64), 'green')
     
-    def load_icon_image(self):
-        """아이콘 로드"""
-        if self._image:
-            return self._image
-        
-        # 실행 파일 경로 기준
+    def _icon_dirs(self):
+        """아이콘 파일 위치 후보 (실행 파일 경로 기준)"""
         if getattr(sys, 'frozen', False):
             base = sys._MEIPASS
         else:
             base = os.path.dirname(os.path.abspath(__file__))
         
-        # 아이콘 경로 후보
-        icon_paths = [
-            os.path.join(base, 'icon.ico'),
-            os.path.join(os.path.dirname(base), 'icon.ico'),
-        ]
+        return [base, os.path.dirname(base)]
+    
+    def load_icon_asset(self):
+        """빌드 시 렌더링한 64x64 아이콘 (없으면 None)"""
+        for folder in self._icon_dirs():
+            try:
+                with open(os.path.join(folder, ICON_ASSET), 'rb') as f:
+                    return IconAsset(f.read())
+            except OSError:
+                continue
+        return None
+    
+    def load_icon_image(self):
+        """아이콘 로드
+        
+        Windows는 미리 렌더링한 ICO를 그대로 넘겨 PIL을 임포트하지 않음.
+        이미지는 보관하지 않으므로 pystray가 가진 참조가 유일함
+        """
+        if sys.platform == 'win32':
+            asset = self.load_icon_asset()
+            if asset:
+                return asset
+        
+        from PIL import Image
         
         # 아이콘 로드 시도
-        for icon_path in icon_paths:
+        for folder in self._icon_dirs():
+            icon_path = os.path.join(folder, 'icon.ico')
             try:
                 if os.path.exists(icon_path):
-                    self._image = Image.open(icon_path).resize((64, 64), Image.Resampling.LANCZOS)
-                    return self._image
+                    with Image.open(icon_path) as source:
+                        return source.resize((64, 64), Image.Resampling.LANCZOS)
             except Exception as e:
                 continue
         
@@ -96,9 +112,31 @@ class TrayIcon:
         except:
             self._force_exit()
     
+    def _notify(self, message):
+        """트레이 알림 (지원하지 않으면 무시)"""
+        try:
+            self.icon.notify(message, "KeyM")
+        except Exception:
+            pass
+    
+    def on_report(self, icon, item):
+        """타이밍 통계 보기"""
+        try:
+            self._notify(self.on_report_callback())
+        except Exception as e:
+            print(f"타이밍 통계 오류: {e}")
+    
+    def on_dump(self, icon, item):
+        """타이밍 기록 저장"""
+        try:
+            self._notify(f"저장됨: {self.on_dump_callback()}")
+        except Exception as e:
+            print(f"타이밍 기록 저장 오류: {e}")
+    
     def _force_exit(self):
         """백업 강제 종료"""
         try:
+            import subprocess
             subprocess.Popen(
                 ['taskkill', '/F', '/PID', str(os.getpid())],
                 creationflags=subprocess.CREATE_NO_WINDOW
@@ -110,15 +148,27 @@ class TrayIcon:
             except:
                 os._exit(0)
     
-    def run(self):
-        """트레이 아이콘 실행"""
+    def run(self, mark=None):
+        """트레이 아이콘 실행 (mark: 단계별 시간 기록 콜백)"""
         try:
-            menu = Menu(
-                MenuItem('KeyM', lambda: None, enabled=False), 
-                MenuItem('종료', self.on_quit)
-            )
+            from pystray import Icon, Menu, MenuItem
+            if mark:
+                mark('tray: import pystray')
+            
+            items = [MenuItem('KeyM', lambda: None, enabled=False)]
+            if self.on_report_callback:
+                items.append(MenuItem('타이밍 통계', self.on_report))
+            if self.on_dump_callback:
+                items.append(MenuItem('타이밍 기록 저장', self.on_dump))
+            items.append(MenuItem('종료', self.on_quit))
+            
+            menu = Menu(*items)
+            
+            image = self.load_icon_image()
+            if mark:
+                mark('tray: icon image')
             
-            self.icon = Icon("KeyM", self.load_icon_image(), "KeyM", menu)
+            self.icon = Icon("KeyM", image, "KeyM", menu)
             
             threading.Thread(target=self.icon.run, daemon=True).start()
         
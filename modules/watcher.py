@@ -0,0 +1,61 @@
+import os
+
+from scheduler import get_scheduler
+
+DEFAULT_INTERVAL = 0.5  # 설정 파일 변경 확인 간격 (초)
+
+class ConfigWatcher:
+    """설정 파일 변경 감시 (공유 스케줄러에서 mtime 폴링)
+
+    별도 스레드 없이 공유 타이머 스레드가 interval마다 (mtime, 크기)를 비교하고
+    바뀌었으면 callback 호출. 저장 도중이라 읽을 수 없으면 다음 확인에서 다시 시도
+    """
+    __slots__ = ('path', 'callback', 'interval', 'scheduler', 'changes', '_stamp', '_handle')
+
+    def __init__(self, path, callback, interval=DEFAULT_INTERVAL):
+        if not callable(callback):
+            raise ValueError("Watcher callback must be callable")
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            raise ValueError("Watch interval must be positive")
+
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self.scheduler = get_scheduler()
+        self.changes = 0  # 감지한 변경 횟수
+        self._stamp = None
+        self._handle = None
+
+    def _stat(self):
+        """(mtime, 크기), 읽을 수 없으면 None"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def start(self):
+        """감시 시작"""
+        self._stamp = self._stat()
+        self._handle = self.scheduler.call_later(self.interval, self._poll)
+
+    def _poll(self):
+        """변경 확인 (스케줄러 스레드)"""
+        stamp = self._stat()
+        if stamp is not None and stamp != self._stamp:
+            self._stamp = stamp
+            self.changes += 1
+            try:
+                self.callback()
+            except Exception as e:
+                print(f"설정 감시 오류: {e}")
+
+        if self._handle:
+            self._handle.reschedule(self.interval)
+
+    def stop(self):
+        """감시 중지"""
+        handle, self._handle = self._handle, None
+        if handle:
+            handle.cancel()